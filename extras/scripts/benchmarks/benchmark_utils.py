@@ -0,0 +1,156 @@
+"""
+Helpers shared by the benchmark scripts: bootstrapping NetBox's Django settings, seeding a
+synthetic AWS estate and timing.
+
+The scripts import NetBox itself, so run them as files (``python extras/scripts/benchmarks/<script>.py``)
+rather than as ``extras.…`` modules; the repository's ``extras`` directory would otherwise shadow
+NetBox's ``extras`` app.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+DEFAULT_NETBOX_ROOT = "/opt/netbox/netbox"
+
+# Synthetic estate: every VPC is a /20 carved out of 10.0.0.0/8 and every subnet a /27 inside it,
+# so up to 4096 VPCs with up to 128 subnets each can be seeded without overlaps.
+VPC_PREFIX_LENGTH = 20
+SUBNET_PREFIX_LENGTH = 27
+BASE_NETWORK = 10 << 24
+
+
+def argument_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--netbox-root",
+        default=os.environ.get("NETBOX_ROOT", DEFAULT_NETBOX_ROOT),
+        help="Directory containing NetBox's manage.py (default: $NETBOX_ROOT or %(default)s)",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Commit the seeded objects instead of rolling them back when the benchmark finishes",
+    )
+    return parser
+
+
+def setup_django(netbox_root: str) -> None:
+    """Configure Django with NetBox's settings (including its configured plugins)."""
+    sys.path.insert(0, netbox_root)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "netbox.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextlib.contextmanager
+def seeded_transaction(keep: bool = False):
+    """Run the benchmark in a transaction which is rolled back unless `keep` is set."""
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        if not keep:
+            transaction.set_rollback(True)
+
+
+@contextlib.contextmanager
+def timer(label: str, count: int | None = None):
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    rate = f" ({count / elapsed:,.0f}/s)" if count and elapsed else ""
+    print(f"{label}: {elapsed * 1000:,.1f} ms{rate}")
+
+
+def ipv4(value: int, prefix_length: int) -> str:
+    from netaddr import IPAddress
+
+    return f"{IPAddress(value, 4)}/{prefix_length}"
+
+
+def seed(accounts: int = 100, regions: int = 10, vpcs: int = 2000, subnets: int = 200_000, prefixes: bool = True):
+    """
+    Bulk-create a synthetic estate of accounts, regions, VPCs and subnets (spread evenly over
+    the VPCs). With `prefixes`, every VPC and subnet also gets an ipam.Prefix CIDR.
+
+    Objects are created with bulk_create(), so no signals fire; rollups are rebuilt at the end.
+    """
+    from dcim.models import Region
+    from ipam.models import Prefix
+
+    from netbox_aws_vpc_plugin.choices import AWSSubnetStatusChoices, AWSVPCStatusChoices
+    from netbox_aws_vpc_plugin.models import AWSVPC, AWSAccount, AWSSubnet
+    from netbox_aws_vpc_plugin.rollups import refresh_rollups
+
+    subnets_per_vpc = -(-subnets // vpcs)
+    if vpcs > 1 << (VPC_PREFIX_LENGTH - 8) or subnets_per_vpc > 1 << (SUBNET_PREFIX_LENGTH - VPC_PREFIX_LENGTH):
+        raise ValueError("Too many VPCs or subnets per VPC for the synthetic address plan")
+
+    vpc_statuses = [choice[0] for choice in AWSVPCStatusChoices.CHOICES]
+    subnet_statuses = [choice[0] for choice in AWSSubnetStatusChoices.CHOICES]
+
+    region_objs = [
+        Region.objects.create(name=f"Benchmark Region {i}", slug=f"benchmark-region-{i}") for i in range(regions)
+    ]
+    account_objs = AWSAccount.objects.bulk_create(
+        AWSAccount(account_id=f"9{i:011d}", name=f"Benchmark {i}") for i in range(accounts)
+    )
+
+    vpc_size = 1 << (32 - VPC_PREFIX_LENGTH)
+    vpc_prefixes = [None] * vpcs
+    if prefixes:
+        vpc_prefixes = Prefix.objects.bulk_create(
+            Prefix(prefix=ipv4(BASE_NETWORK + i * vpc_size, VPC_PREFIX_LENGTH)) for i in range(vpcs)
+        )
+    vpc_objs = AWSVPC.objects.bulk_create(
+        AWSVPC(
+            vpc_id=f"vpc-{i:017x}",
+            vpc_cidr=vpc_prefixes[i],
+            owner_account=account_objs[i % accounts],
+            region=region_objs[i % regions],
+            status=vpc_statuses[i % len(vpc_statuses)],
+        )
+        for i in range(vpcs)
+    )
+
+    subnet_size = 1 << (32 - SUBNET_PREFIX_LENGTH)
+    subnet_networks = [BASE_NETWORK + (i % vpcs) * vpc_size + (i // vpcs) * subnet_size for i in range(subnets)]
+    subnet_prefixes = [None] * subnets
+    if prefixes:
+        subnet_prefixes = Prefix.objects.bulk_create(
+            (Prefix(prefix=ipv4(network, SUBNET_PREFIX_LENGTH)) for network in subnet_networks),
+            batch_size=5000,
+        )
+    AWSSubnet.objects.bulk_create(
+        (
+            AWSSubnet(
+                subnet_id=f"subnet-{i:017x}",
+                subnet_cidr=subnet_prefixes[i],
+                vpc=vpc_objs[i % vpcs],
+                owner_account=vpc_objs[i % vpcs].owner_account,
+                region=vpc_objs[i % vpcs].region,
+                status=subnet_statuses[i % len(subnet_statuses)],
+            )
+            for i in range(subnets)
+        ),
+        batch_size=5000,
+    )
+    refresh_rollups()
+
+    return {"regions": region_objs, "accounts": account_objs, "vpcs": vpc_objs}
+
+
+def analyze(*models) -> None:
+    """Refresh the planner statistics of the given models' tables."""
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
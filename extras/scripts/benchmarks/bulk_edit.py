@@ -0,0 +1,63 @@
+#! /usr/bin/env python3
+
+"""
+Seed 10k subnets, then time editing their status, region and tags through the subnet bulk edit
+view and deleting them through the bulk delete view, all in single requests.
+"""
+
+import sys
+
+from benchmark_utils import argument_parser, seed, seeded_transaction, setup_django, timer
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=10_000)
+    parser.add_argument("--vpcs", type=int, default=100)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from core.models import ObjectChange
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+    from extras.models import Tag
+
+    from netbox_aws_vpc_plugin.choices import AWSSubnetStatusChoices
+    from netbox_aws_vpc_plugin.models import AWSSubnet
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.vpcs} VPCs and {args.subnets} subnets"):
+            estate = seed(vpcs=args.vpcs, subnets=args.subnets)
+        tag = Tag.objects.create(name="Benchmark Decommission", slug="benchmark-decommission")
+        pks = list(AWSSubnet.objects.values_list("pk", flat=True))
+
+        user = get_user_model().objects.create_superuser(username="bulk-edit-benchmark")
+        client = Client()
+        client.force_login(user)
+
+        url = reverse("plugins:netbox_aws_vpc_plugin:awssubnet_bulk_edit")
+        data = {
+            "pk": pks,
+            "_apply": True,
+            "status": AWSSubnetStatusChoices.STATUS_PLANNED_DEPRECATION,
+            "region": estate["regions"][0].pk,
+            "add_tags": [tag.pk],
+        }
+        changes = ObjectChange.objects.count()
+        with timer(f"Bulk edited {len(pks):,} subnets", len(pks)):
+            response = client.post(url, data)
+        assert response.status_code == 302, response
+        print(f"  {ObjectChange.objects.count() - changes:,} change log entries")
+
+        url = reverse("plugins:netbox_aws_vpc_plugin:awssubnet_bulk_delete")
+        with timer(f"Bulk deleted {len(pks):,} subnets", len(pks)):
+            response = client.post(url, {"pk": pks, "confirm": True, "_confirm": True})
+        assert response.status_code == 302, response
+        assert not AWSSubnet.objects.exists()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#! /usr/bin/env python3
+
+"""
+Seed VPCs and free subnet prefixes, then import 50k subnets by natural key (VPC ID, CIDR, account
+ID and region slug) through the subnet bulk import view as a single CSV file.
+"""
+
+import sys
+
+from benchmark_utils import (
+    BASE_NETWORK,
+    SUBNET_PREFIX_LENGTH,
+    VPC_PREFIX_LENGTH,
+    argument_parser,
+    ipv4,
+    seed,
+    seeded_transaction,
+    setup_django,
+    timer,
+)
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=50_000)
+    parser.add_argument("--vpcs", type=int, default=500)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+    from ipam.models import Prefix
+
+    from netbox_aws_vpc_plugin.models import AWSSubnet
+
+    vpc_size = 1 << (32 - VPC_PREFIX_LENGTH)
+    subnet_size = 1 << (32 - SUBNET_PREFIX_LENGTH)
+    if -(-args.subnets // args.vpcs) > vpc_size // subnet_size:
+        parser.error("Too many subnets per VPC for the synthetic address plan")
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.vpcs} VPCs and {args.subnets} free subnet prefixes"):
+            estate = seed(vpcs=args.vpcs, subnets=0)
+            networks = [
+                BASE_NETWORK + (i % args.vpcs) * vpc_size + (i // args.vpcs) * subnet_size for i in range(args.subnets)
+            ]
+            Prefix.objects.bulk_create(
+                (Prefix(prefix=ipv4(network, SUBNET_PREFIX_LENGTH)) for network in networks), batch_size=5000
+            )
+
+        vpcs = estate["vpcs"]
+        lines = ["subnet_id,vpc,subnet_cidr,owner_account,region,status"]
+        for i, network in enumerate(networks):
+            vpc = vpcs[i % args.vpcs]
+            lines.append(
+                f"subnet-{i:017x},{vpc.vpc_id},{ipv4(network, SUBNET_PREFIX_LENGTH)},"
+                f"{vpc.owner_account.account_id},{vpc.region.slug},ACTIVE"
+            )
+
+        user = get_user_model().objects.create_superuser(username="bulk-import-benchmark")
+        client = Client()
+        client.force_login(user)
+        url = reverse("plugins:netbox_aws_vpc_plugin:awssubnet_bulk_import")
+        with timer(f"Imported {args.subnets:,} subnets", args.subnets):
+            response = client.post(url, {"data": "\n".join(lines), "format": "csv", "csv_delimiter": ","})
+        assert response.status_code == 302, response.context["form"].errors if response.context else response
+        assert AWSSubnet.objects.count() == args.subnets
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
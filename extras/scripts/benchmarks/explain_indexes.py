@@ -0,0 +1,58 @@
+#! /usr/bin/env python3
+
+"""
+Seed a synthetic estate (200k subnets by default) and EXPLAIN ANALYZE the plugin's most common
+filter combinations, reporting whether PostgreSQL plans them with the composite indexes.
+
+Exits non-zero if any query is planned without its expected index.
+"""
+
+import sys
+
+from benchmark_utils import analyze, argument_parser, seed, seeded_transaction, setup_django, timer
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=200_000)
+    parser.add_argument("--vpcs", type=int, default=2000)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from netbox_aws_vpc_plugin.filtersets import AWSSubnetFilterSet, AWSVPCFilterSet
+    from netbox_aws_vpc_plugin.models import AWSVPC, AWSSubnet
+
+    missing = []
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.vpcs} VPCs and {args.subnets} subnets"):
+            estate = seed(vpcs=args.vpcs, subnets=args.subnets, prefixes=False)
+            analyze(AWSVPC, AWSSubnet)
+
+        vpc = estate["vpcs"][0]
+        checks = (
+            (
+                "AWSSubnet vpc + status",
+                "awssubnet_vpc_status",
+                AWSSubnetFilterSet({"vpc": [vpc.pk], "status": [vpc.status]}, AWSSubnet.objects.all()).qs,
+            ),
+            (
+                "AWSVPC owner_account + region + status",
+                "awsvpc_owner_region_status",
+                AWSVPCFilterSet(
+                    {"owner_account": [vpc.owner_account_id], "region": [vpc.region_id], "status": [vpc.status]},
+                    AWSVPC.objects.all(),
+                ).qs,
+            ),
+        )
+        for label, index, queryset in checks:
+            plan = queryset.explain(analyze=True)
+            used = index in plan
+            print(f"\n== {label}: {'uses' if used else 'DOES NOT USE'} {index}\n{plan}")
+            if not used:
+                missing.append(index)
+
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
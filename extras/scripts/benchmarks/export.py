@@ -0,0 +1,49 @@
+#! /usr/bin/env python3
+
+"""
+Seed a synthetic estate (200k subnets by default) and stream it through the subnet export API
+endpoint in each format, reporting throughput and the peak Python memory allocated while
+streaming.
+"""
+
+import sys
+import tracemalloc
+
+from benchmark_utils import argument_parser, seed, seeded_transaction, setup_django, timer
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=200_000)
+    parser.add_argument("--vpcs", type=int, default=2000)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.vpcs} VPCs and {args.subnets} subnets"):
+            seed(vpcs=args.vpcs, subnets=args.subnets)
+
+        user = get_user_model().objects.create_superuser(username="export-benchmark")
+        client = Client()
+        client.force_login(user)
+        url = f"{reverse('plugins-api:netbox_aws_vpc_plugin-api:awssubnet-list')}export/"
+
+        for params in ("output=ndjson", "output=csv", "output=csv&gzip=true"):
+            tracemalloc.start()
+            with timer(f"Exported {args.subnets:,} subnets ({params})", args.subnets):
+                response = client.get(f"{url}?{params}")
+                assert response.status_code == 200, response.content
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {size / 2**20:,.1f} MiB written, {peak / 2**20:,.1f} MiB peak allocated")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#! /usr/bin/env python3
+
+"""
+Seed a synthetic estate (400 accounts and 4,000 VPCs by default) and compare the page weight and
+render time of the subnet and VPC list views with the API-backed filter forms against forms
+preloading every VPC, account and region as plain choices.
+"""
+
+import sys
+
+from benchmark_utils import argument_parser, seed, seeded_transaction, setup_django, timer
+
+
+def preloading_filter_forms():
+    """Return the filter forms as they were before the related object selectors were API-backed."""
+    from dcim.models import Region
+    from django import forms
+
+    from netbox_aws_vpc_plugin.forms import AWSSubnetFilterForm, AWSVPCFilterForm
+    from netbox_aws_vpc_plugin.models import AWSVPC, AWSAccount
+
+    class PreloadingAWSVPCFilterForm(AWSVPCFilterForm):
+        owner_account = forms.ModelMultipleChoiceField(queryset=AWSAccount.objects.all(), required=False)
+        region = forms.ModelMultipleChoiceField(queryset=Region.objects.all(), required=False)
+
+    class PreloadingAWSSubnetFilterForm(AWSSubnetFilterForm):
+        vpc = forms.ModelMultipleChoiceField(queryset=AWSVPC.objects.all(), required=False)
+        owner_account = forms.ModelMultipleChoiceField(queryset=AWSAccount.objects.all(), required=False)
+        region = forms.ModelMultipleChoiceField(queryset=Region.objects.all(), required=False)
+
+    return {"awsvpc": PreloadingAWSVPCFilterForm, "awssubnet": PreloadingAWSSubnetFilterForm}
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=400)
+    parser.add_argument("--vpcs", type=int, default=4000)
+    parser.add_argument("--subnets", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from netbox_aws_vpc_plugin import views
+
+    list_views = {"awsvpc": views.AWSVPCListView, "awssubnet": views.AWSSubnetListView}
+    filter_forms = {
+        "preloaded choices": preloading_filter_forms(),
+        "API-backed selectors": {model: view.filterset_form for model, view in list_views.items()},
+    }
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.accounts} accounts, {args.vpcs} VPCs and {args.subnets} subnets"):
+            seed(accounts=args.accounts, vpcs=args.vpcs, subnets=args.subnets, prefixes=False)
+
+        user = get_user_model().objects.create_superuser(username="filter-forms-benchmark")
+        client = Client()
+        client.force_login(user)
+
+        for model, view in list_views.items():
+            url = reverse(f"plugins:netbox_aws_vpc_plugin:{model}_list")
+            original = view.filterset_form
+            try:
+                for label, forms in filter_forms.items():
+                    view.filterset_form = forms[model]
+                    # Warm up any per-process caches before measuring
+                    response = client.get(url)
+                    assert response.status_code == 200, response.content
+                    with timer(f"Rendered {args.repeat} {model} list pages ({label})", args.repeat):
+                        for _ in range(args.repeat):
+                            client.get(url)
+                    print(f"  {len(response.content) / 2**10:,.1f} KiB per page")
+            finally:
+                view.filterset_form = original
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
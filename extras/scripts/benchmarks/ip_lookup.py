@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+
+"""
+Seed a synthetic estate (200k subnets by default) and measure IP-to-subnet resolution: the
+time to build the in-memory prefix matcher, raw lookup throughput, and end-to-end throughput
+of the IP lookup API endpoint.
+"""
+
+import random
+import sys
+
+from benchmark_utils import (
+    BASE_NETWORK,
+    VPC_PREFIX_LENGTH,
+    argument_parser,
+    seed,
+    seeded_transaction,
+    setup_django,
+    timer,
+)
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=200_000)
+    parser.add_argument("--vpcs", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Addresses per API request")
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+    from netaddr import IPAddress
+
+    from netbox_aws_vpc_plugin.ip_lookup import build_matcher, lookup_addresses
+    from netbox_aws_vpc_plugin.prefix_matcher import parse_ip
+
+    rng = random.Random(0)
+    span = args.vpcs << (32 - VPC_PREFIX_LENGTH)
+    addresses = [str(IPAddress(BASE_NETWORK + rng.randrange(span), 4)) for _ in range(args.lookups)]
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.vpcs} VPCs and {args.subnets} subnets"):
+            seed(vpcs=args.vpcs, subnets=args.subnets)
+
+        with timer("Built prefix matcher"):
+            matcher = build_matcher()
+        print(f"  {matcher.size:,} CIDRs")
+
+        parsed = [parse_ip(address) for address in addresses]
+        with timer(f"{args.lookups:,} matcher lookups", args.lookups):
+            for address in parsed:
+                matcher.lookup(address)
+
+        with timer(f"{args.lookups:,} lookup_addresses() resolutions", args.lookups):
+            resolved = sum(1 for _, matches, _ in lookup_addresses(addresses) if matches)
+        print(f"  {resolved:,} addresses matched")
+
+        user = get_user_model().objects.create_superuser(username="ip-lookup-benchmark")
+        client = Client()
+        client.force_login(user)
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:ip-lookup")
+        with timer(f"{args.lookups:,} API resolutions in batches of {args.batch_size:,}", args.lookups):
+            for start in range(0, len(addresses), args.batch_size):
+                end = start + args.batch_size
+                batch = "\n".join(addresses[start:end])
+                response = client.post(url, batch, content_type="text/plain")
+                assert response.status_code == 200, response.content
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
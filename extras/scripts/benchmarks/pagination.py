@@ -0,0 +1,50 @@
+#! /usr/bin/env python3
+
+"""
+Seed a synthetic estate (200k subnets by default) and time fetching pages of the subnet list API
+endpoint at increasing depths, by offset and by keyset cursor.
+"""
+
+import sys
+from base64 import urlsafe_b64encode
+
+from benchmark_utils import argument_parser, seed, seeded_transaction, setup_django, timer
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=200_000)
+    parser.add_argument("--vpcs", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from netbox_aws_vpc_plugin.models import AWSSubnet
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.vpcs} VPCs and {args.subnets} subnets"):
+            seed(vpcs=args.vpcs, subnets=args.subnets)
+
+        user = get_user_model().objects.create_superuser(username="pagination-benchmark")
+        client = Client()
+        client.force_login(user)
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awssubnet-list")
+        subnet_ids = AWSSubnet.objects.order_by("subnet_id").values_list("subnet_id", flat=True)
+
+        for fraction in (0, 0.25, 0.5, 0.75, 0.99):
+            offset = int(args.subnets * fraction)
+            cursor = urlsafe_b64encode(subnet_ids[offset - 1].encode()).decode() if offset else ""
+            for label, params in (("offset", f"offset={offset}"), ("cursor", f"cursor={cursor}")):
+                with timer(f"Fetched {args.limit:,} subnets from row {offset:,} by {label}", args.limit):
+                    response = client.get(f"{url}?limit={args.limit}&{params}")
+                assert response.status_code == 200, response.content
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#! /usr/bin/env python3
+
+"""
+Seed a synthetic estate (200k subnets by default) and compare 1,000-row pages of the VPC and
+subnet list API endpoints in full, sparse (`?fields=`) and brief mode, by latency, queries and
+payload size.
+"""
+
+import sys
+
+from benchmark_utils import argument_parser, seed, seeded_transaction, setup_django, timer
+
+MODES = {
+    "awsvpc": (("full", ""), ("sparse", "fields=id,vpc_id,owner_account"), ("brief", "brief=true")),
+    "awssubnet": (("full", ""), ("sparse", "fields=id,subnet_id,vpc,subnet_cidr"), ("brief", "brief=true")),
+}
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=200_000)
+    parser.add_argument("--vpcs", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.vpcs} VPCs and {args.subnets} subnets"):
+            seed(vpcs=args.vpcs, subnets=args.subnets)
+
+        user = get_user_model().objects.create_superuser(username="sparse-fields-benchmark")
+        client = Client()
+        client.force_login(user)
+
+        for model, modes in MODES.items():
+            url = f"{reverse(f'plugins-api:netbox_aws_vpc_plugin-api:{model}-list')}?limit={args.limit}"
+            for label, params in modes:
+                page_url = f"{url}&{params}" if params else url
+                # Warm up any per-process caches before measuring
+                client.get(page_url)
+                with CaptureQueriesContext(connection) as context:
+                    response = client.get(page_url)
+                assert response.status_code == 200, response.content
+                with timer(f"Fetched {args.repeat} pages of {args.limit:,} {model} objects ({label})", args.repeat):
+                    for _ in range(args.repeat):
+                        client.get(page_url)
+                print(f"  {len(response.content) / 2**10:,.1f} KiB per page, {len(context)} queries")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+#! /usr/bin/env python3
+
+"""
+Seed a synthetic estate (400 accounts and 200k subnets by default) and stream its whole topology
+through the topology API endpoint as a nested tree and as flat nodes, reporting the time, queries
+and payload size of each.
+"""
+
+import sys
+
+from benchmark_utils import argument_parser, seed, seeded_transaction, setup_django, timer
+
+
+def main(argv=None):
+    parser = argument_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=400)
+    parser.add_argument("--subnets", type=int, default=200_000)
+    parser.add_argument("--vpcs", type=int, default=2000)
+    args = parser.parse_args(argv)
+    setup_django(args.netbox_root)
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    with seeded_transaction(keep=args.keep):
+        with timer(f"Seeded {args.accounts} accounts, {args.vpcs} VPCs and {args.subnets} subnets"):
+            seed(accounts=args.accounts, vpcs=args.vpcs, subnets=args.subnets)
+
+        user = get_user_model().objects.create_superuser(username="topology-benchmark")
+        client = Client()
+        client.force_login(user)
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:topology")
+
+        for params in ("", "flat=true", "gzip=true"):
+            with CaptureQueriesContext(connection) as context:
+                with timer(f"Streamed the topology ({params or 'nested'})", args.accounts + args.vpcs + args.subnets):
+                    response = client.get(f"{url}?{params}")
+                    assert response.status_code == 200, response
+                    size = sum(len(chunk) for chunk in response.streaming_content)
+            print(f"  {size / 2**20:,.1f} MiB written, {len(context)} queries")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
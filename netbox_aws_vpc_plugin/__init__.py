@@ -19,6 +19,23 @@ class AWSVPCConfig(PluginConfig):
     min_version = "4.5.0"
     author = __author__
     author_email = __email__
+    default_settings = {
+        # Largest batch of addresses accepted by the IP lookup API endpoint
+        "ip_lookup_max_addresses": 10000,
+        # Largest batch of AWS IDs accepted by the account, VPC and subnet lookup API endpoints
+        "lookup_max_ids": 10000,
+        # Limits on the GraphQL queries of the plugin's types (0 disables a limit)
+        "graphql_max_depth": 8,
+        "graphql_max_complexity": 500,
+        # Seconds to cache REST API list and detail responses for (0 disables the cache)
+        "api_cache_timeout": 0,
+        # Most related objects embedded per object by the REST API's `include` parameter
+        "api_include_max_objects": 100,
+    }
+
+    def ready(self):
+        super().ready()
+        from . import signals  # noqa: F401
 
 
 config = AWSVPCConfig
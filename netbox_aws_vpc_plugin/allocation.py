@@ -0,0 +1,78 @@
+"""
+Find and reserve free subnet CIDRs within AWS VPCs.
+"""
+
+import secrets
+
+import netaddr
+from ipam.choices import PrefixStatusChoices
+from ipam.models import Prefix
+
+from .choices import AWSSubnetStatusChoices
+from .models import AWSSubnet
+
+__all__ = (
+    "available_subnets",
+    "reserve_subnet",
+    "vpc_prefixes",
+)
+
+
+def vpc_prefixes(vpc, family):
+    """
+    Return the VPC's CIDR Prefixes of the given family.
+    """
+    if family == 4:
+        prefixes = list(vpc.vpc_secondary_ipv4_cidrs.all())
+        if vpc.vpc_cidr is not None:
+            prefixes.insert(0, vpc.vpc_cidr)
+        return prefixes
+    return list(vpc.vpc_ipv6_cidrs.all())
+
+
+def available_subnets(vpc, prefix_length, family=4):
+    """
+    Yield the free `netaddr.IPNetwork`s of `prefix_length` in the VPC's CIDRs, lowest first.
+
+    Free space is the VPC CIDRs minus its subnets' CIDRs, reduced to the fewest covering CIDR
+    blocks. Candidates are only carved out of free blocks large enough to hold them, so the cost
+    does not depend on how many candidates are already in use.
+    """
+    field = "subnet_cidr" if family == 4 else "subnet_ipv6_cidr"
+    used = AWSSubnet.objects.filter(vpc=vpc, **{f"{field}__isnull": False}).values_list(f"{field}__prefix", flat=True)
+    free = netaddr.IPSet(prefix.prefix for prefix in vpc_prefixes(vpc, family)) - netaddr.IPSet(used)
+    for block in free.iter_cidrs():
+        if block.prefixlen <= prefix_length:
+            yield from block.subnet(prefix_length)
+
+
+def reserve_subnet(vpc, network, subnet_id=None, name=""):
+    """
+    Create a reserved Prefix for `network` and a placeholder AWSSubnet using it in the VPC.
+
+    The caller is responsible for locking the VPC and checking `network` is still free.
+    """
+    parent = next(prefix for prefix in vpc_prefixes(vpc, network.version) if network in prefix.prefix)
+    prefix = Prefix(
+        prefix=network,
+        vrf=parent.vrf,
+        tenant=parent.tenant,
+        status=PrefixStatusChoices.STATUS_RESERVED,
+        description=f"Reserved for a subnet of {vpc.vpc_id}",
+    )
+    prefix.full_clean()
+    prefix.save()
+
+    subnet = AWSSubnet(
+        # Replaced by the real subnet ID once the subnet is created in AWS
+        subnet_id=subnet_id or f"reserved-{secrets.token_hex(8)}",
+        name=name,
+        vpc=vpc,
+        owner_account=vpc.owner_account,
+        region=vpc.region,
+        status=AWSSubnetStatusChoices.STATUS_RESERVED,
+        **{"subnet_cidr" if network.version == 4 else "subnet_ipv6_cidr": prefix},
+    )
+    subnet.full_clean()
+    subnet.save()
+    return subnet
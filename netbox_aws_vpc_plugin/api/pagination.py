@@ -0,0 +1,69 @@
+from base64 import b64decode, urlsafe_b64encode
+
+from django.db.models import QuerySet
+from netbox.api.pagination import OptimizedLimitOffsetPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+__all__ = ("KeysetPagination",)
+
+
+class KeysetPagination(OptimizedLimitOffsetPagination):
+    """
+    NetBox's limit/offset pagination, switching to keyset pagination when a `cursor` is requested.
+
+    The view's `natural_key_field` must be a unique, indexed column. Pass an empty `cursor` to
+    fetch the first page, then follow `next`: each page is read from the index starting after the
+    last key of the previous one, so it costs the same however deep it is. Keyset pages are always
+    ordered by `natural_key_field` and carry no `count` or `previous` link.
+    """
+
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_field = getattr(view, "natural_key_field", None)
+        self.keyset = (
+            self.cursor_field is not None
+            and self.cursor_query_param in request.query_params
+            and isinstance(queryset, QuerySet)
+        )
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        if request.query_params.get(self.ordering_query_param):
+            raise ValidationError({self.ordering_query_param: "Cursor pages are always ordered by their cursor."})
+        self.request = request
+        self.limit = self.get_limit(request) or self.default_limit
+
+        queryset = queryset.order_by(self.cursor_field)
+        if (after := self.decode_cursor(request.query_params[self.cursor_query_param])) is not None:
+            queryset = queryset.filter(**{f"{self.cursor_field}__gt": after})
+        page = list(queryset[: self.limit + 1])
+        self.next_key = getattr(page[self.limit - 1], self.cursor_field) if len(page) > self.limit else None
+        return page[: self.limit]
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            return b64decode(cursor.encode(), altchars=b"-_", validate=True).decode()
+        except (ValueError, UnicodeError):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+
+    def encode_cursor(self, key):
+        return urlsafe_b64encode(key.encode()).decode()
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_key is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_key))
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,15 @@
+from rest_framework.parsers import BaseParser
+
+__all__ = ("PlainTextParser",)
+
+
+class PlainTextParser(BaseParser):
+    """
+    Parse a text/plain request body into a list of its non-blank lines.
+    """
+
+    media_type = "text/plain"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        return [line.strip() for line in stream.read().decode(encoding).splitlines() if line.strip()]
@@ -4,15 +4,33 @@ from netbox.api.serializers import NetBoxModelSerializer
 from rest_framework import serializers
 from tenancy.api.serializers import TenantSerializer
 
+from ..constants import SUBNET_PREFIX_LENGTHS
 from ..models import AWSVPC, AWSAccount, AWSSubnet
 from .nested_serializers import NestedAWSAccountSerializer, NestedAWSVPCSerializer
 
 
-class AWSVPCSerializer(NetBoxModelSerializer):
+class IncludedObjectsMixin:
+    """
+    Add the related objects embedded with `?include=` (prefetched by the viewset's
+    `IncludeMixin`) to the representation.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for name, serializer_class in self.context.get("include", {}).items():
+            if hasattr(instance, f"included_{name}"):
+                objects = getattr(instance, f"included_{name}")
+                data[name] = serializer_class(objects, many=True, context=self.context).data
+        return data
+
+
+class AWSVPCSerializer(IncludedObjectsMixin, NetBoxModelSerializer):
     url = serializers.HyperlinkedIdentityField(view_name="plugins-api:netbox_aws_vpc_plugin-api:awsvpc-detail")
     vpc_cidr = PrefixSerializer(required=False, allow_null=True, default=None, nested=True)
     owner_account = NestedAWSAccountSerializer()
     region = RegionSerializer(required=False, allow_null=True, default=None, nested=True)
+    # Annotated by the viewset from the persisted rollups
+    ipv4_utilization = serializers.FloatField(read_only=True)
 
     class Meta:
         model = AWSVPC
@@ -29,11 +47,16 @@ class AWSVPCSerializer(NetBoxModelSerializer):
             "owner_account",
             "region",
             "status",
+            "subnet_count",
+            "allocated_ipv4_addresses",
+            "ipv4_address_space",
+            "ipv4_utilization",
             "tags",
             "custom_fields",
             "created",
             "last_updated",
         )
+        brief_fields = ("id", "url", "display", "vpc_id")
 
 
 class AWSSubnetSerializer(NetBoxModelSerializer):
@@ -63,11 +86,14 @@ class AWSSubnetSerializer(NetBoxModelSerializer):
             "created",
             "last_updated",
         )
+        brief_fields = ("id", "url", "display", "subnet_id")
 
 
-class AWSAccountSerializer(NetBoxModelSerializer):
+class AWSAccountSerializer(IncludedObjectsMixin, NetBoxModelSerializer):
     url = serializers.HyperlinkedIdentityField(view_name="plugins-api:netbox_aws_vpc_plugin-api:awsaccount-detail")
     tenant = TenantSerializer(required=False, allow_null=True, default=None, nested=True)
+    # Annotated by the viewset from the persisted rollups
+    ipv4_utilization = serializers.FloatField(read_only=True)
 
     class Meta:
         model = AWSAccount
@@ -81,8 +107,62 @@ class AWSAccountSerializer(NetBoxModelSerializer):
             "tenant",
             "description",
             "status",
+            "vpc_count",
+            "subnet_count",
+            "allocated_ipv4_addresses",
+            "ipv4_address_space",
+            "ipv4_utilization",
             "tags",
             "custom_fields",
             "created",
             "last_updated",
         )
+        brief_fields = ("id", "url", "display", "account_id")
+
+
+class AWSVPCOverlapCIDRSerializer(serializers.Serializer):
+    """
+    One side of an overlap: a VPC CIDR with its VPC and owner account.
+    """
+
+    cidr = serializers.CharField(read_only=True)
+    vpc = serializers.SerializerMethodField()
+    account = serializers.SerializerMethodField()
+
+    def get_vpc(self, obj):
+        return {"id": obj.vpc, "vpc_id": obj.vpc_id}
+
+    def get_account(self, obj):
+        if obj.account is not None:
+            return {"id": obj.account, "account_id": obj.account_id}
+
+
+class AWSVPCOverlapSerializer(serializers.Serializer):
+    family = serializers.IntegerField(source="cidr.family", read_only=True)
+    cross_account = serializers.BooleanField(read_only=True)
+    cidrs = serializers.SerializerMethodField()
+
+    def get_cidrs(self, obj):
+        return AWSVPCOverlapCIDRSerializer(obj, many=True).data
+
+
+class AvailableAWSSubnetRequestSerializer(serializers.Serializer):
+    """
+    Parameters for listing free subnet CIDRs in a VPC, or reserving the first one.
+    """
+
+    prefix_length = serializers.IntegerField()
+    family = serializers.ChoiceField(choices=(4, 6), default=4)
+    subnet_id = serializers.CharField(max_length=47, required=False)
+    name = serializers.CharField(max_length=256, required=False, allow_blank=True, default="")
+
+    def validate(self, data):
+        allowed = SUBNET_PREFIX_LENGTHS[data["family"]]
+        if data["prefix_length"] not in allowed:
+            raise serializers.ValidationError(
+                {
+                    "prefix_length": f"AWS IPv{data['family']} subnets must be /{allowed[0]} to /{allowed[-1]}"
+                    + (f" in steps of {allowed.step}" if allowed.step > 1 else "")
+                }
+            )
+        return data
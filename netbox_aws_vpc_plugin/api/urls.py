@@ -1,3 +1,4 @@
+from django.urls import path
 from netbox.api.routers import NetBoxRouter
 
 from . import views
@@ -9,4 +10,13 @@ router.register("aws-vpcs", views.AWSVPCViewSet)
 router.register("aws-subnets", views.AWSSubnetViewSet)
 router.register("aws-accounts", views.AWSAccountViewSet)
 
-urlpatterns = router.urls
+urlpatterns = [
+    path(
+        "aws-vpcs/<int:pk>/available-subnets/",
+        views.AWSVPCAvailableSubnetsView.as_view(),
+        name="awsvpc-available-subnets",
+    ),
+    path("ip-lookup/", views.IPLookupView.as_view(), name="ip-lookup"),
+    path("topology/", views.TopologyView.as_view(), name="topology"),
+    *router.urls,
+]
@@ -1,22 +1,662 @@
+import hashlib
+import itertools
+
+from dcim.models import Region
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Prefetch
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from extras.models import Tag
+from ipam.models import Prefix
+from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.viewsets import NetBoxModelViewSet
+from netbox.plugins import get_plugin_config
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from tenancy.models import Tenant
+
+from .. import filtersets, forms, models
+from ..allocation import available_subnets, reserve_subnet
+from ..bulk import BulkUpserter, has_event_rules
+from ..cache import count_response_cache, get_generations, get_last_changed
+from ..export import EXPORT_FORMATS, export_response
+from ..ip_lookup import lookup_addresses
+from ..overlaps import get_overlaps
+from ..topology import topology_response
+from .nested_serializers import NestedAWSSubnetSerializer, NestedAWSVPCSerializer
+from .pagination import KeysetPagination
+from .parsers import PlainTextParser
+from .serializers import (
+    AvailableAWSSubnetRequestSerializer,
+    AWSAccountSerializer,
+    AWSSubnetSerializer,
+    AWSVPCOverlapSerializer,
+    AWSVPCSerializer,
+)
+
+
+class ExportMixin:
+    """
+    Add an `export/` list action streaming every object matching the usual filters as NDJSON or
+    CSV (`?output=ndjson|csv`), gzip-encoded with `?gzip=true`.
+    """
+
+    @action(detail=False, url_path="export")
+    def export(self, request):
+        export_format = request.query_params.get("output", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Must be one of: {', '.join(EXPORT_FORMATS)}."})
+        compress = request.query_params.get("gzip", "").lower() in ("true", "1")
+        return export_response(self.filter_queryset(self.get_queryset()), export_format, compress=compress)
+
+
+# The models whose changes can alter a serialized account, VPC or subnet, including the related
+# objects nested in it
+CACHE_MODELS = (models.AWSAccount, models.AWSVPC, models.AWSSubnet, Prefix, Region, Tenant, Tag)
+
+
+def get_permission_scope(queryset):
+    """
+    Identify the permission scope of a queryset restricted to a user's object permissions.
+    """
+    try:
+        return str(queryset.query)
+    except EmptyResultSet:
+        return None
+
+
+def get_view_permission_scope(view):
+    """
+    Identify the permission scope of a viewset's response: that of its queryset, and of any related
+    objects embedded with `include`.
+    """
+    scopes = [get_permission_scope(view.queryset)]
+    if isinstance(view, IncludeMixin):
+        scopes.extend(get_permission_scope(related) for related in view.get_included_querysets().values())
+    return scopes
+
+
+class SparseFieldsMixin:
+    """
+    Join, prefetch and annotate only what the fields requested (with `?fields=`, or the brief
+    fields with `?brief=true`) need, rather than everything the full representation does.
+
+    The serializer trims its output to the same fields, so the viewset's `queryset` is left bare
+    and every relation it would serialize is listed here instead.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    # Field: the queryset method annotating it
+    annotated_fields = {}
+
+    def get_queryset(self):
+        return self.optimize_queryset(super().get_queryset())
+
+    def optimize_queryset(self, queryset):
+        fields = getattr(self, "requested_fields", None)
+
+        def wanted(name):
+            return fields is None or name in fields
+
+        if select_related := [name for name in self.select_related_fields if wanted(name)]:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related := [name for name in self.prefetch_related_fields if wanted(name)]:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        ordering = self.request.query_params.get("ordering", "")
+        for name, method in self.annotated_fields.items():
+            # Annotations may be sorted on without being serialized
+            if wanted(name) or name in ordering:
+                queryset = getattr(queryset, method)()
+        return queryset
+
+
+class IncludeMixin:
+    """
+    Embed related objects in brief form in list and detail responses with `?include=` and a
+    comma-separated list of the relations in `includes`. Each relation is prefetched with one
+    query, capped at `api_include_max_objects` objects per parent.
+    """
+
+    # Relation name: (reverse accessor, related model, brief serializer)
+    includes = {}
+
+    def get_includes(self):
+        if self.action not in ("list", "retrieve"):
+            return {}
+        names = [name.strip() for value in self.request.query_params.getlist("include") for name in value.split(",")]
+        names = [name for name in names if name]
+        if unknown := sorted(set(names) - set(self.includes)):
+            raise ValidationError(
+                {"include": f"Unknown relations: {', '.join(unknown)}. Must be among: {', '.join(self.includes)}."}
+            )
+        return {name: self.includes[name] for name in names}
+
+    def get_included_querysets(self):
+        """
+        Return the related objects of each requested relation which the user may view.
+        """
+        return {
+            name: model.objects.restrict(self.request.user, "view")
+            for name, (_, model, _) in self.get_includes().items()
+        }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        limit = get_plugin_config("netbox_aws_vpc_plugin", "api_include_max_objects")
+        for name, related in self.get_included_querysets().items():
+            # A sliced prefetch is limited per parent, with a window function
+            accessor = self.includes[name][0]
+            queryset = queryset.prefetch_related(
+                Prefetch(accessor, queryset=related[:limit], to_attr=f"included_{name}")
+            )
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include"] = {name: serializer for name, (_, _, serializer) in self.get_includes().items()}
+        return context
+
+
+class LookupMixin:
+    """
+    Add a `lookup/` list action fetching the objects with the given AWS IDs (`natural_key_field`)
+    in one query on its unique index.
+
+    Pass the IDs as repeated `aws_id` query parameters, or POST them as a JSON list (or an object
+    with an `aws_ids` list) or as newline-separated text/plain. With `?map=true`, each ID is mapped
+    to the object's NetBox ID instead of the object being serialized. IDs not found (or not
+    visible to the user) are listed under `missing`.
+    """
+
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        url_path="lookup",
+        # Looking objects up only reads them, even by POST
+        permission_classes=[IsAuthenticatedOrLoginNotRequired],
+        parser_classes=[JSONParser, PlainTextParser],
+    )
+    def lookup(self, request):
+        if request.method == "POST":
+            aws_ids = request.data
+            if isinstance(aws_ids, dict):
+                aws_ids = aws_ids.get("aws_ids")
+            if not isinstance(aws_ids, list) or not all(isinstance(aws_id, str) for aws_id in aws_ids):
+                raise ValidationError("Expected a list of AWS IDs.")
+        else:
+            aws_ids = request.query_params.getlist("aws_id")
+
+        aws_ids = list(dict.fromkeys(aws_ids))
+        max_ids = get_plugin_config("netbox_aws_vpc_plugin", "lookup_max_ids")
+        if len(aws_ids) > max_ids:
+            raise ValidationError(f"At most {max_ids} IDs may be looked up per request.")
+
+        # The view restricts its queryset by the request method, which for a POST means "add"
+        field = self.natural_key_field
+        queryset = self.optimize_queryset(type(self).queryset.restrict(request.user, "view"))
+        queryset = queryset.filter(**{f"{field}__in": aws_ids})
+        if request.query_params.get("map", "").lower() in ("true", "1"):
+            results = dict(queryset.order_by(field).values_list(field, "pk"))
+            found = results
+        else:
+            objects = list(queryset)
+            results = self.get_serializer(objects, many=True).data
+            found = {getattr(obj, field) for obj in objects}
+
+        return Response(
+            {
+                "count": len(results),
+                "results": results,
+                "missing": [aws_id for aws_id in aws_ids if aws_id not in found],
+            }
+        )
+
+
+class UpsertMixin:
+    """
+    Add an `upsert/` list action creating or updating objects by AWS ID (`natural_key_field`).
+
+    POST a JSON list of records (or an object with a `records` list and a `changelog_message`)
+    in the bulk import format, referencing related objects by natural key. Only the fields present
+    are updated on existing objects; many-to-many fields present replace the current assignments.
+    The records are written together, or not at all if any is invalid.
+    """
+
+    upsert_form = None
+
+    @action(detail=False, methods=["post"], url_path="upsert")
+    def upsert(self, request):
+        records, changelog_message = request.data, ""
+        if isinstance(records, dict):
+            changelog_message = records.get("changelog_message") or ""
+            records = records.get("records")
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise ValidationError("Expected a list of records.")
+        field = self.natural_key_field
+        if not all(record.get(field) for record in records):
+            raise ValidationError(f"Every record must have a {field}.")
+
+        # Adding is checked by the view's permissions; changing existing objects is checked here
+        model = self.queryset.model
+        if not request.user.has_perm(f"{model._meta.app_label}.change_{model._meta.model_name}"):
+            raise PermissionDenied("Upserting requires permission to change objects too.")
+        changeable = model.objects.restrict(request.user, "change")
+        keys = [record[field] for record in records]
+        if model.objects.filter(**{f"{field}__in": keys}).exclude(pk__in=changeable.values("pk")).exists():
+            raise PermissionDenied()
+
+        with transaction.atomic():
+            upserter = BulkUpserter(
+                self.upsert_form, request, field, changelog_message=changelog_message, fast=not has_event_rules(model)
+            )
+            objects, errors = upserter.run(records)
+            if errors:
+                transaction.set_rollback(True)
+                return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Enforce any constraints of the user's object permissions, rolling back if violated
+            if model.objects.restrict(request.user, "add").filter(pk__in=upserter.created).count() != len(
+                upserter.created
+            ) or changeable.filter(pk__in=upserter.updated).count() != len(upserter.updated):
+                raise PermissionDenied()
+
+        # The view's own queryset is restricted to the objects the user may add
+        queryset = self.optimize_queryset(type(self).queryset.filter(pk__in=[obj.pk for obj in objects]))
+        return Response(
+            {
+                "created": len(upserter.created),
+                "updated": len(upserter.updated),
+                "results": self.get_serializer(queryset, many=True).data,
+            }
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Add a strong `ETag` and `Last-Modified` to list and detail responses, and answer a matching
+    `If-None-Match` with 304 before anything is serialized.
+
+    The validators come from one aggregate query for the row count and latest `last_updated` of
+    the filtered queryset, plus the generations of `cache_models`, which also change when a
+    related object (e.g. a Prefix behind the utilization, or a nested region, tenant or tag) does
+    without touching `last_updated`.
+
+    `If-Modified-Since` is not honoured: `Last-Modified` has a one-second precision, and a delete
+    or a cache flush resetting the generations can change the response without moving it forward.
+    Only the ETag is trusted to tell that nothing changed.
+    """
+
+    cache_models = CACHE_MODELS
+
+    def list(self, request, *args, **kwargs):
+        # Validating a keyset page would aggregate over the whole list, defeating its constant cost
+        if KeysetPagination.cursor_query_param in request.query_params:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_conditional_response(queryset, super().list, request, *args, **kwargs)
 
-from .. import filtersets, models
-from .serializers import AWSAccountSerializer, AWSSubnetSerializer, AWSVPCSerializer
+    def retrieve(self, request, *args, **kwargs):
+        lookup = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: lookup})
+        except (TypeError, ValueError, DjangoValidationError):
+            # Left to the view to answer with a 404
+            return super().retrieve(request, *args, **kwargs)
+        return self.get_conditional_response(queryset, super().retrieve, request, *args, **kwargs)
 
+    def get_validators(self, request, queryset):
+        """
+        Return the ETag and Last-Modified timestamp (or None) of the objects in the queryset, or
+        None for a missing detail object.
+        """
+        state = (
+            queryset.prefetch_related(None).order_by().aggregate(count=Count("pk"), last_updated=Max("last_updated"))
+        )
+        if self.detail and not state["count"]:
+            return None
+        generations = get_generations(*self.cache_models)
+        key = (
+            state["count"],
+            state["last_updated"],
+            generations,
+            request.accepted_media_type,
+            get_view_permission_scope(self),
+        )
+        etag = f'"{hashlib.sha256(repr(key).encode()).hexdigest()}"'
 
-class AWSVPCViewSet(NetBoxModelViewSet):
-    queryset = models.AWSVPC.objects.prefetch_related("tags")
+        # Deletions and changes to related objects leave no trace in last_updated
+        timestamps = [state["last_updated"] and state["last_updated"].timestamp(), get_last_changed(*self.cache_models)]
+        last_modified = max(filter(None, timestamps), default=None)
+        return etag, last_modified and int(last_modified)
+
+    def get_conditional_response(self, queryset, view, request, *args, **kwargs):
+        # The browsable API renders forms from the live view, so it is always rendered afresh
+        if request.accepted_renderer.format == "api":
+            return view(request, *args, **kwargs)
+
+        if (validators := self.get_validators(request, queryset)) is None:
+            return view(request, *args, **kwargs)
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Serve list and detail responses from Django's cache, if enabled by the `api_cache_timeout`
+    setting.
+
+    Responses are keyed on the user's permission scope (including that of any related objects
+    embedded with `include`), the URL and its query parameters (filters, pagination and
+    brief/fields mode) and the accepted media type. The key includes the generations of
+    `cache_models`, so any change to those models invalidates every response.
+    """
+
+    cache_models = CACHE_MODELS
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self, request):
+        key = (
+            request.build_absolute_uri(request.path),
+            sorted(request.query_params.lists()),
+            request.accepted_media_type,
+            get_view_permission_scope(self),
+            get_generations(*self.cache_models),
+        )
+        return f"netbox_aws_vpc_plugin:response:{hashlib.sha256(repr(key).encode()).hexdigest()}"
+
+    def get_cached_response(self, view, request, *args, **kwargs):
+        timeout = get_plugin_config("netbox_aws_vpc_plugin", "api_cache_timeout")
+        # The browsable API renders forms from the live view, so it is never cached
+        if not timeout or request.accepted_renderer.format == "api":
+            return view(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request)
+        if (data := cache.get(key)) is not None:
+            count_response_cache(hit=True)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        count_response_cache(hit=False)
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class AWSVPCViewSet(
+    ConditionalGetMixin,
+    ResponseCacheMixin,
+    ExportMixin,
+    SparseFieldsMixin,
+    IncludeMixin,
+    LookupMixin,
+    UpsertMixin,
+    NetBoxModelViewSet,
+):
+    queryset = models.AWSVPC.objects.all()
+    select_related_fields = ("vpc_cidr", "owner_account", "region")
+    prefetch_related_fields = ("vpc_secondary_ipv4_cidrs", "vpc_ipv6_cidrs", "tags")
+    annotated_fields = {"ipv4_utilization": "annotate_utilization"}
     serializer_class = AWSVPCSerializer
     filterset_class = filtersets.AWSVPCFilterSet
+    pagination_class = KeysetPagination
+    natural_key_field = "vpc_id"
+    upsert_form = forms.AWSVPCImportForm
+    includes = {"subnets": ("awssubnet_set", models.AWSSubnet, NestedAWSSubnetSerializer)}
+
+    @action(detail=False, url_path="overlaps")
+    def overlaps(self, request):
+        """
+        List the CIDRs overlapping between VPCs, scoped by the usual VPC filters.
+        """
+        overlaps = get_overlaps(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(overlaps)
+        return self.get_paginated_response(AWSVPCOverlapSerializer(page, many=True).data)
 
 
-class AWSSubnetViewSet(NetBoxModelViewSet):
-    queryset = models.AWSSubnet.objects.prefetch_related("tags")
+class AWSSubnetViewSet(
+    ConditionalGetMixin,
+    ResponseCacheMixin,
+    ExportMixin,
+    SparseFieldsMixin,
+    LookupMixin,
+    UpsertMixin,
+    NetBoxModelViewSet,
+):
+    queryset = models.AWSSubnet.objects.all()
+    select_related_fields = ("subnet_cidr", "subnet_ipv6_cidr", "vpc", "owner_account", "region")
+    prefetch_related_fields = ("tags",)
     serializer_class = AWSSubnetSerializer
     filterset_class = filtersets.AWSSubnetFilterSet
+    pagination_class = KeysetPagination
+    natural_key_field = "subnet_id"
+    upsert_form = forms.AWSSubnetImportForm
 
 
-class AWSAccountViewSet(NetBoxModelViewSet):
-    queryset = models.AWSAccount.objects.prefetch_related("tags")
+class AWSAccountViewSet(
+    ConditionalGetMixin,
+    ResponseCacheMixin,
+    ExportMixin,
+    SparseFieldsMixin,
+    IncludeMixin,
+    LookupMixin,
+    NetBoxModelViewSet,
+):
+    queryset = models.AWSAccount.objects.all()
+    select_related_fields = ("tenant",)
+    prefetch_related_fields = ("tags",)
+    annotated_fields = {"ipv4_utilization": "annotate_utilization"}
     serializer_class = AWSAccountSerializer
     filterset_class = filtersets.AWSAccountFilterSet
+    pagination_class = KeysetPagination
+    natural_key_field = "account_id"
+    includes = {
+        "vpcs": ("awsvpc_set", models.AWSVPC, NestedAWSVPCSerializer),
+        "subnets": ("awssubnet_set", models.AWSSubnet, NestedAWSSubnetSerializer),
+    }
+
+
+class AWSVPCAvailableSubnetsView(APIView):
+    """
+    List the first free subnet CIDRs of a prefix length in a VPC, or reserve the first one.
+
+    A reservation creates a reserved Prefix and a placeholder AWSSubnet. It runs with the VPC row
+    locked, so concurrent reservations in the same VPC are serialized and never collide.
+    """
+
+    # Permissions are those of the objects created: listing requires view and reserving add
+    queryset = models.AWSSubnet.objects.all()
+
+    # Largest number of free CIDRs returned in one listing
+    max_limit = 1000
+
+    def get_view_name(self):
+        return "Available Subnets"
+
+    def get_vpc(self, request, pk, lock=False):
+        vpcs = models.AWSVPC.objects.restrict(request.user, "view")
+        if lock:
+            # Serializes reservations within the VPC until the transaction ends
+            vpcs = vpcs.select_for_update(of=("self",))
+        return get_object_or_404(vpcs, pk=pk)
+
+    def get(self, request, pk):
+        params = AvailableAWSSubnetRequestSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+
+        vpc = self.get_vpc(request, pk)
+        networks = available_subnets(vpc, params.validated_data["prefix_length"], params.validated_data["family"])
+        return Response(
+            [{"family": network.version, "prefix": str(network)} for network in itertools.islice(networks, limit)]
+        )
+
+    def post(self, request, pk):
+        params = AvailableAWSSubnetRequestSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        if not request.user.has_perm("ipam.add_prefix"):
+            raise PermissionDenied("Reserving a subnet requires permission to add prefixes.")
+
+        with transaction.atomic():
+            vpc = self.get_vpc(request, pk, lock=True)
+            network = next(available_subnets(vpc, data["prefix_length"], data["family"]), None)
+            if network is None:
+                return Response(
+                    {"detail": "Insufficient space is available in the VPC to reserve the requested subnet."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            try:
+                subnet = reserve_subnet(vpc, network, subnet_id=data.get("subnet_id"), name=data["name"])
+            except DjangoValidationError as e:
+                raise ValidationError(e.message_dict if hasattr(e, "error_dict") else e.messages)
+
+            # Enforce any constraints of the user's object permissions, rolling back if violated
+            prefix_pk = subnet.subnet_cidr_id or subnet.subnet_ipv6_cidr_id
+            if not (
+                models.AWSSubnet.objects.restrict(request.user, "add").filter(pk=subnet.pk).exists()
+                and Prefix.objects.restrict(request.user, "add").filter(pk=prefix_pk).exists()
+            ):
+                raise PermissionDenied()
+
+        serializer = AWSSubnetSerializer(subnet, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class IPLookupView(APIView):
+    """
+    Resolve a batch of IP addresses to the AWS subnet, VPC and account containing each one.
+
+    Pass the addresses as repeated `address` query parameters, or POST them as a JSON list (or an
+    object with an `addresses` list) or as newline-separated text/plain.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+    parser_classes = [JSONParser, PlainTextParser]
+
+    def get_view_name(self):
+        return "IP Lookup"
+
+    def get(self, request):
+        return self.lookup(request, request.query_params.getlist("address"))
+
+    def post(self, request):
+        addresses = request.data
+        if isinstance(addresses, dict):
+            addresses = addresses.get("addresses")
+        if not isinstance(addresses, list) or not all(isinstance(address, str) for address in addresses):
+            raise ValidationError("Expected a list of IP addresses.")
+        return self.lookup(request, addresses)
+
+    def lookup(self, request, addresses):
+        max_addresses = get_plugin_config("netbox_aws_vpc_plugin", "ip_lookup_max_addresses")
+        if len(addresses) > max_addresses:
+            raise ValidationError(f"At most {max_addresses} addresses may be looked up per request.")
+
+        results = list(lookup_addresses(addresses))
+        visible = self.get_visible_objects(request.user, results)
+        data = []
+        for address, matches, error in results:
+            result = {"address": address, "matches": []}
+            if error:
+                result["error"] = error
+            for match in matches:
+                if serialized := self.serialize_match(match, visible):
+                    result["matches"].append(serialized)
+            data.append(result)
+
+        return Response({"count": len(data), "results": data})
+
+    @staticmethod
+    def get_visible_objects(user, results):
+        """
+        Return the pks of the matched objects the user may view, by model (None for superusers).
+        """
+        if user.is_superuser:
+            return None
+        pks = {models.AWSSubnet: set(), models.AWSVPC: set(), models.AWSAccount: set()}
+        for _, matches, _ in results:
+            for match in matches:
+                pks[models.AWSSubnet].add(match.subnet)
+                pks[models.AWSVPC].add(match.vpc)
+                pks[models.AWSAccount].add(match.account)
+        return {
+            model: set(
+                model.objects.restrict(user, "view").filter(pk__in=pks[model] - {None}).values_list("pk", flat=True)
+            )
+            for model in pks
+        }
+
+    @staticmethod
+    def serialize_match(match, visible):
+        def reference(model, pk, **attrs):
+            if pk is None or (visible is not None and pk not in visible[model]):
+                return None
+            return {"id": pk, **attrs}
+
+        subnet = reference(models.AWSSubnet, match.subnet, subnet_id=match.subnet_id)
+        vpc = reference(models.AWSVPC, match.vpc, vpc_id=match.vpc_id)
+        # The CIDR belongs to the subnet, or to the VPC for a VPC-level match
+        if (subnet if match.subnet is not None else vpc) is None:
+            return None
+        return {
+            "cidr": match.cidr,
+            "subnet": subnet,
+            "vpc": vpc,
+            "account": reference(models.AWSAccount, match.account, account_id=match.account_id),
+        }
+
+
+class TopologyView(APIView):
+    """
+    Stream the account → VPC → subnet hierarchy of the accounts matching the usual account filters
+    (e.g. `tenant_id` or `account_id`) as a nested tree, with each VPC's and subnet's CIDRs.
+
+    With `?flat=true`, the accounts, VPCs and subnets are listed as flat nodes instead, each
+    referencing its parent by ID. Add `?gzip=true` for a gzip-encoded response.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get_view_name(self):
+        return "Topology"
+
+    def get(self, request):
+        accounts = models.AWSAccount.objects.restrict(request.user, "view")
+        filterset = filtersets.AWSAccountFilterSet(request.query_params, queryset=accounts, request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        return topology_response(
+            filterset.qs,
+            request.user,
+            flat=request.query_params.get("flat", "").lower() in ("true", "1"),
+            compress=request.query_params.get("gzip", "").lower() in ("true", "1"),
+        )
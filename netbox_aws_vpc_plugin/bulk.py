@@ -0,0 +1,635 @@
+"""
+Bulk import and editing of AWS accounts, VPCs and subnets.
+
+NetBox's generic import validates and saves one row at a time, resolving every reference with
+its own query. `BulkImporter` works through the rows a batch at a time instead: the natural keys
+referenced by a batch (account IDs, VPC IDs, CIDRs, region slugs, ...) are resolved with one query
+per referenced model, unique fields are checked with one query each, and the valid rows are
+inserted with `bulk_create()`. Since that bypasses the model signals, the importer writes the
+change log, search cache, many-to-many assignments and rollups itself.
+
+`bulk_update()` likewise edits many objects with one UPDATE, writing the change log and search
+cache in bulk, `bulk_delete()` deletes them with one DELETE per model, and `BulkUpserter`
+creates or updates objects by natural key with one `INSERT ... ON CONFLICT ... DO UPDATE` per
+batch.
+"""
+
+import uuid
+from collections import defaultdict
+
+import netaddr
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectChange, ObjectType
+from django import forms
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, router, transaction
+from django.db.models import prefetch_related_objects
+from django.db.models.deletion import Collector
+from django.utils import timezone
+from extras.models import CachedValue, EventRule, TaggedItem
+from netaddr.core import AddrFormatError
+from netbox.context import current_request
+from netbox.search.backends import search_backend
+from utilities.forms.fields import CSVModelChoiceField, CSVModelMultipleChoiceField
+
+from .cache import bump_generation
+from .models import AWSVPC, AWSSubnet
+from .rollups import refresh_rollups
+
+__all__ = (
+    "BulkImporter",
+    "BulkUpserter",
+    "CIDRChoiceField",
+    "CIDRMultipleChoiceField",
+    "NaturalKeyChoiceField",
+    "NaturalKeyMultipleChoiceField",
+    "bulk_delete",
+    "bulk_update",
+    "has_event_rules",
+    "refresh_object_rollups",
+    "resolve_references",
+)
+
+# Rows validated, resolved and inserted together
+BATCH_SIZE = 1000
+
+# Validation stops once this many rows have been rejected
+MAX_ERRORS = 100
+
+# Marks a natural key matching more than one object
+AMBIGUOUS = object()
+
+
+#
+# Fields
+#
+
+
+class NaturalKeyMixin:
+    """
+    Resolves values from `resolved`, a map of natural key to object filled in by
+    `resolve_references()` for a whole batch of rows, instead of querying for each row.
+    Without it, values are looked up as usual.
+    """
+
+    resolved = None
+
+    def to_key(self, value):
+        """
+        Return the normalized natural key for `value`, raising ValidationError if it is malformed.
+        """
+        return str(value).strip()
+
+    def accepts(self, obj):
+        """
+        Return whether `obj`, matched by its natural key, is a valid choice for the field.
+        """
+        return True
+
+    def resolve(self, value):
+        obj = self.resolved.get(self.to_key(value))
+        if obj is AMBIGUOUS:
+            raise forms.ValidationError(f'"{value}" is not a unique value for this field; multiple objects were found')
+        if obj is None:
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value}
+            )
+        return obj
+
+
+class NaturalKeyChoiceField(NaturalKeyMixin, CSVModelChoiceField):
+    def to_python(self, value):
+        if self.resolved is None or value in self.empty_values:
+            return super().to_python(value)
+        return self.resolve(value)
+
+
+class NaturalKeyMultipleChoiceField(NaturalKeyMixin, CSVModelMultipleChoiceField):
+    def _check_values(self, value):
+        if self.resolved is None:
+            return super()._check_values(value)
+        return [self.resolve(item) for item in value]
+
+
+class CIDRKeyMixin:
+    """
+    References ipam.Prefix objects by CIDR, optionally of one address family only.
+    """
+
+    def __init__(self, *args, family=None, **kwargs):
+        kwargs.setdefault("to_field_name", "prefix")
+        super().__init__(*args, **kwargs)
+        self.family = family
+
+    def to_key(self, value):
+        if self.to_field_name != "prefix":
+            return super().to_key(value)
+        try:
+            network = netaddr.IPNetwork(str(value).strip())
+        except (AddrFormatError, ValueError) as e:
+            raise forms.ValidationError(f"Invalid CIDR: {value}") from e
+        if network.ip != network.network:
+            raise forms.ValidationError(f"{value} is not a network address; did you mean {network.cidr}?")
+        return str(network)
+
+    def accepts(self, obj):
+        return self.family is None or obj.family == self.family
+
+
+class CIDRChoiceField(CIDRKeyMixin, NaturalKeyChoiceField):
+    pass
+
+
+class CIDRMultipleChoiceField(CIDRKeyMixin, NaturalKeyMultipleChoiceField):
+    pass
+
+
+#
+# Helpers
+#
+
+
+def has_event_rules(model):
+    """
+    Return whether any enabled event rule applies to `model`. Objects written with
+    `bulk_create()` or `update()` would not trigger them.
+    """
+    return EventRule.objects.filter(enabled=True, object_types=ObjectType.objects.get_for_model(model)).exists()
+
+
+def refresh_object_rollups(model, objects):
+    """
+    Refresh the rollups of the VPCs and accounts which `objects` (of `model`) count towards.
+    """
+    if model is AWSSubnet:
+        refresh_rollups(vpcs={obj.vpc_id for obj in objects})
+    elif model is AWSVPC:
+        refresh_rollups(
+            vpcs={obj.pk for obj in objects},
+            accounts={obj.owner_account_id for obj in objects},
+        )
+
+
+def _m2m_fields(model):
+    return [field.name for field in model._meta.many_to_many if field.name != "tags"]
+
+
+def _objectchanges(request, objects, action, changelog_message=""):
+    user = request.user
+    request_id = getattr(request, "id", None) or uuid.uuid4()
+    changes = []
+    for obj in objects:
+        change = obj.to_objectchange(action)
+        if not getattr(change, "has_changes", True):
+            continue
+        change.user = user
+        change.user_name = user.username
+        change.request_id = request_id
+        if changelog_message:
+            change.message = changelog_message
+        changes.append(change)
+    return ObjectChange.objects.bulk_create(changes)
+
+
+#
+# Editing
+#
+
+
+def bulk_update(request, queryset, values, add_tags=(), remove_tags=(), changelog_message=""):
+    """
+    Set the fields in `values` and add or remove tags on every object in `queryset`, with one
+    UPDATE for the fields and one statement per tag change, and return the updated objects.
+
+    The objects are read once before and once after the update, for the change log entries
+    and the search cache. Fields are not validated by the model: `values` must come from a
+    validated form.
+    """
+    model = queryset.model
+    related = [field.name for field in model._meta.fields if field.is_relation]
+    prefetch = ("tags", *_m2m_fields(model))
+
+    before = {obj.pk: obj for obj in queryset.prefetch_related(*prefetch)}
+    for obj in before.values():
+        obj.snapshot()
+    pks = list(before)
+
+    if values:
+        model.objects.filter(pk__in=pks).update(**values, last_updated=timezone.now())
+    content_type = ContentType.objects.get_for_model(model)
+    if add_tags:
+        existing = set(
+            TaggedItem.objects.filter(content_type=content_type, object_id__in=pks, tag__in=add_tags).values_list(
+                "object_id", "tag_id"
+            )
+        )
+        TaggedItem.objects.bulk_create(
+            TaggedItem(content_type=content_type, object_id=pk, tag=tag)
+            for pk in pks
+            for tag in add_tags
+            if (pk, tag.pk) not in existing
+        )
+    if remove_tags:
+        TaggedItem.objects.filter(content_type=content_type, object_id__in=pks, tag__in=remove_tags).delete()
+
+    after = list(model.objects.filter(pk__in=pks).select_related(*related).prefetch_related(*prefetch))
+    for obj in after:
+        obj._prechange_snapshot = before[obj.pk]._prechange_snapshot
+    _objectchanges(request, after, ObjectChangeActionChoices.ACTION_UPDATE, changelog_message)
+
+    if values:
+        CachedValue.objects.filter(object_type=content_type, object_id__in=pks).delete()
+        search_backend.cache(after, remove_existing=False)
+        refresh_object_rollups(model, [*before.values(), *after])
+    # Tags are part of the cached API responses too
+    transaction.on_commit(lambda: bump_generation(model))
+
+    return after
+
+
+def bulk_delete(request, queryset, changelog_message=""):
+    """
+    Delete every object in `queryset`, along with the objects cascading from them, with one
+    DELETE per model, and return the number of objects in `queryset`.
+
+    Django's collector raises `ProtectedError` or `RestrictedError` before anything is deleted.
+    The change log entries are written in bulk beforehand, so NetBox's own entry per object is
+    skipped; the plugin's signals still fire for each object, so run this within
+    `deferred_rollups()`. Objects which must trigger event rules should be deleted one at a
+    time instead.
+    """
+    objects = list(queryset)
+    collector = Collector(using=router.db_for_write(queryset.model))
+    collector.collect(objects)
+
+    deleted = []
+    for model, instances in collector.data.items():
+        if not hasattr(model, "to_objectchange"):
+            continue
+        instances = list(instances)
+        if hasattr(model, "snapshot"):
+            prefetch_related_objects(instances, *(("tags",) if hasattr(model, "tags") else ()), *_m2m_fields(model))
+            for obj in instances:
+                obj.snapshot()
+        deleted.extend(instances)
+    _objectchanges(request, deleted, ObjectChangeActionChoices.ACTION_DELETE, changelog_message)
+
+    token = current_request.set(None)
+    try:
+        collector.delete()
+    finally:
+        current_request.reset(token)
+    return len(objects)
+
+
+#
+# Importing
+#
+
+
+def _field_values(field, value):
+    if value is None or value == "":
+        return ()
+    if isinstance(field, NaturalKeyMultipleChoiceField):
+        return value.split(",") if isinstance(value, str) else value
+    return (value,)
+
+
+def resolve_references(fields, records, user):
+    """
+    Resolve the natural keys referenced by `records` for each of `fields` (by name), returning a
+    map of field name to `{key: object}`. Objects are fetched with one query per referenced model
+    and key field, restricted to those `user` may view.
+    """
+    keys = defaultdict(set)
+    for name, field in fields.items():
+        for record in records:
+            for value in _field_values(field, record.get(name)):
+                try:
+                    keys[(field.queryset.model, field.to_field_name or "pk")].add(field.to_key(value))
+                except forms.ValidationError:
+                    # Reported when the row is validated
+                    pass
+
+    found = {}
+    for (model, to_field_name), values in keys.items():
+        found[(model, to_field_name)] = list(
+            model.objects.restrict(user, "view").filter(**{f"{to_field_name}__in": values})
+        )
+
+    resolved = {}
+    for name, field in fields.items():
+        to_field_name = field.to_field_name or "pk"
+        matches = defaultdict(list)
+        for obj in found.get((field.queryset.model, to_field_name), ()):
+            if field.accepts(obj):
+                matches[field.to_key(getattr(obj, to_field_name))].append(obj)
+        resolved[name] = {key: objs[0] if len(objs) == 1 else AMBIGUOUS for key, objs in matches.items()}
+    return resolved
+
+
+class BulkImporter:
+    """
+    Validate import records with the model import form `form_class` and create the objects, a
+    batch at a time.
+
+    Each batch is inserted in its own savepoint. `run()` returns the created objects and a list of
+    per-row errors; once any row has been rejected, the remaining rows are only validated.
+    """
+
+    def __init__(self, form_class, request, headers=None, changelog_message="", batch_size=BATCH_SIZE):
+        self.form_class = form_class
+        self.model = form_class._meta.model
+        self.request = request
+        self.headers = headers
+        self.changelog_message = changelog_message
+        self.batch_size = batch_size
+
+        # A form bound to nothing tells which fields the rows have, after any `field:key` headers
+        form = form_class(headers=headers)
+        self.field_names = set(form.fields)
+        self.custom_fields = list(form.custom_fields.values())
+        self.reference_fields = {
+            name: field for name, field in form.fields.items() if isinstance(field, NaturalKeyMixin)
+        }
+        self.m2m_fields = [
+            name
+            for name, field in form.fields.items()
+            if name != "tags" and isinstance(field, forms.ModelMultipleChoiceField)
+        ]
+        self.unique_fields = [field for field in self.model._meta.fields if field.unique and not field.primary_key]
+
+        # The first row of the file to use each unique value
+        self.seen = defaultdict(dict)
+
+    def run(self, records):
+        objects = []
+        errors = []
+        for start in range(0, len(records), self.batch_size):
+            end = start + self.batch_size
+            valid = self.validate(enumerate(records[start:end], start=start + 1), errors)
+            if len(errors) >= MAX_ERRORS:
+                errors.append(f"Stopped after {len(errors)} errors.")
+                break
+            if not errors:
+                with transaction.atomic():
+                    objects.extend(self.save(valid))
+        return objects, errors
+
+    def validate(self, rows, errors):
+        """
+        Validate a batch of `(row number, record)` pairs, appending any errors to `errors` and
+        returning the valid `(row number, form)` pairs.
+        """
+        rows = list(rows)
+        resolved = resolve_references(self.reference_fields, [record for _, record in rows], self.request.user)
+
+        valid = []
+        for row, record in rows:
+            # Apply the defaults of any custom fields omitted, as NetBox's import does
+            for customfield in self.custom_fields:
+                record.setdefault(f"cf_{customfield.name}", customfield.default)
+
+            form = self.form_class(
+                data=record, instance=self.model(), headers=self.headers, custom_fields=self.custom_fields
+            )
+            form.unique_checked = True
+            for name, keys in resolved.items():
+                form.fields[name].resolved = keys
+
+            if form.is_valid():
+                valid.append((row, form))
+                continue
+            for field, field_errors in form.errors.items():
+                for error in field_errors:
+                    errors.append(f"Record {row}: {error}" if field == "__all__" else f"Record {row} {field}: {error}")
+
+        return self.validate_unique(valid, errors)
+
+    def validate_unique(self, rows, errors):
+        """
+        Check the unique fields of a batch of validated forms against the database and the rows
+        before them, with one query per field.
+        """
+        rejected = set()
+        for field in self.unique_fields:
+            values = {getattr(form.instance, field.attname) for _, form in rows}
+            existing = set(
+                self.model.objects.filter(**{f"{field.attname}__in": values}).values_list(field.attname, flat=True)
+            )
+            for row, form in rows:
+                value = getattr(form.instance, field.attname)
+                if value in existing or self.seen[field.name].setdefault(value, row) != row:
+                    error = form.instance.unique_error_message(self.model, (field.name,))
+                    errors.append(f"Record {row} {field.name}: {error.messages[0]}")
+                    rejected.add(row)
+        return [(row, form) for row, form in rows if row not in rejected]
+
+    def save(self, rows):
+        """
+        Create the objects of a batch of validated forms, with everything saving each one would
+        have written.
+        """
+        instances = self.model.objects.bulk_create([form.instance for _, form in rows])
+
+        for name in self.m2m_fields:
+            field = self.model._meta.get_field(name)
+            through = field.remote_field.through
+            source, target = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+            through.objects.bulk_create(
+                through(**{source: form.instance.pk, target: related.pk})
+                for _, form in rows
+                for related in form.cleaned_data.get(name) or ()
+            )
+        content_type = ContentType.objects.get_for_model(self.model)
+        TaggedItem.objects.bulk_create(
+            TaggedItem(content_type=content_type, object_id=form.instance.pk, tag=tag)
+            for _, form in rows
+            for tag in form.cleaned_data.get("tags") or ()
+        )
+
+        # Serialize the objects for the change log from the assignments just written
+        prefetch_related_objects(instances, "tags", *self.m2m_fields)
+        _objectchanges(self.request, instances, ObjectChangeActionChoices.ACTION_CREATE, self.changelog_message)
+
+        search_backend.cache(instances, remove_existing=False)
+        refresh_object_rollups(self.model, instances)
+        transaction.on_commit(lambda: bump_generation(self.model))
+
+        return instances
+
+
+#
+# Upserting
+#
+
+
+class BulkUpserter(BulkImporter):
+    """
+    Create or update objects by the unique `key_field` from records validated with the model
+    import form `form_class`, with one `INSERT ... ON CONFLICT (key_field) DO UPDATE` per batch.
+
+    Existing objects have only the fields present in their own record updated, and any
+    many-to-many fields and tags present in it replaced. Concurrent upserts of the same keys cannot duplicate an
+    object: the later insert updates it instead. Unless `fast`, each object is saved on its own,
+    firing the usual signals (and so any event rules).
+    """
+
+    def __init__(self, form_class, request, key_field, changelog_message="", batch_size=BATCH_SIZE, fast=True):
+        super().__init__(form_class, request, changelog_message=changelog_message, batch_size=batch_size)
+        self.key_field = key_field
+        self.fast = fast
+        self.created = []
+        self.updated = []
+
+    def run(self, records):
+        if unknown := sorted(set().union(*records) - self.field_names):
+            return [], [f"Unknown fields: {', '.join(unknown)}"]
+
+        # Each record updates only the fields it contains (validation adds custom field defaults)
+        self.plans = {row: self.plan(record) for row, record in enumerate(records, start=1)}
+        return super().run(records)
+
+    def plan(self, record):
+        """
+        Return the `(update_fields, m2m_fields, replace_tags)` which upserting `record` writes to an
+        existing object.
+        """
+        update_fields = [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if field.name in record and field.name != self.key_field and not field.primary_key
+        ]
+        if any(name.startswith("cf_") for name in record):
+            update_fields.append("custom_field_data")
+        m2m_fields = tuple(name for name in self.m2m_fields if name in record)
+        return tuple(update_fields), m2m_fields, "tags" in record
+
+    def validate_unique(self, rows, errors):
+        # Existing objects are updated, but each may be upserted only once per request
+        valid = []
+        for row, form in rows:
+            first = self.seen[self.key_field].setdefault(getattr(form.instance, self.key_field), row)
+            if first != row:
+                errors.append(f"Record {row} {self.key_field}: Duplicate of record {first}")
+            else:
+                valid.append((row, form))
+        return valid
+
+    def save(self, rows):
+        if not self.fast:
+            return self.save_each(rows)
+
+        model = self.model
+        related = [field.name for field in model._meta.fields if field.is_relation]
+        prefetch = ("tags", *_m2m_fields(model))
+        forms_by_key = {getattr(form.instance, self.key_field): form for _, form in rows}
+        plans_by_key = {getattr(form.instance, self.key_field): self.plans[row] for row, form in rows}
+
+        before = model.objects.filter(**{f"{self.key_field}__in": list(forms_by_key)}).prefetch_related(*prefetch)
+        before = {getattr(obj, self.key_field): obj for obj in before}
+        for obj in before.values():
+            obj.snapshot()
+
+        # One statement per set of fields updated. Concurrent upserts lock the rows of their
+        # batches in the same order, so cannot deadlock.
+        groups = defaultdict(list)
+        for key, form in forms_by_key.items():
+            groups[plans_by_key[key][0]].append(form.instance)
+        instances = []
+        for update_fields, group in sorted(groups.items()):
+            group.sort(key=lambda obj: getattr(obj, self.key_field))
+            model.objects.bulk_create(
+                group,
+                update_conflicts=True,
+                unique_fields=[self.key_field],
+                update_fields=[*update_fields, "last_updated"],
+            )
+            instances.extend(group)
+        # The timestamps of the rows inserted, as opposed to updated
+        inserted = {obj.pk: obj.created for obj in instances}
+        pks = list(inserted)
+
+        # M2M fields and tags are replaced only on the objects whose records contain them
+        for name in self.m2m_fields:
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source, target = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+            replaced = [obj for obj in instances if name in plans_by_key[getattr(obj, self.key_field)][1]]
+            if not replaced:
+                continue
+            through.objects.filter(**{f"{source}__in": [obj.pk for obj in replaced]}).delete()
+            through.objects.bulk_create(
+                (
+                    through(**{source: obj.pk, target: related.pk})
+                    for obj in replaced
+                    for related in forms_by_key[getattr(obj, self.key_field)].cleaned_data.get(name) or ()
+                ),
+                ignore_conflicts=True,
+            )
+        content_type = ContentType.objects.get_for_model(model)
+        if retagged := [obj for obj in instances if plans_by_key[getattr(obj, self.key_field)][2]]:
+            TaggedItem.objects.filter(content_type=content_type, object_id__in=[obj.pk for obj in retagged]).delete()
+            TaggedItem.objects.bulk_create(
+                (
+                    TaggedItem(content_type=content_type, object_id=obj.pk, tag=tag)
+                    for obj in retagged
+                    for tag in forms_by_key[getattr(obj, self.key_field)].cleaned_data.get("tags") or ()
+                ),
+                ignore_conflicts=True,
+            )
+
+        after = list(model.objects.filter(pk__in=pks).select_related(*related).prefetch_related(*prefetch))
+        created, updated = [], []
+        for obj in after:
+            if obj.created == inserted[obj.pk]:
+                created.append(obj)
+            else:
+                if previous := before.get(getattr(obj, self.key_field)):
+                    obj._prechange_snapshot = previous._prechange_snapshot
+                updated.append(obj)
+        _objectchanges(self.request, created, ObjectChangeActionChoices.ACTION_CREATE, self.changelog_message)
+        _objectchanges(self.request, updated, ObjectChangeActionChoices.ACTION_UPDATE, self.changelog_message)
+        self.created.extend(obj.pk for obj in created)
+        self.updated.extend(obj.pk for obj in updated)
+
+        CachedValue.objects.filter(object_type=content_type, object_id__in=[obj.pk for obj in updated]).delete()
+        search_backend.cache(after, remove_existing=False)
+        refresh_object_rollups(model, [*before.values(), *after])
+        transaction.on_commit(lambda: bump_generation(model))
+
+        return after
+
+    def save_each(self, rows):
+        """
+        Create or update the objects of a batch of validated forms one at a time, with their
+        signals.
+        """
+        objects = []
+        for row, form in rows:
+            update_fields, m2m_fields, replace_tags = self.plans[row]
+            lookup = {self.key_field: getattr(form.instance, self.key_field)}
+            obj = self.model.objects.select_for_update().filter(**lookup).first()
+            if obj is None:
+                try:
+                    with transaction.atomic():
+                        form.instance.save()
+                    obj = form.instance
+                    self.created.append(obj.pk)
+                except IntegrityError:
+                    # Created by a concurrent upsert since
+                    obj = self.model.objects.select_for_update().get(**lookup)
+            if obj is not form.instance:
+                obj.snapshot()
+                for name in update_fields:
+                    attname = self.model._meta.get_field(name).attname
+                    setattr(obj, attname, getattr(form.instance, attname))
+                obj.save()
+                self.updated.append(obj.pk)
+
+            for name in m2m_fields:
+                getattr(obj, name).set(form.cleaned_data.get(name) or ())
+            if replace_tags:
+                obj.tags.set(form.cleaned_data.get("tags") or ())
+            objects.append(obj)
+        return objects
@@ -0,0 +1,108 @@
+"""
+Change generations for the models the plugin derives cached data from.
+
+Every save, delete or M2M change of a tracked model bumps that model's generation once the
+transaction commits (see `signals.py`); prefixes only count while a VPC or subnet uses them.
+Anything cached records the generations it was built from, and is stale as soon as one of them
+differs. Generations live in Django's cache so that they are shared by every worker. Alongside
+its generation, each model records when it last changed.
+"""
+
+import secrets
+import time
+
+from django.core.cache import cache
+
+__all__ = (
+    "bump_generation",
+    "count_response_cache",
+    "get_generations",
+    "get_last_changed",
+    "get_response_cache_stats",
+    "reset_response_cache_stats",
+)
+
+KEY_PREFIX = "netbox_aws_vpc_plugin:generation:"
+STATS_KEY_PREFIX = "netbox_aws_vpc_plugin:response_cache:"
+
+
+def _key(model):
+    return f"{KEY_PREFIX}{model._meta.label_lower}"
+
+
+def _changed_key(model):
+    return f"{_key(model)}:changed"
+
+
+def _initial():
+    # Start from a random value so that a flushed cache can never reissue an old generation
+    return secrets.randbits(48)
+
+
+def get_generations(*models):
+    """
+    Return a tuple of the current generation of each model, fetched in one cache round trip.
+    """
+    keys = [_key(model) for model in models]
+    generations = cache.get_many(keys)
+    if missing := [key for key in keys if key not in generations]:
+        for key in missing:
+            cache.add(key, _initial(), timeout=None)
+        generations.update(cache.get_many(missing))
+    return tuple(generations.get(key) for key in keys)
+
+
+def bump_generation(*models):
+    """
+    Invalidate everything derived from the given models.
+    """
+    for model in models:
+        try:
+            cache.incr(_key(model))
+        except ValueError:
+            cache.add(_key(model), _initial(), timeout=None)
+    now = time.time()
+    cache.set_many({_changed_key(model): now for model in models}, timeout=None)
+
+
+def get_last_changed(*models):
+    """
+    Return the timestamp of the latest change to any of the given models, or None if none has been
+    recorded (e.g. since the cache was flushed).
+    """
+    return max(cache.get_many([_changed_key(model) for model in models]).values(), default=None)
+
+
+#
+# Response cache statistics
+#
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def count_response_cache(hit):
+    """
+    Count a hit (or miss) of the API response cache.
+    """
+    _incr(f"{STATS_KEY_PREFIX}{'hits' if hit else 'misses'}")
+
+
+def get_response_cache_stats():
+    """
+    Return the hits and misses of the API response cache counted since the last reset.
+    """
+    stats = cache.get_many([f"{STATS_KEY_PREFIX}hits", f"{STATS_KEY_PREFIX}misses"])
+    return {
+        "hits": stats.get(f"{STATS_KEY_PREFIX}hits", 0),
+        "misses": stats.get(f"{STATS_KEY_PREFIX}misses", 0),
+    }
+
+
+def reset_response_cache_stats():
+    cache.delete_many([f"{STATS_KEY_PREFIX}hits", f"{STATS_KEY_PREFIX}misses"])
@@ -49,9 +49,11 @@ class AWSSubnetStatusChoices(ChoiceSet):
     STATUS_ACTIVE = "ACTIVE"
     STATUS_INACTIVE = "INACTIVE"
     STATUS_PLANNED_DEPRECATION = "PLANNED_DEPRECATION"
+    STATUS_RESERVED = "RESERVED"
 
     CHOICES = [
         (STATUS_ACTIVE, "Active", "green"),
         (STATUS_INACTIVE, "Inactive", "red"),
         (STATUS_PLANNED_DEPRECATION, "Planned Deprecation", "orange"),
+        (STATUS_RESERVED, "Reserved", "blue"),
     ]
@@ -3,3 +3,9 @@ from django.db.models import Q
 # Q objects for filtering prefixes by IP family
 IPV4_PREFIXES = Q(prefix__family=4)
 IPV6_PREFIXES = Q(prefix__family=6)
+
+# Prefix lengths AWS allows for subnet CIDR blocks, by IP family
+SUBNET_PREFIX_LENGTHS = {
+    4: range(16, 29),
+    6: range(44, 65, 4),
+}
@@ -0,0 +1,198 @@
+"""
+Stream plugin objects as NDJSON or CSV.
+
+Exports read flat rows with `values_list()`, joining foreign keys for their display values and
+aggregating many-to-many CIDRs and tags into arrays, and walk them with a server-side cursor. Rows
+are encoded and flushed a chunk at a time, so memory use does not grow with the number of rows.
+"""
+
+import csv
+import io
+import itertools
+import json
+import zlib
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import OuterRef
+from django.http import StreamingHttpResponse
+from django.utils.text import slugify
+from extras.models import TaggedItem
+from ipam.models import Prefix
+
+from .models import AWSVPC, AWSAccount, AWSSubnet
+
+__all__ = (
+    "EXPORT_FORMATS",
+    "export_columns",
+    "export_response",
+    "export_rows",
+    "gzip_chunks",
+    "prefix_array",
+)
+
+# Rows fetched per round trip from the server-side cursor, and encoded per flushed chunk
+CHUNK_SIZE = 2000
+
+# Output formats by name, with their content types
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def prefix_array(related_name):
+    """
+    Aggregate the CIDRs of the Prefixes related to each object by `related_name` into an array.
+    """
+    return ArraySubquery(Prefix.objects.filter(**{related_name: OuterRef("pk")}).order_by("prefix").values("prefix"))
+
+
+def _tags(model):
+    content_type = ContentType.objects.get_for_model(model)
+    return ArraySubquery(
+        TaggedItem.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .order_by("tag__slug")
+        .values("tag__slug")
+    )
+
+
+def export_columns(model):
+    """
+    Return the `(name, field path or expression)` columns exported for `model`.
+    """
+    if model is AWSAccount:
+        columns = (
+            ("id", "pk"),
+            ("account_id", "account_id"),
+            ("name", "name"),
+            ("arn", "arn"),
+            ("tenant", "tenant__name"),
+            ("description", "description"),
+            ("status", "status"),
+            ("vpc_count", "vpc_count"),
+            ("subnet_count", "subnet_count"),
+            ("allocated_ipv4_addresses", "allocated_ipv4_addresses"),
+            ("ipv4_address_space", "ipv4_address_space"),
+            ("comments", "comments"),
+        )
+    elif model is AWSVPC:
+        columns = (
+            ("id", "pk"),
+            ("vpc_id", "vpc_id"),
+            ("name", "name"),
+            ("arn", "arn"),
+            ("vpc_cidr", "vpc_cidr__prefix"),
+            ("vpc_secondary_ipv4_cidrs", prefix_array("vpc_secondary_ipv4_cidrs")),
+            ("vpc_ipv6_cidrs", prefix_array("vpc_ipv6_cidrs")),
+            ("owner_account", "owner_account__account_id"),
+            ("region", "region__slug"),
+            ("status", "status"),
+            ("subnet_count", "subnet_count"),
+            ("allocated_ipv4_addresses", "allocated_ipv4_addresses"),
+            ("ipv4_address_space", "ipv4_address_space"),
+            ("comments", "comments"),
+        )
+    elif model is AWSSubnet:
+        columns = (
+            ("id", "pk"),
+            ("subnet_id", "subnet_id"),
+            ("name", "name"),
+            ("arn", "arn"),
+            ("subnet_cidr", "subnet_cidr__prefix"),
+            ("subnet_ipv6_cidr", "subnet_ipv6_cidr__prefix"),
+            ("vpc", "vpc__vpc_id"),
+            ("owner_account", "owner_account__account_id"),
+            ("region", "region__slug"),
+            ("status", "status"),
+            ("comments", "comments"),
+        )
+    else:
+        raise ValueError(f"Unsupported model for export: {model}")
+    return (
+        *columns,
+        ("tags", _tags(model)),
+        ("custom_fields", "custom_field_data"),
+        ("created", "created"),
+        ("last_updated", "last_updated"),
+    )
+
+
+def export_rows(queryset, columns):
+    """
+    Yield a tuple of column values for every object in `queryset`, read through a server-side cursor.
+    """
+    rows = queryset.prefetch_related(None).values_list(*(column for _, column in columns))
+    return rows.iterator(chunk_size=CHUNK_SIZE)
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ",".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    # IP networks and any other scalar
+    return str(value)
+
+
+def _ndjson(names, rows):
+    for chunk in itertools.batched(rows, CHUNK_SIZE):
+        yield "".join(json.dumps(dict(zip(names, row)), default=_json_default) + "\n" for row in chunk)
+
+
+def _csv(names, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for chunk in itertools.batched(rows, CHUNK_SIZE):
+        writer.writerows([_text(value) for value in row] for row in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # The header alone, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks):
+    """
+    Gzip-encode a stream of text chunks.
+    """
+    # wbits=31 writes a gzip container rather than a raw zlib stream
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        if data := compressor.compress(chunk.encode()):
+            yield data
+    yield compressor.flush()
+
+
+def export_response(queryset, export_format="ndjson", compress=False):
+    """
+    Return a StreamingHttpResponse writing every object in `queryset` as `export_format`,
+    gzip-encoded if `compress` is set.
+    """
+    model = queryset.model
+    columns = export_columns(model)
+    names = [name for name, _ in columns]
+    writer = _csv if export_format == "csv" else _ndjson
+    chunks = writer(names, export_rows(queryset, columns))
+
+    filename = f"{slugify(model._meta.verbose_name_plural)}.{export_format}"
+    response = StreamingHttpResponse(
+        gzip_chunks(chunks) if compress else (chunk.encode() for chunk in chunks),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    if compress:
+        response["Content-Encoding"] = "gzip"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -1,9 +1,61 @@
+import django_filters
 from netbox.filtersets import NetBoxModelFilterSet
+from tenancy.models import Tenant
+from utilities.filters import MultiValueCharFilter
 
+from .choices import AWSAccountStatusChoices, AWSSubnetStatusChoices, AWSVPCStatusChoices
 from .models import AWSVPC, AWSAccount, AWSSubnet
+from .utils import SUBNET_CIDR_FIELDS, VPC_CIDR_FIELDS, cidr_filter, containment_lookup
 
 
-class AWSVPCFilterSet(NetBoxModelFilterSet):
+class CIDRContainmentFilterSet(django_filters.FilterSet):
+    """
+    IP containment filters across every CIDR of the model listed in `cidr_fields`.
+    """
+
+    contains = django_filters.CharFilter(method="search_cidrs", label="Contains IP address or prefix")
+    within = django_filters.CharFilter(method="search_cidrs", label="Within prefix")
+    within_include = django_filters.CharFilter(method="search_cidrs", label="Within and including prefix")
+
+    cidr_fields = ()
+
+    def search_cidrs(self, queryset, name, value):
+        if not value.strip():
+            return queryset
+        try:
+            lookup, query = containment_lookup(name, value)
+        except ValueError:
+            return queryset.none()
+        return queryset.filter(cidr_filter(queryset.model, self.cidr_fields, lookup, query))
+
+
+class OwnerAccountFilterSet(django_filters.FilterSet):
+    """
+    Filters on the owner account of a VPC or subnet by its AWS account ID and by its tenant.
+    """
+
+    account_id = MultiValueCharFilter(
+        field_name="owner_account__account_id",
+        label="Owner account (AWS account ID)",
+    )
+    tenant_id = django_filters.ModelMultipleChoiceFilter(
+        field_name="owner_account__tenant",
+        queryset=Tenant.objects.all(),
+        label="Owner account tenant (ID)",
+    )
+    tenant = django_filters.ModelMultipleChoiceFilter(
+        field_name="owner_account__tenant__slug",
+        queryset=Tenant.objects.all(),
+        to_field_name="slug",
+        label="Owner account tenant (slug)",
+    )
+
+
+class AWSVPCFilterSet(NetBoxModelFilterSet, CIDRContainmentFilterSet, OwnerAccountFilterSet):
+    cidr_fields = VPC_CIDR_FIELDS
+
+    status = django_filters.MultipleChoiceFilter(choices=AWSVPCStatusChoices, null_value=None)
+
     class Meta:
         model = AWSVPC
         fields = [
@@ -16,10 +68,24 @@ class AWSVPCFilterSet(NetBoxModelFilterSet):
             "owner_account",
             "region",
             "status",
+            "subnet_count",
+            "allocated_ipv4_addresses",
+            "ipv4_address_space",
         ]
 
 
-class AWSSubnetFilterSet(NetBoxModelFilterSet):
+class AWSSubnetFilterSet(NetBoxModelFilterSet, CIDRContainmentFilterSet, OwnerAccountFilterSet):
+    cidr_fields = SUBNET_CIDR_FIELDS
+
+    # The subnets counted towards an account's rollups
+    vpc_owner_account = django_filters.ModelMultipleChoiceFilter(
+        field_name="vpc__owner_account",
+        queryset=AWSAccount.objects.all(),
+        label="VPC owner account (ID)",
+    )
+
+    status = django_filters.MultipleChoiceFilter(choices=AWSSubnetStatusChoices, null_value=None)
+
     class Meta:
         model = AWSSubnet
         fields = [
@@ -36,6 +102,23 @@ class AWSSubnetFilterSet(NetBoxModelFilterSet):
 
 
 class AWSAccountFilterSet(NetBoxModelFilterSet):
+    tenant_id = django_filters.ModelMultipleChoiceFilter(
+        field_name="tenant",
+        queryset=Tenant.objects.all(),
+        label="Tenant (ID)",
+    )
+    status = django_filters.MultipleChoiceFilter(choices=AWSAccountStatusChoices, null_value=None)
+
     class Meta:
         model = AWSAccount
-        fields = ["account_id", "name", "arn", "tenant", "status"]
+        fields = [
+            "account_id",
+            "name",
+            "arn",
+            "tenant",
+            "status",
+            "vpc_count",
+            "subnet_count",
+            "allocated_ipv4_addresses",
+            "ipv4_address_space",
+        ]
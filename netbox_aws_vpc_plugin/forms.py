@@ -1,18 +1,65 @@
 from dcim.models import Region
 from django import forms
+from extras.models import Tag
 from ipam.models import Prefix
-from netbox.forms import NetBoxModelFilterSetForm, NetBoxModelForm
+from netbox.forms import (
+    NetBoxModelBulkEditForm,
+    NetBoxModelFilterSetForm,
+    NetBoxModelForm,
+    NetBoxModelImportForm,
+)
 from tenancy.models import Tenant
+from utilities.forms import add_blank_choice
 from utilities.forms.fields import (
     CommentField,
+    CSVChoiceField,
     DynamicModelChoiceField,
     DynamicModelMultipleChoiceField,
 )
 
+from .bulk import CIDRChoiceField, CIDRMultipleChoiceField, NaturalKeyChoiceField, NaturalKeyMultipleChoiceField
+from .choices import AWSAccountStatusChoices, AWSSubnetStatusChoices, AWSVPCStatusChoices
 from .constants import IPV4_PREFIXES, IPV6_PREFIXES
 from .models import AWSVPC, AWSAccount, AWSSubnet
 
 
+class NaturalKeyImportForm(NetBoxModelImportForm):
+    """
+    Import form referencing related objects by natural key, which `bulk.BulkImporter` can
+    validate a batch of rows at a time.
+    """
+
+    tags = NaturalKeyMultipleChoiceField(
+        queryset=Tag.objects.all(),
+        required=False,
+        to_field_name="slug",
+        help_text='Tag slugs separated by commas, encased with double quotes (e.g. "tag1,tag2,tag3")',
+    )
+
+    # Set by the bulk importer, which checks unique fields for a whole batch of rows
+    unique_checked = False
+
+    def __init__(self, *args, custom_fields=None, **kwargs):
+        # The bulk importer looks the custom fields up once rather than for every row
+        self._custom_fields = custom_fields
+        super().__init__(*args, **kwargs)
+
+    def _get_custom_fields(self, content_type):
+        if self._custom_fields is not None:
+            return self._custom_fields
+        return super()._get_custom_fields(content_type)
+
+    def _get_validation_exclusions(self):
+        # References resolved by the bulk importer were read from the database already
+        exclude = super()._get_validation_exclusions()
+        exclude.update(name for name, field in self.fields.items() if getattr(field, "resolved", None) is not None)
+        return exclude
+
+    def validate_unique(self):
+        if not self.unique_checked:
+            super().validate_unique()
+
+
 # AWS VPC Forms
 class AWSVPCForm(NetBoxModelForm):
     vpc_cidr = DynamicModelChoiceField(
@@ -62,11 +109,129 @@ class AWSVPCForm(NetBoxModelForm):
         )
 
 
+class AWSVPCImportForm(NaturalKeyImportForm):
+    vpc_cidr = CIDRChoiceField(
+        queryset=Prefix.objects.filter(IPV4_PREFIXES),
+        family=4,
+        required=False,
+        label="Primary IPv4 CIDR",
+    )
+    vpc_secondary_ipv4_cidrs = CIDRMultipleChoiceField(
+        queryset=Prefix.objects.filter(IPV4_PREFIXES),
+        family=4,
+        required=False,
+        label="Secondary IPv4 CIDRs",
+        help_text="CIDRs separated by commas",
+    )
+    vpc_ipv6_cidrs = CIDRMultipleChoiceField(
+        queryset=Prefix.objects.filter(IPV6_PREFIXES),
+        family=6,
+        required=False,
+        label="IPv6 CIDRs",
+        help_text="CIDRs separated by commas",
+    )
+    owner_account = NaturalKeyChoiceField(
+        queryset=AWSAccount.objects.all(),
+        required=False,
+        to_field_name="account_id",
+        label="Owner Account",
+        help_text="Account ID",
+    )
+    region = NaturalKeyChoiceField(
+        queryset=Region.objects.all(),
+        required=False,
+        to_field_name="slug",
+        help_text="Region slug",
+    )
+    status = CSVChoiceField(choices=AWSVPCStatusChoices, required=False)
+
+    class Meta:
+        model = AWSVPC
+        fields = (
+            "vpc_id",
+            "name",
+            "arn",
+            "vpc_cidr",
+            "vpc_secondary_ipv4_cidrs",
+            "vpc_ipv6_cidrs",
+            "owner_account",
+            "region",
+            "status",
+            "comments",
+            "tags",
+        )
+
+
+class AWSVPCBulkEditForm(NetBoxModelBulkEditForm):
+    status = forms.ChoiceField(choices=add_blank_choice(AWSVPCStatusChoices), required=False)
+    owner_account = DynamicModelChoiceField(
+        queryset=AWSAccount.objects.all(),
+        required=False,
+        label="Owner Account",
+    )
+    region = DynamicModelChoiceField(
+        queryset=Region.objects.all(),
+        required=False,
+        label="Region",
+    )
+
+    model = AWSVPC
+    nullable_fields = ("owner_account", "region")
+
+
 class AWSVPCFilterForm(NetBoxModelFilterSetForm):
     model = AWSVPC
 
-    owner_account = forms.ModelMultipleChoiceField(queryset=AWSAccount.objects.all(), required=False)
-    region = forms.ModelMultipleChoiceField(
+    contains = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "IP address or prefix"}),
+        label="Contains",
+    )
+    within_include = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "Prefix"}),
+        label="Search within",
+    )
+
+    # The related object selectors fetch their choices from the REST API as the user types,
+    # rather than rendering an option for every account and region with the page.
+    account_id = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "123456789012"}),
+        label="AWS Account ID",
+    )
+    owner_account = DynamicModelMultipleChoiceField(
+        queryset=AWSAccount.objects.all(),
+        required=False,
+        label="Owner Account",
+    )
+    tenant_id = DynamicModelMultipleChoiceField(
+        queryset=Tenant.objects.all(),
+        required=False,
+        label="Tenant",
+    )
+    region = DynamicModelMultipleChoiceField(
+        queryset=Region.objects.all(),
+        required=False,
+    )
+    status = forms.MultipleChoiceField(
+        choices=AWSVPCStatusChoices,
+        required=False,
+    )
+
+
+class AWSVPCOverlapFilterForm(forms.Form):
+    owner_account = DynamicModelMultipleChoiceField(
+        queryset=AWSAccount.objects.all(),
+        required=False,
+        label="Owner Account",
+    )
+    tenant_id = DynamicModelMultipleChoiceField(
+        queryset=Tenant.objects.all(),
+        required=False,
+        label="Tenant",
+    )
+    region = DynamicModelMultipleChoiceField(
         queryset=Region.objects.all(),
         required=False,
     )
@@ -120,15 +285,119 @@ class AWSSubnetForm(NetBoxModelForm):
         )
 
 
+class AWSSubnetImportForm(NaturalKeyImportForm):
+    vpc = NaturalKeyChoiceField(
+        queryset=AWSVPC.objects.all(),
+        required=False,
+        to_field_name="vpc_id",
+        label="VPC",
+        help_text="VPC ID",
+    )
+    subnet_cidr = CIDRChoiceField(
+        queryset=Prefix.objects.filter(IPV4_PREFIXES),
+        family=4,
+        required=False,
+        label="IPv4 Subnet CIDR",
+    )
+    subnet_ipv6_cidr = CIDRChoiceField(
+        queryset=Prefix.objects.filter(IPV6_PREFIXES),
+        family=6,
+        required=False,
+        label="IPv6 Subnet CIDR",
+    )
+    owner_account = NaturalKeyChoiceField(
+        queryset=AWSAccount.objects.all(),
+        required=False,
+        to_field_name="account_id",
+        label="Owner Account",
+        help_text="Account ID",
+    )
+    region = NaturalKeyChoiceField(
+        queryset=Region.objects.all(),
+        required=False,
+        to_field_name="slug",
+        help_text="Region slug",
+    )
+    status = CSVChoiceField(choices=AWSSubnetStatusChoices, required=False)
+
+    class Meta:
+        model = AWSSubnet
+        fields = (
+            "subnet_id",
+            "vpc",
+            "name",
+            "arn",
+            "subnet_cidr",
+            "subnet_ipv6_cidr",
+            "owner_account",
+            "region",
+            "status",
+            "comments",
+            "tags",
+        )
+
+
+class AWSSubnetBulkEditForm(NetBoxModelBulkEditForm):
+    status = forms.ChoiceField(choices=add_blank_choice(AWSSubnetStatusChoices), required=False)
+    owner_account = DynamicModelChoiceField(
+        queryset=AWSAccount.objects.all(),
+        required=False,
+        label="Owner Account",
+    )
+    region = DynamicModelChoiceField(
+        queryset=Region.objects.all(),
+        required=False,
+        label="Region",
+    )
+
+    model = AWSSubnet
+    nullable_fields = ("owner_account", "region")
+
+
 class AWSSubnetFilterForm(NetBoxModelFilterSetForm):
     model = AWSSubnet
 
-    vpc = forms.ModelMultipleChoiceField(queryset=AWSVPC.objects.all(), required=False)
-    owner_account = forms.ModelMultipleChoiceField(queryset=AWSAccount.objects.all(), required=False)
-    region = forms.ModelMultipleChoiceField(
+    contains = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "IP address or prefix"}),
+        label="Contains",
+    )
+    within_include = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "Prefix"}),
+        label="Search within",
+    )
+
+    # As on the VPC filter form, choices are fetched from the REST API as the user types
+    account_id = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "123456789012"}),
+        label="AWS Account ID",
+    )
+    owner_account = DynamicModelMultipleChoiceField(
+        queryset=AWSAccount.objects.all(),
+        required=False,
+        label="Owner Account",
+    )
+    vpc = DynamicModelMultipleChoiceField(
+        queryset=AWSVPC.objects.all(),
+        query_params={"owner_account": "$owner_account"},
+        required=False,
+        label="VPC",
+    )
+    tenant_id = DynamicModelMultipleChoiceField(
+        queryset=Tenant.objects.all(),
+        required=False,
+        label="Tenant",
+    )
+    region = DynamicModelMultipleChoiceField(
         queryset=Region.objects.all(),
         required=False,
     )
+    status = forms.MultipleChoiceField(
+        choices=AWSSubnetStatusChoices,
+        required=False,
+    )
 
 
 # AWS Account Forms
@@ -152,3 +421,58 @@ class AWSAccountForm(NetBoxModelForm):
             "comments",
             "tags",
         )
+
+
+class AWSAccountFilterForm(NetBoxModelFilterSetForm):
+    model = AWSAccount
+
+    account_id = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "123456789012"}),
+        label="AWS Account ID",
+    )
+    tenant_id = DynamicModelMultipleChoiceField(
+        queryset=Tenant.objects.all(),
+        required=False,
+        label="Tenant",
+    )
+    status = forms.MultipleChoiceField(
+        choices=AWSAccountStatusChoices,
+        required=False,
+    )
+
+
+class AWSAccountImportForm(NaturalKeyImportForm):
+    tenant = NaturalKeyChoiceField(
+        queryset=Tenant.objects.all(),
+        required=False,
+        to_field_name="name",
+        help_text="Assigned tenant",
+    )
+    status = CSVChoiceField(choices=AWSAccountStatusChoices, required=False)
+
+    class Meta:
+        model = AWSAccount
+        fields = (
+            "account_id",
+            "name",
+            "arn",
+            "tenant",
+            "description",
+            "status",
+            "comments",
+            "tags",
+        )
+
+
+class AWSAccountBulkEditForm(NetBoxModelBulkEditForm):
+    status = forms.ChoiceField(choices=add_blank_choice(AWSAccountStatusChoices), required=False)
+    tenant = DynamicModelChoiceField(
+        queryset=Tenant.objects.all(),
+        required=False,
+        label="Tenant",
+    )
+    description = forms.CharField(max_length=500, required=False)
+
+    model = AWSAccount
+    nullable_fields = ("tenant", "description")
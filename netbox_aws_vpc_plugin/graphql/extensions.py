@@ -0,0 +1,43 @@
+from graphql import GraphQLError
+from netbox.plugins import get_plugin_config
+from strawberry.extensions import FieldExtension
+from strawberry.types.nodes import SelectedField
+
+__all__ = (
+    "QueryCostLimitExtension",
+    "measure_selections",
+)
+
+
+def measure_selections(selections):
+    """
+    Return the `(depth, fields)` of a selection set: how many levels of nested selections it
+    has, and how many fields it selects in total (fragments are expanded in place).
+    """
+    depth = fields = 0
+    for selection in selections:
+        child_depth, child_fields = measure_selections(selection.selections)
+        if isinstance(selection, SelectedField):
+            fields += 1
+            child_depth += 1 if selection.selections else 0
+        depth = max(depth, child_depth)
+        fields += child_fields
+    return depth, fields
+
+
+class QueryCostLimitExtension(FieldExtension):
+    """
+    Reject a query before it is resolved if the selection below the field is nested deeper than
+    the plugin's `graphql_max_depth` setting, or selects more fields in total than its
+    `graphql_max_complexity` setting.
+    """
+
+    def resolve(self, next_, source, info, **kwargs):
+        depth, fields = measure_selections(info.selected_fields)
+        max_depth = get_plugin_config("netbox_aws_vpc_plugin", "graphql_max_depth")
+        if max_depth and depth > max_depth:
+            raise GraphQLError(f"Query depth {depth} exceeds the maximum of {max_depth}.")
+        max_complexity = get_plugin_config("netbox_aws_vpc_plugin", "graphql_max_complexity")
+        if max_complexity and fields > max_complexity:
+            raise GraphQLError(f"Query complexity {fields} exceeds the maximum of {max_complexity}.")
+        return next_(source, info, **kwargs)
@@ -1,7 +1,9 @@
 import strawberry_django
+from django.db.models import Q
 from netbox.graphql.filters import NetBoxModelFilter
 
 from .. import models
+from ..utils import SUBNET_CIDR_FIELDS, VPC_CIDR_FIELDS, cidr_filter, containment_lookup
 
 __all__ = (
     "AWSAccountFilter",
@@ -10,6 +12,16 @@ __all__ = (
 )
 
 
+def cidr_containment(model, fields, relation, value, prefix):
+    if not value or not value.strip():
+        return Q()
+    try:
+        lookup, query = containment_lookup(relation, value)
+    except ValueError:
+        return Q(pk__in=[])
+    return cidr_filter(model, fields, lookup, query, prefix=prefix)
+
+
 @strawberry_django.filter(models.AWSAccount, lookups=True)
 class AWSAccountFilter(NetBoxModelFilter):
     pass
@@ -17,9 +29,29 @@ class AWSAccountFilter(NetBoxModelFilter):
 
 @strawberry_django.filter(models.AWSVPC, lookups=True)
 class AWSVPCFilter(NetBoxModelFilter):
-    pass
+    @strawberry_django.filter_field()
+    def contains(self, value: str, prefix: str) -> Q:
+        return cidr_containment(models.AWSVPC, VPC_CIDR_FIELDS, "contains", value, prefix)
+
+    @strawberry_django.filter_field()
+    def within(self, value: str, prefix: str) -> Q:
+        return cidr_containment(models.AWSVPC, VPC_CIDR_FIELDS, "within", value, prefix)
+
+    @strawberry_django.filter_field()
+    def within_include(self, value: str, prefix: str) -> Q:
+        return cidr_containment(models.AWSVPC, VPC_CIDR_FIELDS, "within_include", value, prefix)
 
 
 @strawberry_django.filter(models.AWSSubnet, lookups=True)
 class AWSSubnetFilter(NetBoxModelFilter):
-    pass
+    @strawberry_django.filter_field()
+    def contains(self, value: str, prefix: str) -> Q:
+        return cidr_containment(models.AWSSubnet, SUBNET_CIDR_FIELDS, "contains", value, prefix)
+
+    @strawberry_django.filter_field()
+    def within(self, value: str, prefix: str) -> Q:
+        return cidr_containment(models.AWSSubnet, SUBNET_CIDR_FIELDS, "within", value, prefix)
+
+    @strawberry_django.filter_field()
+    def within_include(self, value: str, prefix: str) -> Q:
+        return cidr_containment(models.AWSSubnet, SUBNET_CIDR_FIELDS, "within_include", value, prefix)
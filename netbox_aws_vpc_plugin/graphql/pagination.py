@@ -0,0 +1,37 @@
+import strawberry
+from graphql import GraphQLError
+from strawberry_django.arguments import argument
+from strawberry_django.fields.field import StrawberryDjangoField
+
+__all__ = ("CursorPaginatedField",)
+
+
+class CursorPaginatedField(StrawberryDjangoField):
+    """
+    A list field which adds an `after` cursor argument alongside the `pagination` offset/limit.
+
+    `after` returns only objects with a primary key greater than the given ID, in primary-key
+    order, so clients page through large lists by passing the last ID they received together with
+    a `pagination: {limit: N}`. Unlike offsets, this stays cheap however deep the page is. It
+    cannot be combined with another ordering, which would skip or repeat objects between pages.
+    """
+
+    @property
+    def arguments(self):
+        arguments = super().arguments
+        if self.is_list:
+            arguments = [*arguments, argument("after", strawberry.ID, is_optional=True)]
+        return arguments
+
+    @arguments.setter
+    def arguments(self, value):
+        args_prop = super(CursorPaginatedField, self.__class__).arguments
+        return args_prop.fset(self, value)
+
+    def get_queryset(self, queryset, info, *, after=None, **kwargs):
+        # Applied before the inherited filtering, ordering and slicing
+        if after is not None:
+            if kwargs.get("order") or kwargs.get("ordering"):
+                raise GraphQLError("`after` cannot be combined with `order`: cursor pages are always in ID order.")
+            queryset = queryset.filter(pk__gt=after).order_by("pk")
+        return super().get_queryset(queryset, info, **kwargs)
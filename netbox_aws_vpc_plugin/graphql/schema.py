@@ -3,16 +3,24 @@ from typing import List
 import strawberry
 import strawberry_django
 
+from .extensions import QueryCostLimitExtension
+from .pagination import CursorPaginatedField
 from .types import AWSAccountType, AWSSubnetType, AWSVPCType
 
 
+def list_field():
+    return strawberry_django.field(
+        pagination=True, field_cls=CursorPaginatedField, extensions=[QueryCostLimitExtension()]
+    )
+
+
 @strawberry.type(name="Query")
 class NetBoxAWSVPCQuery:
-    aws_account: AWSAccountType = strawberry_django.field()
-    aws_account_list: List[AWSAccountType] = strawberry_django.field()
+    aws_account: AWSAccountType = strawberry_django.field(extensions=[QueryCostLimitExtension()])
+    aws_account_list: List[AWSAccountType] = list_field()
 
-    aws_vpc: AWSVPCType = strawberry_django.field()
-    aws_vpc_list: List[AWSVPCType] = strawberry_django.field()
+    aws_vpc: AWSVPCType = strawberry_django.field(extensions=[QueryCostLimitExtension()])
+    aws_vpc_list: List[AWSVPCType] = list_field()
 
-    aws_subnet: AWSSubnetType = strawberry_django.field()
-    aws_subnet_list: List[AWSSubnetType] = strawberry_django.field()
+    aws_subnet: AWSSubnetType = strawberry_django.field(extensions=[QueryCostLimitExtension()])
+    aws_subnet_list: List[AWSSubnetType] = list_field()
@@ -1,20 +1,61 @@
+from typing import TYPE_CHECKING, Annotated, List
+
+import strawberry
 import strawberry_django
 from netbox.graphql.types import NetBoxObjectType
 
 from ..models import AWSVPC, AWSAccount, AWSSubnet
 from .filters import AWSAccountFilter, AWSSubnetFilter, AWSVPCFilter
+from .pagination import CursorPaginatedField
+
+if TYPE_CHECKING:
+    from dcim.graphql.types import RegionType
+    from ipam.graphql.types import PrefixType
+    from tenancy.graphql.types import TenantType
+
+__all__ = (
+    "AWSAccountType",
+    "AWSSubnetType",
+    "AWSVPCType",
+)
+
+# Relations are declared with their NetBox types (rather than left to `fields="__all__"`), so that
+# they can be queried in depth and the optimizer joins or prefetches them instead of issuing a
+# query per row. Reverse relations are paginated like the root list fields; the optimizer
+# prefetches a page for every parent in a single windowed query.
+
+
+def reverse_field(field_name):
+    return strawberry_django.field(field_name=field_name, pagination=True, field_cls=CursorPaginatedField)
 
 
 @strawberry_django.type(AWSAccount, fields="__all__", filters=AWSAccountFilter)
 class AWSAccountType(NetBoxObjectType):
-    pass
+    tenant: Annotated["TenantType", strawberry.lazy("tenancy.graphql.types")] | None
+    vpcs: List[Annotated["AWSVPCType", strawberry.lazy("netbox_aws_vpc_plugin.graphql.types")]] = reverse_field(
+        "awsvpc_set"
+    )
+    subnets: List[Annotated["AWSSubnetType", strawberry.lazy("netbox_aws_vpc_plugin.graphql.types")]] = reverse_field(
+        "awssubnet_set"
+    )
 
 
 @strawberry_django.type(AWSVPC, fields="__all__", filters=AWSVPCFilter)
 class AWSVPCType(NetBoxObjectType):
-    pass
+    vpc_cidr: Annotated["PrefixType", strawberry.lazy("ipam.graphql.types")] | None
+    vpc_secondary_ipv4_cidrs: List[Annotated["PrefixType", strawberry.lazy("ipam.graphql.types")]]
+    vpc_ipv6_cidrs: List[Annotated["PrefixType", strawberry.lazy("ipam.graphql.types")]]
+    owner_account: AWSAccountType | None
+    region: Annotated["RegionType", strawberry.lazy("dcim.graphql.types")] | None
+    subnets: List[Annotated["AWSSubnetType", strawberry.lazy("netbox_aws_vpc_plugin.graphql.types")]] = reverse_field(
+        "awssubnet_set"
+    )
 
 
 @strawberry_django.type(AWSSubnet, fields="__all__", filters=AWSSubnetFilter)
 class AWSSubnetType(NetBoxObjectType):
-    pass
+    subnet_cidr: Annotated["PrefixType", strawberry.lazy("ipam.graphql.types")] | None
+    subnet_ipv6_cidr: Annotated["PrefixType", strawberry.lazy("ipam.graphql.types")] | None
+    vpc: AWSVPCType | None
+    owner_account: AWSAccountType | None
+    region: Annotated["RegionType", strawberry.lazy("dcim.graphql.types")] | None
@@ -0,0 +1,103 @@
+"""
+Resolve IP addresses to the AWS subnets, VPCs and accounts containing them.
+
+Lookups run against an in-memory `PrefixMatcher` of every subnet and VPC CIDR, built once per
+worker and rebuilt whenever the generation of a model it is derived from changes.
+"""
+
+import threading
+from collections import namedtuple
+
+from ipam.models import Prefix
+
+from .cache import get_generations
+from .models import AWSVPC, AWSAccount, AWSSubnet
+from .prefix_matcher import PrefixMatcher, parse_ip
+from .utils import SUBNET_CIDR_FIELDS, VPC_CIDR_FIELDS
+
+__all__ = (
+    "IPMatch",
+    "build_matcher",
+    "get_matcher",
+    "lookup_addresses",
+)
+
+SOURCE_MODELS = (AWSAccount, AWSVPC, AWSSubnet, Prefix)
+
+CHUNK_SIZE = 10000
+
+# A CIDR of a subnet (`subnet` and `subnet_id` are None for a VPC CIDR), with its VPC and account
+IPMatch = namedtuple("IPMatch", ("cidr", "subnet", "subnet_id", "vpc", "vpc_id", "account", "account_id"))
+
+_lock = threading.Lock()
+_cached = (None, None)
+
+
+def build_matcher():
+    """
+    Return a new `PrefixMatcher` of `IPMatch`es for every VPC and subnet CIDR.
+    """
+    matcher = PrefixMatcher()
+
+    for field in VPC_CIDR_FIELDS:
+        vpcs = AWSVPC.objects.filter(**{f"{field}__isnull": False}).values_list(
+            f"{field}__prefix", "pk", "vpc_id", "owner_account_id", "owner_account__account_id"
+        )
+        for cidr, pk, vpc_id, account, account_id in vpcs.iterator(chunk_size=CHUNK_SIZE):
+            matcher.add(cidr, IPMatch(str(cidr), None, None, pk, vpc_id, account, account_id))
+
+    for field in SUBNET_CIDR_FIELDS:
+        subnets = AWSSubnet.objects.filter(**{f"{field}__isnull": False}).values_list(
+            f"{field}__prefix",
+            "pk",
+            "subnet_id",
+            "vpc_id",
+            "vpc__vpc_id",
+            "owner_account_id",
+            "owner_account__account_id",
+            "vpc__owner_account_id",
+            "vpc__owner_account__account_id",
+        )
+        for cidr, pk, subnet_id, vpc, vpc_id, account, account_id, vpc_account, vpc_account_id in subnets.iterator(
+            chunk_size=CHUNK_SIZE
+        ):
+            # A subnet without an owner account of its own belongs to its VPC's
+            if account is None:
+                account, account_id = vpc_account, vpc_account_id
+            matcher.add(cidr, IPMatch(str(cidr), pk, subnet_id, vpc, vpc_id, account, account_id))
+
+    return matcher
+
+
+def get_matcher():
+    """
+    Return this worker's `PrefixMatcher`, rebuilding it first if the data behind it has changed.
+    """
+    global _cached
+
+    # Read the generations before building, so that a change committed mid-build triggers another
+    generations = get_generations(*SOURCE_MODELS)
+    if _cached[0] != generations:
+        with _lock:
+            if _cached[0] != generations:
+                _cached = (generations, build_matcher())
+    return _cached[1]
+
+
+def lookup_addresses(addresses):
+    """
+    Yield `(address, matches, error)` for each address string, where `matches` lists the
+    `IPMatch`es of the longest CIDR(s) containing it. Several matches are only returned for
+    overlapping CIDRs; a VPC CIDR is not repeated alongside a subnet of the same VPC and size.
+    """
+    matcher = get_matcher()
+    for address in addresses:
+        try:
+            _, matches = matcher.lookup(parse_ip(address))
+        except ValueError as e:
+            yield address, [], str(e)
+            continue
+        if len(matches) > 1:
+            subnet_vpcs = {match.vpc for match in matches if match.subnet is not None}
+            matches = [match for match in matches if match.subnet is not None or match.vpc not in subnet_vpcs]
+        yield address, matches, None
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from netbox_aws_vpc_plugin.cache import get_response_cache_stats, reset_response_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Report the hits and misses of the AWS VPC plugin's REST API response cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after reporting them",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_response_cache_stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = f" ({stats['hits'] / total:.1%} hit ratio)" if total else ""
+        self.stdout.write(f"{stats['hits']} hits, {stats['misses']} misses{ratio}")
+        if options["reset"]:
+            reset_response_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Reset the response cache counters."))
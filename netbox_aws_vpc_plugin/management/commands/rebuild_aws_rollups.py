@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from netbox_aws_vpc_plugin.rollups import refresh_rollups, stale_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the persisted subnet/VPC counts and IPv4 address totals of AWS VPCs and accounts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Report rollups which do not match their underlying objects instead of rebuilding them",
+        )
+
+    def handle(self, *args, **options):
+        if options["verify"]:
+            stale = list(stale_rollups())
+            for obj, field, stored, expected in stale:
+                self.stdout.write(f"{obj._meta.verbose_name} {obj}: {field} is {stored}, expected {expected}")
+            if stale:
+                raise CommandError(f"Found {len(stale)} inconsistent rollup(s); run without --verify to rebuild them.")
+            self.stdout.write(self.style.SUCCESS("All rollups are consistent."))
+            return
+
+        with transaction.atomic():
+            refresh_rollups()
+        self.stdout.write(self.style.SUCCESS("Rebuilt AWS VPC and account rollups."))
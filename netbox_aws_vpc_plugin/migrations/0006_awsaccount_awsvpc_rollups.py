@@ -0,0 +1,91 @@
+from django.db import migrations, models
+from django.db.models import BigIntegerField, Count, F, Func, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Power
+
+
+def ipv4_size(prefix):
+    mask_length = Func(F(prefix), function="MASKLEN", output_field=IntegerField())
+    return Cast(Power(Value(2), Value(32) - mask_length), output_field=BigIntegerField())
+
+
+def related(model, field, aggregate):
+    subquery = Subquery(
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Cast(aggregate, output_field=BigIntegerField()))
+        .values("total")
+    )
+    return Coalesce(subquery, 0, output_field=BigIntegerField())
+
+
+def populate_rollups(apps, schema_editor):
+    AWSAccount = apps.get_model("netbox_aws_vpc_plugin", "AWSAccount")
+    AWSVPC = apps.get_model("netbox_aws_vpc_plugin", "AWSVPC")
+    AWSSubnet = apps.get_model("netbox_aws_vpc_plugin", "AWSSubnet")
+    SecondaryCIDR = AWSVPC.vpc_secondary_ipv4_cidrs.through
+    subnet_size = Sum(ipv4_size("subnet_cidr__prefix"))
+
+    AWSVPC.objects.update(
+        subnet_count=related(AWSSubnet, "vpc", Count("*")),
+        allocated_ipv4_addresses=related(AWSSubnet, "vpc", subnet_size),
+        ipv4_address_space=(
+            related(AWSVPC, "pk", Sum(ipv4_size("vpc_cidr__prefix")))
+            + related(SecondaryCIDR, "awsvpc", Sum(ipv4_size("prefix__prefix")))
+        ),
+    )
+    AWSAccount.objects.update(
+        vpc_count=related(AWSVPC, "owner_account", Count("*")),
+        subnet_count=related(AWSSubnet, "vpc__owner_account", Count("*")),
+        allocated_ipv4_addresses=related(AWSSubnet, "vpc__owner_account", subnet_size),
+        ipv4_address_space=(
+            related(AWSVPC, "owner_account", Sum(ipv4_size("vpc_cidr__prefix")))
+            + related(SecondaryCIDR, "awsvpc__owner_account", Sum(ipv4_size("prefix__prefix")))
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_aws_vpc_plugin", "0005_awsvpc_vpc_ipv6_cidrs_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awsaccount",
+            name="vpc_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="awsaccount",
+            name="subnet_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="awsaccount",
+            name="allocated_ipv4_addresses",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="awsaccount",
+            name="ipv4_address_space",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="awsvpc",
+            name="subnet_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="awsvpc",
+            name="allocated_ipv4_addresses",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="awsvpc",
+            name="ipv4_address_space",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(code=populate_rollups, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_aws_vpc_plugin", "0006_awsaccount_awsvpc_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="awssubnet",
+            index=models.Index(fields=["vpc", "status"], name="awssubnet_vpc_status"),
+        ),
+        migrations.AddIndex(
+            model_name="awsvpc",
+            index=models.Index(fields=["owner_account", "region", "status"], name="awsvpc_owner_region_status"),
+        ),
+        # The composite indexes lead with the foreign keys, which need no index of their own
+        migrations.AlterField(
+            model_name="awssubnet",
+            name="vpc",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="netbox_aws_vpc_plugin.awsvpc",
+                verbose_name="VPC ID",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="awsvpc",
+            name="owner_account",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="netbox_aws_vpc_plugin.awsaccount",
+                verbose_name="Owner Account",
+            ),
+        ),
+    ]
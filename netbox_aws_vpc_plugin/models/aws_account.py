@@ -7,6 +7,9 @@ from django.urls import reverse
 from netbox.models import NetBoxModel
 
 from netbox_aws_vpc_plugin.choices import AWSAccountStatusChoices
+from netbox_aws_vpc_plugin.querysets import RollupQuerySet
+
+ACCOUNT_ROLLUP_FIELDS = ("vpc_count", "subnet_count", "allocated_ipv4_addresses", "ipv4_address_space")
 
 
 class AWSAccount(NetBoxModel):
@@ -24,6 +27,16 @@ class AWSAccount(NetBoxModel):
         max_length=50, choices=AWSAccountStatusChoices, default=AWSAccountStatusChoices.STATUS_ACTIVE
     )
 
+    # Rollups maintained by netbox_aws_vpc_plugin.signals
+    vpc_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="VPCs")
+    subnet_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Subnets")
+    allocated_ipv4_addresses = models.PositiveBigIntegerField(
+        default=0, editable=False, verbose_name="Allocated IPv4 Addresses"
+    )
+    ipv4_address_space = models.PositiveBigIntegerField(default=0, editable=False, verbose_name="IPv4 Address Space")
+
+    objects = RollupQuerySet.as_manager()
+
     class Meta:
         ordering = ("account_id",)
         verbose_name = "AWS Account"
@@ -34,3 +47,7 @@ class AWSAccount(NetBoxModel):
 
     def get_absolute_url(self):
         return reverse("plugins:netbox_aws_vpc_plugin:awsaccount", args=[self.pk])
+
+    def serialize_object(self, exclude=None):
+        # Keep rollup churn out of the change log
+        return super().serialize_object(exclude=[*(exclude or []), *ACCOUNT_ROLLUP_FIELDS])
@@ -40,10 +40,11 @@ class AWSSubnet(NetBoxModel):
         related_name="aws_subnet_ipv6",
         limit_choices_to=IPV6_PREFIXES,
     )
-    # VPC the subnet is part of
+    # VPC the subnet is part of; indexed by awssubnet_vpc_status
     vpc = models.ForeignKey(
         blank=True,
         null=True,
+        db_index=False,
         on_delete=models.CASCADE,
         to=AWSVPC,
         verbose_name="VPC ID",
@@ -69,6 +70,7 @@ class AWSSubnet(NetBoxModel):
 
     class Meta:
         ordering = ("subnet_id",)
+        indexes = (models.Index(fields=("vpc", "status"), name="awssubnet_vpc_status"),)
         verbose_name = "AWS Subnet"
         verbose_name_plural = "AWS Subnets"
 
@@ -8,9 +8,12 @@ from netbox.models import NetBoxModel
 
 from netbox_aws_vpc_plugin.choices import AWSVPCStatusChoices
 from netbox_aws_vpc_plugin.constants import IPV4_PREFIXES, IPV6_PREFIXES
+from netbox_aws_vpc_plugin.querysets import RollupQuerySet
 
 from .aws_account import AWSAccount
 
+VPC_ROLLUP_FIELDS = ("subnet_count", "allocated_ipv4_addresses", "ipv4_address_space")
+
 
 class AWSVPC(NetBoxModel):
     vpc_id = models.CharField(
@@ -49,9 +52,11 @@ class AWSVPC(NetBoxModel):
         related_name="vpc_ipv6_cidrs",
         limit_choices_to=IPV6_PREFIXES,
     )
+    # Indexed by awsvpc_owner_region_status
     owner_account = models.ForeignKey(
         blank=True,
         null=True,
+        db_index=False,
         on_delete=models.PROTECT,
         to=AWSAccount,
         verbose_name="Owner Account",
@@ -64,8 +69,18 @@ class AWSVPC(NetBoxModel):
     )
     comments = models.TextField(blank=True)
 
+    # Rollups maintained by netbox_aws_vpc_plugin.signals
+    subnet_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Subnets")
+    allocated_ipv4_addresses = models.PositiveBigIntegerField(
+        default=0, editable=False, verbose_name="Allocated IPv4 Addresses"
+    )
+    ipv4_address_space = models.PositiveBigIntegerField(default=0, editable=False, verbose_name="IPv4 Address Space")
+
+    objects = RollupQuerySet.as_manager()
+
     class Meta:
         ordering = ("vpc_id",)
+        indexes = (models.Index(fields=("owner_account", "region", "status"), name="awsvpc_owner_region_status"),)
         verbose_name = "AWS VPC"
         verbose_name_plural = "AWS VPCs"
 
@@ -75,3 +90,7 @@ class AWSVPC(NetBoxModel):
 
     def get_absolute_url(self):
         return reverse("plugins:netbox_aws_vpc_plugin:awsvpc", args=[self.pk])
+
+    def serialize_object(self, exclude=None):
+        # Keep rollup churn out of the change log
+        return super().serialize_object(exclude=[*(exclude or []), *VPC_ROLLUP_FIELDS])
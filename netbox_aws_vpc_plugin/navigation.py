@@ -5,7 +5,12 @@ vpc_buttons = [
         link="plugins:netbox_aws_vpc_plugin:awsvpc_add",
         title="Add",
         icon_class="mdi mdi-plus-thick",
-    )
+    ),
+    PluginMenuButton(
+        link="plugins:netbox_aws_vpc_plugin:awsvpc_bulk_import",
+        title="Import",
+        icon_class="mdi mdi-upload",
+    ),
 ]
 
 subnet_buttons = [
@@ -13,7 +18,12 @@ subnet_buttons = [
         link="plugins:netbox_aws_vpc_plugin:awssubnet_add",
         title="Add",
         icon_class="mdi mdi-plus-thick",
-    )
+    ),
+    PluginMenuButton(
+        link="plugins:netbox_aws_vpc_plugin:awssubnet_bulk_import",
+        title="Import",
+        icon_class="mdi mdi-upload",
+    ),
 ]
 
 account_buttons = [
@@ -21,7 +31,12 @@ account_buttons = [
         link="plugins:netbox_aws_vpc_plugin:awsaccount_add",
         title="Add",
         icon_class="mdi mdi-plus-thick",
-    )
+    ),
+    PluginMenuButton(
+        link="plugins:netbox_aws_vpc_plugin:awsaccount_bulk_import",
+        title="Import",
+        icon_class="mdi mdi-upload",
+    ),
 ]
 
 menu_items = (
@@ -30,6 +45,11 @@ menu_items = (
         link_text="AWS VPCs",
         buttons=vpc_buttons,
     ),
+    PluginMenuItem(
+        link="plugins:netbox_aws_vpc_plugin:awsvpc_overlaps",
+        link_text="VPC CIDR Overlaps",
+        permissions=["netbox_aws_vpc_plugin.view_awsvpc"],
+    ),
     PluginMenuItem(
         link="plugins:netbox_aws_vpc_plugin:awssubnet_list",
         link_text="AWS Subnets",
@@ -0,0 +1,93 @@
+"""
+Detect overlapping CIDRs between AWS VPCs.
+"""
+
+import hashlib
+import heapq
+import itertools
+from collections import namedtuple
+
+from django.core.cache import cache
+from ipam.models import Prefix
+
+from .cache import get_generations
+from .models import AWSVPC, AWSAccount
+from .utils import VPC_CIDR_FIELDS
+
+__all__ = (
+    "Overlap",
+    "VPCCIDR",
+    "find_overlaps",
+    "get_overlaps",
+    "vpc_cidrs",
+)
+
+# Overlap reports are keyed on the source generations, so this only bounds how long unused
+# reports linger in the cache
+CACHE_TIMEOUT = 3600
+
+# A VPC CIDR as an inclusive range of integer addresses
+VPCCIDR = namedtuple("VPCCIDR", ("family", "first", "last", "cidr", "vpc", "vpc_id", "account", "account_id"))
+
+
+class Overlap(namedtuple("Overlap", ("cidr", "other"))):
+    """
+    Two overlapping CIDRs of different VPCs.
+    """
+
+    __slots__ = ()
+
+    @property
+    def cross_account(self):
+        return self.cidr.account != self.other.account
+
+
+def vpc_cidrs(vpcs):
+    """
+    Yield a `VPCCIDR` for every primary, secondary and IPv6 CIDR of the given VPCs.
+    """
+    for field in VPC_CIDR_FIELDS:
+        rows = vpcs.filter(**{f"{field}__isnull": False}).values_list(
+            f"{field}__prefix", "pk", "vpc_id", "owner_account_id", "owner_account__account_id"
+        )
+        for cidr, pk, vpc_id, account, account_id in rows.iterator():
+            yield VPCCIDR(cidr.version, cidr.first, cidr.last, str(cidr.cidr), pk, vpc_id, account, account_id)
+
+
+def find_overlaps(cidrs):
+    """
+    Yield an `Overlap` for every pair of CIDRs of different VPCs which share any address.
+
+    CIDRs are sorted by their first address and swept in order, keeping a heap of the ranges
+    still open. Every range is only compared with the open ranges it actually overlaps, so the
+    cost is O(n log n) plus the number of overlaps found, rather than O(n²) pairwise checks.
+    """
+    open_ranges = []
+    family = None
+    counter = itertools.count()
+    for cidr in sorted(cidrs, key=lambda cidr: (cidr.family, cidr.first, -cidr.last)):
+        if cidr.family != family:
+            open_ranges, family = [], cidr.family
+        # Close the ranges ending before this one starts
+        while open_ranges and open_ranges[0][0] < cidr.first:
+            heapq.heappop(open_ranges)
+        for _, _, other in open_ranges:
+            if other.vpc != cidr.vpc:
+                yield Overlap(other, cidr)
+        heapq.heappush(open_ranges, (cidr.last, next(counter), cidr))
+
+
+def get_overlaps(vpcs):
+    """
+    Return the list of `Overlap`s between the given VPCs, cached until a VPC, account or prefix
+    changes.
+    """
+    pks = ",".join(str(pk) for pk in vpcs.order_by("pk").values_list("pk", flat=True))
+    generations = ":".join(str(generation) for generation in get_generations(AWSVPC, AWSAccount, Prefix))
+    key = f"netbox_aws_vpc_plugin:overlaps:{hashlib.sha256(pks.encode()).hexdigest()}:{generations}"
+
+    overlaps = cache.get(key)
+    if overlaps is None:
+        overlaps = list(find_overlaps(vpc_cidrs(vpcs)))
+        cache.set(key, overlaps, CACHE_TIMEOUT)
+    return overlaps
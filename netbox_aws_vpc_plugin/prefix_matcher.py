@@ -0,0 +1,73 @@
+"""
+In-memory longest-prefix matching of IP addresses against a set of networks.
+"""
+
+import socket
+
+__all__ = (
+    "PrefixMatcher",
+    "parse_ip",
+)
+
+ADDRESS_BITS = {4: 32, 6: 128}
+
+
+def parse_ip(address):
+    """
+    Return the `(family, integer)` form of an IPv4 or IPv6 address string. Raises ValueError if
+    the string is not a valid address.
+    """
+    address = address.strip()
+    try:
+        if ":" in address:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, address), "big")
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except OSError:
+        raise ValueError(f"Invalid IP address: {address}")
+
+
+class PrefixMatcher:
+    """
+    Longest-prefix match table of networks to arbitrary values.
+
+    Rather than walking a bit-per-level trie, which costs up to 128 Python-level steps per
+    lookup, networks are kept in one hash table per prefix length actually in use. A lookup
+    masks the address to each of those lengths, longest first, and stops at the first hit, so
+    it costs one dictionary probe per distinct prefix length (typically a handful).
+
+    Several values may be stored for the same network (for example overlapping private ranges
+    in different VPCs); all of them are returned.
+    """
+
+    def __init__(self):
+        # {family: {prefix_length: {network: [values]}}}
+        self._tables = {4: {}, 6: {}}
+        # {family: [(prefix_length, mask, table), ...]}, longest prefix first
+        self._probes = {4: [], 6: []}
+        self.size = 0
+
+    def add(self, network, value):
+        """
+        Add `value` under `network`, a `netaddr.IPNetwork` or anything with `version`, `prefixlen`
+        and integer `value` attributes.
+        """
+        family, length = network.version, network.prefixlen
+        tables = self._tables[family]
+        mask = ((1 << length) - 1) << (ADDRESS_BITS[family] - length)
+        if length not in tables:
+            tables[length] = {}
+            self._probes[family].append((length, mask, tables[length]))
+            self._probes[family].sort(key=lambda probe: probe[0], reverse=True)
+        tables[length].setdefault(network.value & mask, []).append(value)
+        self.size += 1
+
+    def lookup(self, address):
+        """
+        Return `(prefix_length, values)` for the longest network containing `address` (a string,
+        or a `(family, integer)` tuple from `parse_ip()`), or `(None, [])` if none does.
+        """
+        family, value = parse_ip(address) if isinstance(address, str) else address
+        for length, mask, table in self._probes[family]:
+            if (values := table.get(value & mask)) is not None:
+                return length, values
+        return None, []
@@ -0,0 +1,20 @@
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from utilities.querysets import RestrictedQuerySet
+
+__all__ = ("RollupQuerySet",)
+
+
+class RollupQuerySet(RestrictedQuerySet):
+    """
+    QuerySet for models carrying the persisted IPv4 address rollups.
+    """
+
+    def annotate_utilization(self):
+        """
+        Annotate `ipv4_utilization`, the percentage of the IPv4 address space allocated to subnets
+        (0 where there is no address space). It is derived from the persisted rollups in SQL, so it
+        costs no extra queries and can be sorted on.
+        """
+        utilization = Cast(F("allocated_ipv4_addresses"), FloatField()) * 100 / NullIf(F("ipv4_address_space"), 0)
+        return self.annotate(ipv4_utilization=Coalesce(utilization, Value(0.0), output_field=FloatField()))
@@ -0,0 +1,163 @@
+"""
+Persisted subnet/VPC counts and IPv4 address totals for AWS VPCs and accounts.
+
+The rollup fields are never written by forms or the API. They are refreshed for the
+affected VPCs and accounts by the receivers in `signals.py`, and can be rebuilt or
+verified from scratch with the `rebuild_aws_rollups` management command.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import (
+    BigIntegerField,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, Power
+from utilities.query import count_related
+
+from .models import AWSVPC, AWSAccount, AWSSubnet
+from .models.aws_account import ACCOUNT_ROLLUP_FIELDS
+from .models.aws_vpc import VPC_ROLLUP_FIELDS
+
+__all__ = (
+    "ACCOUNT_ROLLUP_FIELDS",
+    "VPC_ROLLUP_FIELDS",
+    "account_rollups",
+    "deferred_rollups",
+    "ipv4_size",
+    "refresh_rollups",
+    "stale_rollups",
+    "sum_related",
+    "vpc_rollups",
+)
+
+
+def ipv4_size(prefix):
+    """
+    Return an expression for the number of addresses in the IPv4 network at `prefix`,
+    e.g. `"subnet_cidr__prefix"`.
+    """
+    mask_length = Func(F(prefix), function="MASKLEN", output_field=IntegerField())
+    return Cast(Power(Value(2), Value(32) - mask_length), output_field=BigIntegerField())
+
+
+def sum_related(model, field, expression):
+    """
+    Like `count_related()`, but sum `expression` over the `model` rows related by `field`.
+    """
+    subquery = Subquery(
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Cast(Sum(expression), output_field=BigIntegerField()))
+        .values("total")
+    )
+    return Coalesce(subquery, 0, output_field=BigIntegerField())
+
+
+def vpc_rollups():
+    """
+    Return the expressions computing each of `VPC_ROLLUP_FIELDS` for an AWSVPC queryset.
+    """
+    secondary_cidrs = AWSVPC.vpc_secondary_ipv4_cidrs.through
+    return {
+        "subnet_count": count_related(AWSSubnet, "vpc"),
+        "allocated_ipv4_addresses": sum_related(AWSSubnet, "vpc", ipv4_size("subnet_cidr__prefix")),
+        "ipv4_address_space": (
+            sum_related(AWSVPC, "pk", ipv4_size("vpc_cidr__prefix"))
+            + sum_related(secondary_cidrs, "awsvpc", ipv4_size("prefix__prefix"))
+        ),
+    }
+
+
+def account_rollups():
+    """
+    Return the expressions computing each of `ACCOUNT_ROLLUP_FIELDS` for an AWSAccount queryset.
+
+    Subnet counts and address totals cover the subnets and CIDRs of the VPCs owned by the
+    account (whichever account owns each subnet), so that allocations and address space are
+    counted alike. They are computed from the underlying rows rather than the VPC rollups, so
+    the two can be verified independently.
+    """
+    secondary_cidrs = AWSVPC.vpc_secondary_ipv4_cidrs.through
+    return {
+        "vpc_count": count_related(AWSVPC, "owner_account"),
+        "subnet_count": count_related(AWSSubnet, "vpc__owner_account"),
+        "allocated_ipv4_addresses": sum_related(AWSSubnet, "vpc__owner_account", ipv4_size("subnet_cidr__prefix")),
+        "ipv4_address_space": (
+            sum_related(AWSVPC, "owner_account", ipv4_size("vpc_cidr__prefix"))
+            + sum_related(secondary_cidrs, "awsvpc__owner_account", ipv4_size("prefix__prefix"))
+        ),
+    }
+
+
+# The `(vpcs, accounts)` primary keys awaiting a refresh while rollups are deferred
+_deferred = ContextVar("deferred_rollups", default=None)
+
+
+@contextmanager
+def deferred_rollups():
+    """
+    Collect the rollup refreshes requested within the block, e.g. by the signals fired while
+    deleting many subnets one at a time, and run them together once it exits.
+    """
+    if _deferred.get() is not None:
+        # Already deferred by an enclosing block
+        yield
+        return
+
+    token = _deferred.set((set(), set()))
+    try:
+        yield
+        vpcs, accounts = _deferred.get()
+    finally:
+        _deferred.reset(token)
+    refresh_rollups(vpcs=vpcs, accounts=accounts)
+
+
+def refresh_rollups(vpcs=None, accounts=None):
+    """
+    Recompute the rollups of the given VPC and account primary keys with one UPDATE per model.
+
+    The owners of any VPCs passed are refreshed as well, since their address totals include
+    the VPCs'. Passing `None` for both refreshes every VPC and account.
+    """
+    if vpcs is None and accounts is None:
+        AWSVPC.objects.update(**vpc_rollups())
+        AWSAccount.objects.update(**account_rollups())
+        return
+
+    vpcs = {pk for pk in vpcs or () if pk is not None}
+    accounts = {pk for pk in accounts or () if pk is not None}
+    if (deferred := _deferred.get()) is not None:
+        deferred[0].update(vpcs)
+        deferred[1].update(accounts)
+        return
+    if vpcs:
+        AWSVPC.objects.filter(pk__in=vpcs).update(**vpc_rollups())
+        accounts.update(
+            AWSVPC.objects.filter(pk__in=vpcs, owner_account__isnull=False).values_list("owner_account", flat=True)
+        )
+    if accounts:
+        AWSAccount.objects.filter(pk__in=accounts).update(**account_rollups())
+
+
+def stale_rollups():
+    """
+    Yield `(object, field, stored, expected)` for every persisted rollup which does not match
+    the value computed from scratch.
+    """
+    for model, rollups in ((AWSVPC, vpc_rollups()), (AWSAccount, account_rollups())):
+        expected = {f"expected_{field}": expression for field, expression in rollups.items()}
+        for obj in model.objects.annotate(**expected):
+            for field in rollups:
+                stored, computed = getattr(obj, field), getattr(obj, f"expected_{field}")
+                if stored != computed:
+                    yield obj, field, stored, computed
@@ -0,0 +1,182 @@
+from dcim.models import Region
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from extras.models import Tag, TaggedItem
+from ipam.models import Prefix
+from tenancy.models import Tenant
+
+from .cache import bump_generation
+from .models import AWSVPC, AWSAccount, AWSSubnet
+from .rollups import refresh_rollups
+
+#
+# Rollups
+#
+
+
+@receiver(pre_save, sender=AWSSubnet)
+@receiver(pre_save, sender=AWSVPC)
+def remember_rollup_parents(instance, **kwargs):
+    """
+    Record the parent an existing subnet or VPC belonged to, so that the rollups of the old
+    parent are refreshed too if it is moved.
+    """
+    fields = ("vpc",) if isinstance(instance, AWSSubnet) else ("owner_account",)
+    instance._rollup_parents = {}
+    if not instance._state.adding:
+        instance._rollup_parents = (
+            type(instance).objects.filter(pk=instance.pk).values(*(f"{field}_id" for field in fields)).first() or {}
+        )
+
+
+@receiver(post_save, sender=AWSSubnet)
+@receiver(post_delete, sender=AWSSubnet)
+def update_subnet_rollups(instance, **kwargs):
+    # Subnets count towards their VPC's owner, which is refreshed along with the VPC
+    old = getattr(instance, "_rollup_parents", {})
+    refresh_rollups(vpcs={instance.vpc_id, old.get("vpc_id")})
+
+
+@receiver(post_save, sender=AWSVPC)
+def update_vpc_rollups(instance, **kwargs):
+    old = getattr(instance, "_rollup_parents", {})
+    refresh_rollups(vpcs={instance.pk}, accounts={old.get("owner_account_id")})
+
+
+@receiver(post_delete, sender=AWSVPC)
+def update_deleted_vpc_rollups(instance, **kwargs):
+    refresh_rollups(accounts={instance.owner_account_id})
+
+
+@receiver(post_save, sender=AWSAccount)
+def update_account_rollups(instance, **kwargs):
+    # Saving an account writes back whatever rollups were loaded with it
+    refresh_rollups(accounts={instance.pk})
+
+
+@receiver(m2m_changed, sender=AWSVPC.vpc_secondary_ipv4_cidrs.through)
+def update_secondary_cidr_rollups(instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # A Prefix was (un)assigned from the Prefix side
+        if action == "pre_clear":
+            instance._rollup_vpcs = set(instance.vpc_secondary_ipv4_cidrs.values_list("pk", flat=True))
+        elif action == "post_clear":
+            refresh_rollups(vpcs=getattr(instance, "_rollup_vpcs", set()))
+        elif action in ("post_add", "post_remove"):
+            refresh_rollups(vpcs=pk_set)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        refresh_rollups(vpcs={instance.pk})
+
+
+def vpcs_using_prefix(prefix):
+    return set(
+        AWSVPC.objects.filter(
+            Q(vpc_cidr=prefix) | Q(vpc_secondary_ipv4_cidrs=prefix) | Q(awssubnet__subnet_cidr=prefix)
+        ).values_list("pk", flat=True)
+    )
+
+
+@receiver(pre_save, sender=Prefix)
+def remember_prefix_family(instance, **kwargs):
+    # A Prefix changed from IPv4 to IPv6 stops counting towards the rollups
+    instance._rollup_family = None
+    if not instance._state.adding:
+        previous = Prefix.objects.filter(pk=instance.pk).values_list("prefix", flat=True).first()
+        instance._rollup_family = previous and previous.version
+
+
+@receiver(post_save, sender=Prefix)
+def update_prefix_rollups(instance, created, **kwargs):
+    # A new Prefix cannot be assigned to anything yet, and only IPv4 sizes are rolled up
+    if not created and 4 in (instance.family, getattr(instance, "_rollup_family", None)):
+        refresh_rollups(vpcs=vpcs_using_prefix(instance))
+
+
+@receiver(pre_delete, sender=Prefix)
+def remember_prefix_vpcs(instance, **kwargs):
+    # Secondary CIDR assignments are cascaded away without an m2m_changed signal
+    instance._rollup_vpcs = vpcs_using_prefix(instance)
+
+
+@receiver(post_delete, sender=Prefix)
+def update_deleted_prefix_rollups(instance, **kwargs):
+    refresh_rollups(vpcs=getattr(instance, "_rollup_vpcs", set()))
+
+
+#
+# Cache invalidation
+#
+
+
+@receiver(post_save, sender=AWSAccount)
+@receiver(post_delete, sender=AWSAccount)
+@receiver(post_save, sender=AWSVPC)
+@receiver(post_delete, sender=AWSVPC)
+@receiver(post_save, sender=AWSSubnet)
+@receiver(post_delete, sender=AWSSubnet)
+# Regions, tenants and tags are nested in the serialized objects
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_cached_data(sender, **kwargs):
+    # Other workers must not rebuild their caches from data which may yet be rolled back
+    transaction.on_commit(lambda: bump_generation(sender))
+
+
+def prefix_in_use(prefix):
+    """
+    Return whether `prefix` is a CIDR of any VPC or subnet.
+    """
+    return (
+        AWSVPC.objects.filter(
+            Q(vpc_cidr=prefix) | Q(vpc_secondary_ipv4_cidrs=prefix) | Q(vpc_ipv6_cidrs=prefix)
+        ).exists()
+        or AWSSubnet.objects.filter(Q(subnet_cidr=prefix) | Q(subnet_ipv6_cidr=prefix)).exists()
+    )
+
+
+# Prefixes change all over NetBox, but only those used by a VPC or subnet invalidate anything
+@receiver(post_save, sender=Prefix)
+def invalidate_cached_prefix(instance, created, **kwargs):
+    # A new Prefix cannot be assigned to anything yet
+    if not created and prefix_in_use(instance):
+        transaction.on_commit(lambda: bump_generation(Prefix))
+
+
+@receiver(pre_delete, sender=Prefix)
+def remember_prefix_in_use(instance, **kwargs):
+    # The CIDR references are cleared by the delete, without signals
+    instance._in_use = prefix_in_use(instance)
+
+
+@receiver(post_delete, sender=Prefix)
+def invalidate_cached_deleted_prefix(instance, **kwargs):
+    if getattr(instance, "_in_use", True):
+        transaction.on_commit(lambda: bump_generation(Prefix))
+
+
+@receiver(m2m_changed, sender=AWSVPC.vpc_secondary_ipv4_cidrs.through)
+@receiver(m2m_changed, sender=AWSVPC.vpc_ipv6_cidrs.through)
+def invalidate_cached_vpc_cidrs(action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(lambda: bump_generation(AWSVPC))
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_cached_tagged_item(instance, **kwargs):
+    if ContentType.objects.get_for_id(instance.content_type_id).model_class() in (AWSAccount, AWSVPC, AWSSubnet):
+        transaction.on_commit(lambda: bump_generation(Tag))
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def invalidate_cached_tags(instance, action, **kwargs):
+    # Tags are (un)assigned in bulk, without saving or deleting each TaggedItem
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(instance, (AWSAccount, AWSVPC, AWSSubnet)):
+        transaction.on_commit(lambda: bump_generation(Tag))
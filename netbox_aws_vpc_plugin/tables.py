@@ -1,5 +1,6 @@
 import django_tables2 as tables
-from netbox.tables import NetBoxTable
+from django.urls import reverse
+from netbox.tables import NetBoxTable, columns
 
 from .models import AWSVPC, AWSAccount, AWSSubnet
 
@@ -8,10 +9,17 @@ class AWSVPCTable(NetBoxTable):
     vpc_id = tables.Column(linkify=True)
     name = tables.Column()
     vpc_cidr = tables.Column(linkify=True)
+    vpc_secondary_ipv4_cidrs = columns.ManyToManyColumn(linkify_item=True, verbose_name="Secondary IPv4 CIDRs")
+    vpc_ipv6_cidrs = columns.ManyToManyColumn(linkify_item=True, verbose_name="IPv6 CIDRs")
     owner_account = tables.Column(linkify=True)
     region = tables.Column(linkify=True)
     status = tables.Column()
-    # TODO: Count of subnets
+    subnet_count = columns.LinkedCountColumn(
+        viewname="plugins:netbox_aws_vpc_plugin:awssubnet_list",
+        url_params={"vpc": "pk"},
+        verbose_name="Subnets",
+    )
+    ipv4_utilization = columns.UtilizationColumn(verbose_name="IPv4 Utilization")
 
     class Meta(NetBoxTable.Meta):
         model = AWSVPC
@@ -27,6 +35,10 @@ class AWSVPCTable(NetBoxTable):
             "owner_account",
             "region",
             "status",
+            "subnet_count",
+            "allocated_ipv4_addresses",
+            "ipv4_address_space",
+            "ipv4_utilization",
             "actions",
         )
         default_columns = (
@@ -36,6 +48,8 @@ class AWSVPCTable(NetBoxTable):
             "owner_account",
             "region",
             "status",
+            "subnet_count",
+            "ipv4_utilization",
         )
 
 
@@ -44,6 +58,7 @@ class AWSSubnetTable(NetBoxTable):
     vpc = tables.Column(linkify=True)
     name = tables.Column()
     subnet_cidr = tables.Column(linkify=True)
+    subnet_ipv6_cidr = tables.Column(linkify=True)
     owner_account = tables.Column(linkify=True)
     region = tables.Column(linkify=True)
     status = tables.Column()
@@ -80,6 +95,17 @@ class AWSAccountTable(NetBoxTable):
     name = tables.Column()
     tenant = tables.Column(linkify=True)
     status = tables.Column()
+    vpc_count = columns.LinkedCountColumn(
+        viewname="plugins:netbox_aws_vpc_plugin:awsvpc_list",
+        url_params={"owner_account": "pk"},
+        verbose_name="VPCs",
+    )
+    subnet_count = columns.LinkedCountColumn(
+        viewname="plugins:netbox_aws_vpc_plugin:awssubnet_list",
+        url_params={"vpc_owner_account": "pk"},
+        verbose_name="Subnets",
+    )
+    ipv4_utilization = columns.UtilizationColumn(verbose_name="IPv4 Utilization")
 
     class Meta(NetBoxTable.Meta):
         model = AWSAccount
@@ -91,6 +117,46 @@ class AWSAccountTable(NetBoxTable):
             "arn",
             "tenant",
             "status",
+            "vpc_count",
+            "subnet_count",
+            "allocated_ipv4_addresses",
+            "ipv4_address_space",
+            "ipv4_utilization",
             "actions",
         )
-        default_columns = ("account_id", "name", "tenant", "status")
+        default_columns = ("account_id", "name", "tenant", "status", "vpc_count", "subnet_count", "ipv4_utilization")
+
+
+def _vpc_url(vpc_cidr):
+    return reverse("plugins:netbox_aws_vpc_plugin:awsvpc", args=[vpc_cidr.vpc])
+
+
+def _account_url(vpc_cidr):
+    if vpc_cidr.account is not None:
+        return reverse("plugins:netbox_aws_vpc_plugin:awsaccount", args=[vpc_cidr.account])
+
+
+class AWSVPCOverlapTable(tables.Table):
+    """
+    Pairs of overlapping VPC CIDRs, rendered from `overlaps.Overlap` records.
+    """
+
+    cidr = tables.Column(accessor="cidr.cidr", verbose_name="CIDR")
+    vpc = tables.Column(accessor="cidr.vpc_id", linkify=lambda record: _vpc_url(record.cidr), verbose_name="VPC")
+    account = tables.Column(
+        accessor="cidr.account_id", linkify=lambda record: _account_url(record.cidr), verbose_name="Account"
+    )
+    other_cidr = tables.Column(accessor="other.cidr", verbose_name="Overlapping CIDR")
+    other_vpc = tables.Column(
+        accessor="other.vpc_id", linkify=lambda record: _vpc_url(record.other), verbose_name="Overlapping VPC"
+    )
+    other_account = tables.Column(
+        accessor="other.account_id",
+        linkify=lambda record: _account_url(record.other),
+        verbose_name="Overlapping Account",
+    )
+    cross_account = columns.BooleanColumn(verbose_name="Cross-Account")
+
+    class Meta:
+        attrs = {"class": "table table-hover object-list"}
+        orderable = False
@@ -0,0 +1,84 @@
+"""Tests for finding and reserving free subnet CIDRs in AWS VPCs."""
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from ipam.choices import PrefixStatusChoices
+from ipam.models import Prefix
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.choices import AWSSubnetStatusChoices
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+
+class AvailableSubnetsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="allocationsuperuser",
+            email="allocationsuperuser@example.com",
+            password="supersecret",
+        )
+        account = AWSAccount.objects.create(account_id="171717171717", name="Allocation Account")
+        cls.vpc = AWSVPC.objects.create(
+            vpc_id="vpc-allocate1", owner_account=account, vpc_cidr=Prefix.objects.create(prefix="10.1.0.0/22")
+        )
+        cls.vpc.vpc_secondary_ipv4_cidrs.add(Prefix.objects.create(prefix="100.64.0.0/24"))
+        cls.vpc.vpc_ipv6_cidrs.add(Prefix.objects.create(prefix="2600:1f18:cc00::/56"))
+        for cidr in ("10.1.0.0/24", "10.1.1.128/25", "10.1.3.0/24"):
+            AWSSubnet.objects.create(
+                subnet_id=f"subnet-{cidr.replace('.', '').replace('/', '')}",
+                vpc=cls.vpc,
+                subnet_cidr=Prefix.objects.create(prefix=cidr),
+            )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-available-subnets", kwargs={"pk": self.vpc.pk})
+
+    def available(self, params):
+        response = self.client.get(f"{self.url}?{params}")
+        self.assertEqual(response.status_code, 200)
+        return [network["prefix"] for network in response.data]
+
+    def test_list(self):
+        self.assertEqual(self.available("prefix_length=24"), ["10.1.2.0/24", "100.64.0.0/24"])
+        self.assertEqual(
+            self.available("prefix_length=25&limit=4"), ["10.1.1.0/25", "10.1.2.0/25", "10.1.2.128/25", "100.64.0.0/25"]
+        )
+        self.assertEqual(self.available("prefix_length=26&limit=2"), ["10.1.1.0/26", "10.1.1.64/26"])
+        self.assertEqual(self.available("prefix_length=64&family=6&limit=1"), ["2600:1f18:cc00::/64"])
+
+    def test_invalid_prefix_length(self):
+        for params in ("prefix_length=30", "prefix_length=62&family=6", "family=4"):
+            self.assertEqual(self.client.get(f"{self.url}?{params}").status_code, 400)
+
+    def test_reserve(self):
+        response = self.client.post(self.url, {"prefix_length": 24, "name": "app-a"}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+        subnet = AWSSubnet.objects.get(pk=response.data["id"])
+        self.assertEqual(subnet.vpc, self.vpc)
+        self.assertEqual(subnet.owner_account, self.vpc.owner_account)
+        self.assertEqual(subnet.status, AWSSubnetStatusChoices.STATUS_RESERVED)
+        self.assertEqual(str(subnet.subnet_cidr.prefix), "10.1.2.0/24")
+        self.assertEqual(subnet.subnet_cidr.status, PrefixStatusChoices.STATUS_RESERVED)
+
+        # The reserved block is no longer offered
+        self.assertEqual(self.available("prefix_length=24"), ["100.64.0.0/24"])
+
+    def test_reserve_without_space(self):
+        self.client.post(self.url, {"prefix_length": 24}, format="json")
+        self.client.post(self.url, {"prefix_length": 24}, format="json")
+
+        response = self.client.post(self.url, {"prefix_length": 24}, format="json")
+        self.assertEqual(response.status_code, 409)
+
+    def test_reserve_requires_permission(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, {"prefix_length": 24}, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(AWSSubnet.objects.filter(status=AWSSubnetStatusChoices.STATUS_RESERVED).exists())
@@ -0,0 +1,303 @@
+"""Tests for the `netbox_aws_vpc_plugin` REST API."""
+
+from core.models import ObjectType
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tenancy.models import Tenant
+from users.models import ObjectPermission
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+from .utils import QueryCountTestMixin, create_test_subnets, create_test_vpcs
+
+
+class ListEndpointQueryCountTestCase(QueryCountTestMixin, APITestCase):
+    """The number of queries behind a list endpoint must not grow with the page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="apisuperuser",
+            email="apisuperuser@example.com",
+            password="supersecret",
+        )
+        cls.tenant = Tenant.objects.create(name="API Tenant", slug="api-tenant")
+        cls.account = AWSAccount.objects.create(account_id="555555555555", name="API Account", tenant=cls.tenant)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def test_vpc_list(self):
+        create_test_vpcs(self.account, 1, 2)
+        url = f"{reverse('plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list')}?limit=100"
+
+        self.assertConstantQueries(url, lambda: create_test_vpcs(self.account, 3, 20))
+
+    def test_subnet_list(self):
+        vpc = AWSVPC.objects.create(vpc_id="vpc-apilist", owner_account=self.account)
+        create_test_subnets(vpc, 1, 2)
+        url = f"{reverse('plugins-api:netbox_aws_vpc_plugin-api:awssubnet-list')}?limit=100"
+
+        self.assertConstantQueries(url, lambda: create_test_subnets(vpc, 3, 20))
+
+    def test_account_list(self):
+        def create_accounts(start, count):
+            for i in range(start, start + count):
+                AWSAccount.objects.create(account_id=f"{i:012d}", name=f"Account {i}", tenant=self.tenant)
+
+        create_accounts(1, 2)
+        url = f"{reverse('plugins-api:netbox_aws_vpc_plugin-api:awsaccount-list')}?limit=100"
+
+        self.assertConstantQueries(url, lambda: create_accounts(3, 20))
+
+
+class RelatedCountTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="countsuperuser",
+            email="countsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="666666666666", name="Busy Account")
+        cls.empty_account = AWSAccount.objects.create(account_id="666666666667", name="Empty Account")
+        cls.busy_vpc, cls.empty_vpc = create_test_vpcs(cls.account, 1, 2)
+        create_test_subnets(cls.busy_vpc, 1, 3)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def test_vpc_subnet_count(self):
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list")
+
+        response = self.client.get(f"{url}{self.busy_vpc.pk}/")
+        self.assertEqual(response.data["subnet_count"], 3)
+
+        response = self.client.get(f"{url}?subnet_count__gte=1")
+        self.assertEqual([vpc["id"] for vpc in response.data["results"]], [self.busy_vpc.pk])
+
+        response = self.client.get(f"{url}?subnet_count=0")
+        self.assertEqual([vpc["id"] for vpc in response.data["results"]], [self.empty_vpc.pk])
+
+    def test_account_counts(self):
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsaccount-list")
+
+        response = self.client.get(f"{url}{self.account.pk}/")
+        self.assertEqual(response.data["vpc_count"], 2)
+        self.assertEqual(response.data["subnet_count"], 3)
+
+        response = self.client.get(f"{url}?vpc_count__lt=1")
+        self.assertEqual([account["id"] for account in response.data["results"]], [self.empty_account.pk])
+
+
+class KeysetPaginationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="keysetsuperuser",
+            email="keysetsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="777777777777", name="Keyset Account")
+        cls.vpc = AWSVPC.objects.create(vpc_id="vpc-keyset", owner_account=cls.account)
+        cls.subnets = create_test_subnets(cls.vpc, 1, 5)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awssubnet-list")
+
+    def test_walk(self):
+        url = f"{self.url}?cursor=&limit=2"
+        subnet_ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            subnet_ids.extend(subnet["subnet_id"] for subnet in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(subnet_ids, sorted(subnet.subnet_id for subnet in self.subnets))
+
+    def test_filtered(self):
+        excluded = self.subnets[2]
+        response = self.client.get(f"{self.url}?cursor=&limit=10&id__n={excluded.pk}")
+        self.assertEqual(len(response.data["results"]), 4)
+        self.assertIsNone(response.data["next"])
+
+    def test_offset_pagination_unchanged(self):
+        response = self.client.get(f"{self.url}?limit=2&offset=2")
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_invalid(self):
+        self.assertEqual(self.client.get(f"{self.url}?cursor=%25%25").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.url}?cursor=&ordering=-subnet_id").status_code, 400)
+
+
+class LookupTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="lookupsuperuser",
+            email="lookupsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="888888888888", name="Lookup Account")
+        cls.other_account = AWSAccount.objects.create(account_id="888888888889", name="Other Lookup Account")
+        cls.vpcs = create_test_vpcs(cls.account, 1, 3)
+        cls.other_vpc = create_test_vpcs(cls.other_account, 4, 1)[0]
+
+    def setUp(self):
+        super().setUp()
+        self.url = f"{reverse('plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list')}lookup/"
+
+    def post(self, aws_ids):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {"aws_ids": aws_ids}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response, len(context)
+
+    def test_post(self):
+        self.client.force_login(self.superuser)
+        # Warm up any per-process caches before measuring
+        self.post(["vpc-00000001"])
+        _, few = self.post(["vpc-00000001"])
+
+        response, many = self.post(["vpc-00000003", "vpc-missing", "vpc-00000001", "vpc-00000004"])
+        self.assertEqual(
+            sorted(vpc["vpc_id"] for vpc in response.data["results"]), ["vpc-00000001", "vpc-00000003", "vpc-00000004"]
+        )
+        self.assertEqual(response.data["missing"], ["vpc-missing"])
+        self.assertEqual(many, few)
+
+    def test_map(self):
+        self.client.force_login(self.superuser)
+        response = self.client.get(f"{self.url}?map=true&aws_id=vpc-00000002&aws_id=vpc-00000004")
+        self.assertEqual(response.data["results"], {"vpc-00000002": self.vpcs[1].pk, "vpc-00000004": self.other_vpc.pk})
+        self.assertEqual(response.data["missing"], [])
+
+        response = self.client.post(f"{self.url}?map=true", "vpc-00000001\nvpc-00000009\n", content_type="text/plain")
+        self.assertEqual(response.data["results"], {"vpc-00000001": self.vpcs[0].pk})
+        self.assertEqual(response.data["missing"], ["vpc-00000009"])
+
+    def test_view_permission(self):
+        # Looking up by POST needs only view permission, and is limited to the objects it allows
+        permission = ObjectPermission.objects.create(
+            name="View one account's VPCs", actions=["view"], constraints={"owner_account": self.account.pk}
+        )
+        permission.users.add(self.user)
+        permission.object_types.add(ObjectType.objects.get_for_model(AWSVPC))
+        self.client.force_login(self.user)
+
+        response = self.client.post(f"{self.url}?map=true", ["vpc-00000001", "vpc-00000004"], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data["results"]), ["vpc-00000001"])
+        self.assertEqual(response.data["missing"], ["vpc-00000004"])
+
+    def test_invalid(self):
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.client.post(self.url, {"aws_ids": "vpc-00000001"}, format="json").status_code, 400)
+        with self.settings(PLUGINS_CONFIG={"netbox_aws_vpc_plugin": {"lookup_max_ids": 1}}):
+            response = self.client.post(self.url, ["vpc-00000001", "vpc-00000002"], format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class IncludeTestCase(QueryCountTestMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="includesuperuser",
+            email="includesuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="999999999999", name="Include Account")
+        cls.vpc = create_test_vpcs(cls.account, 1, 1)[0]
+        create_test_subnets(cls.vpc, 1, 3)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.vpc_url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list")
+        self.account_url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsaccount-list")
+
+    def test_vpc_subnets(self):
+        response = self.client.get(f"{self.vpc_url}{self.vpc.pk}/?include=subnets")
+        self.assertEqual(response.status_code, 200)
+        subnets = response.data["subnets"]
+        self.assertEqual([subnet["subnet_id"] for subnet in subnets], sorted(subnet["subnet_id"] for subnet in subnets))
+        self.assertEqual(set(subnets[0]), {"id", "url", "display", "subnet_id"})
+
+        self.assertNotIn("subnets", self.client.get(f"{self.vpc_url}{self.vpc.pk}/").data)
+
+    def test_constant_queries(self):
+        self.assertConstantQueries(
+            f"{self.vpc_url}?include=subnets&limit=100",
+            lambda: [create_test_subnets(vpc, 1, 2) for vpc in create_test_vpcs(self.account, 2, 5)],
+        )
+
+    def test_account_vpcs_and_subnets(self):
+        with self.settings(PLUGINS_CONFIG={"netbox_aws_vpc_plugin": {"api_include_max_objects": 2}}):
+            response = self.client.get(f"{self.account_url}{self.account.pk}/?include=vpcs,subnets")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([vpc["vpc_id"] for vpc in response.data["vpcs"]], [self.vpc.vpc_id])
+        self.assertEqual(len(response.data["subnets"]), 2)
+        self.assertEqual(response.data["subnet_count"], 3)
+
+    def test_unknown(self):
+        self.assertEqual(self.client.get(f"{self.vpc_url}?include=vpcs").status_code, 400)
+
+
+class SparseFieldsTestCase(QueryCountTestMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="sparsesuperuser",
+            email="sparsesuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="101010101010", name="Sparse Account")
+        create_test_vpcs(cls.account, 1, 3)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list")
+
+    def test_fields(self):
+        response = self.client.get(f"{self.url}?fields=id,vpc_id,owner_account")
+        self.assertEqual(set(response.data["results"][0]), {"id", "vpc_id", "owner_account"})
+        self.assertEqual(response.data["results"][0]["owner_account"]["account_id"], "101010101010")
+
+    def test_fewer_queries(self):
+        full = self.count_queries(f"{self.url}?limit=100")
+        sparse = self.count_queries(f"{self.url}?limit=100&fields=id,vpc_id")
+        # No secondary CIDR, IPv6 CIDR or tag prefetches
+        self.assertLessEqual(sparse, full - 3)
+
+        self.assertConstantQueries(
+            f"{self.url}?limit=100&fields=id,vpc_id,vpc_cidr,owner_account",
+            lambda: create_test_vpcs(self.account, 4, 10),
+        )
+
+    def test_brief(self):
+        response = self.client.get(f"{self.url}?brief=true")
+        self.assertEqual(set(response.data["results"][0]), {"id", "url", "display", "vpc_id"})
+
+    def test_ordering_by_annotation(self):
+        response = self.client.get(f"{self.url}?fields=id,vpc_id&ordering=-ipv4_utilization")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 3)
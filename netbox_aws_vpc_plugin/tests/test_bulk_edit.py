@@ -0,0 +1,143 @@
+"""Tests for the set-based bulk edit and bulk delete views."""
+
+from core.models import ObjectChange
+from dcim.models import Region
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from extras.models import Tag
+from utilities.testing import TestCase
+
+from netbox_aws_vpc_plugin.choices import AWSSubnetStatusChoices
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+from .utils import create_test_subnets, create_test_vpcs
+
+
+class BulkEditTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="bulkeditsuperuser",
+            email="bulkeditsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="212121212121", name="Bulk Edit Account")
+        cls.other_account = AWSAccount.objects.create(account_id="212121212122", name="Other Bulk Edit Account")
+        cls.region = Region.objects.create(name="EU West 1", slug="eu-west-1")
+        cls.tag = Tag.objects.create(name="Decommission", slug="decommission")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.vpc = create_test_vpcs(self.account, 1, 1)[0]
+
+    def edit(self, model, pks, **data):
+        url = reverse(f"plugins:netbox_aws_vpc_plugin:{model}_bulk_edit")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, {"pk": pks, "_apply": True, **data})
+        self.assertEqual(response.status_code, 302)
+        return len(context)
+
+    def test_edit_subnets(self):
+        subnets = create_test_subnets(self.vpc, 1, 3)
+        pks = [subnet.pk for subnet in subnets]
+        self.edit(
+            "awssubnet",
+            pks,
+            status=AWSSubnetStatusChoices.STATUS_INACTIVE,
+            region=self.region.pk,
+            add_tags=[self.tag.pk],
+        )
+
+        for subnet in AWSSubnet.objects.filter(pk__in=pks):
+            self.assertEqual(subnet.status, AWSSubnetStatusChoices.STATUS_INACTIVE)
+            self.assertEqual(subnet.region, self.region)
+            self.assertEqual(list(subnet.tags.all()), [self.tag])
+
+        changes = ObjectChange.objects.filter(changed_object_id__in=pks, action="update")
+        self.assertEqual(changes.count(), 3)
+        change = changes.first()
+        self.assertEqual(change.prechange_data["status"], AWSSubnetStatusChoices.STATUS_ACTIVE)
+        self.assertEqual(change.postchange_data["status"], AWSSubnetStatusChoices.STATUS_INACTIVE)
+        self.assertEqual(change.postchange_data["tags"], ["Decommission"])
+
+        # Nullify the region and remove the tag again
+        self.edit("awssubnet", pks, _nullify=["region"], remove_tags=[self.tag.pk])
+        self.assertFalse(AWSSubnet.objects.filter(pk__in=pks, region__isnull=False).exists())
+        self.assertFalse(AWSSubnet.objects.filter(pk__in=pks, tags__isnull=False).exists())
+
+    def test_move_rollups(self):
+        subnets = create_test_subnets(self.vpc, 1, 2)
+        self.edit("awsvpc", [self.vpc.pk], owner_account=self.other_account.pk)
+        self.edit("awssubnet", [subnet.pk for subnet in subnets], owner_account=self.other_account.pk)
+
+        self.account.refresh_from_db()
+        self.other_account.refresh_from_db()
+        self.assertEqual((self.account.vpc_count, self.account.subnet_count), (0, 0))
+        self.assertEqual((self.other_account.vpc_count, self.other_account.subnet_count), (1, 2))
+        self.assertEqual(self.other_account.allocated_ipv4_addresses, 2 * 256)
+
+    def test_constant_queries(self):
+        subnets = create_test_subnets(self.vpc, 1, 30)
+        pks = [subnet.pk for subnet in subnets]
+        # Warm up any per-process caches before measuring
+        self.edit("awssubnet", pks[:1], status=AWSSubnetStatusChoices.STATUS_INACTIVE)
+
+        few = self.edit("awssubnet", pks[:2], region=self.region.pk, add_tags=[self.tag.pk])
+        many = self.edit("awssubnet", pks, region=self.region.pk, add_tags=[self.tag.pk])
+        self.assertEqual(many, few)
+
+    def test_edit_accounts(self):
+        self.edit("awsaccount", [self.account.pk, self.other_account.pk], description="Legacy estate")
+        self.assertEqual(set(AWSAccount.objects.values_list("description", flat=True)), {"Legacy estate"})
+
+    def test_delete(self):
+        subnets = create_test_subnets(self.vpc, 1, 3)
+        url = reverse("plugins:netbox_aws_vpc_plugin:awssubnet_bulk_delete")
+        response = self.client.post(
+            url, {"pk": [subnet.pk for subnet in subnets[:2]], "confirm": True, "_confirm": True}
+        )
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(list(AWSSubnet.objects.filter(vpc=self.vpc)), [subnets[2]])
+        self.assertEqual(ObjectChange.objects.filter(action="delete", changed_object_id__in=[subnets[0].pk]).count(), 1)
+        # The rollups are refreshed once all of the subnets are gone
+        self.vpc.refresh_from_db()
+        self.account.refresh_from_db()
+        self.assertEqual(self.vpc.subnet_count, 1)
+        self.assertEqual(self.account.subnet_count, 1)
+
+    def test_delete_vpcs(self):
+        subnets = create_test_subnets(self.vpc, 1, 2)
+        url = reverse("plugins:netbox_aws_vpc_plugin:awsvpc_bulk_delete")
+        response = self.client.post(url, {"pk": [self.vpc.pk], "confirm": True, "_confirm": True})
+        self.assertEqual(response.status_code, 302)
+
+        self.assertFalse(AWSVPC.objects.exists())
+        self.account.refresh_from_db()
+        self.assertEqual(
+            (self.account.vpc_count, self.account.subnet_count, self.account.ipv4_address_space), (0, 0, 0)
+        )
+        # One change log entry for the VPC and for each of the subnets deleted along with it
+        changes = ObjectChange.objects.filter(action="delete")
+        self.assertEqual(
+            sorted(changes.values_list("object_repr", flat=True)),
+            sorted([str(self.vpc), *(str(subnet) for subnet in subnets)]),
+        )
+        self.assertEqual(changes.get(changed_object_id=self.vpc.pk).prechange_data["vpc_id"], self.vpc.vpc_id)
+
+    def test_delete_protected(self):
+        url = reverse("plugins:netbox_aws_vpc_plugin:awsaccount_bulk_delete")
+        response = self.client.post(
+            url, {"pk": [self.account.pk, self.other_account.pk], "confirm": True, "_confirm": True}
+        )
+        self.assertEqual(response.status_code, 302)
+
+        # The account still owning a VPC protects the whole selection
+        self.assertEqual(AWSAccount.objects.count(), 2)
+        self.assertFalse(ObjectChange.objects.filter(action="delete").exists())
@@ -0,0 +1,134 @@
+"""Tests for the batched bulk import views."""
+
+import json
+
+from core.models import ObjectChange
+from dcim.models import Region
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from extras.models import Tag
+from ipam.models import Prefix
+from utilities.testing import TestCase
+
+from netbox_aws_vpc_plugin.choices import AWSSubnetStatusChoices
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+
+def subnet_csv(start, count, vpc_id="vpc-import1"):
+    lines = ["subnet_id,vpc,subnet_cidr,owner_account,region,status,tags"]
+    for i in range(start, start + count):
+        lines.append(f"subnet-import{i:04x},{vpc_id},10.20.{i}.0/24,202020202020,us-east-1,ACTIVE,alpha")
+    return "\n".join(lines)
+
+
+class BulkImportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="importsuperuser",
+            email="importsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="202020202020", name="Import Account")
+        cls.vpc = AWSVPC.objects.create(
+            vpc_id="vpc-import1", owner_account=cls.account, vpc_cidr=Prefix.objects.create(prefix="10.20.0.0/16")
+        )
+        Region.objects.create(name="US East 1", slug="us-east-1")
+        Tag.objects.create(name="Alpha", slug="alpha")
+        for i in range(0, 40):
+            Prefix.objects.create(prefix=f"10.20.{i}.0/24")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def post(self, model, data, data_format="csv"):
+        url = reverse(f"plugins:netbox_aws_vpc_plugin:{model}_bulk_import")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, {"data": data, "format": data_format, "csv_delimiter": ","})
+        return response, len(context)
+
+    def test_import_subnets(self):
+        response, _ = self.post("awssubnet", subnet_csv(1, 3))
+        self.assertEqual(response.status_code, 302)
+
+        subnets = AWSSubnet.objects.filter(vpc=self.vpc).order_by("subnet_id")
+        self.assertEqual(subnets.count(), 3)
+        subnet = subnets.first()
+        self.assertEqual(str(subnet.subnet_cidr.prefix), "10.20.1.0/24")
+        self.assertEqual(subnet.owner_account, self.account)
+        self.assertEqual(subnet.region.slug, "us-east-1")
+        self.assertEqual(subnet.status, AWSSubnetStatusChoices.STATUS_ACTIVE)
+        self.assertEqual([tag.slug for tag in subnet.tags.all()], ["alpha"])
+
+        # Everything saving the subnets one at a time would have written
+        self.assertEqual(ObjectChange.objects.filter(changed_object_id__in=subnets.values("pk")).count(), 3)
+        self.vpc.refresh_from_db()
+        self.assertEqual(self.vpc.subnet_count, 3)
+        self.assertEqual(self.vpc.allocated_ipv4_addresses, 3 * 256)
+
+    def test_constant_queries(self):
+        # Warm up any per-process caches before measuring
+        self.post("awssubnet", subnet_csv(1, 1))
+        _, few = self.post("awssubnet", subnet_csv(2, 2))
+        _, many = self.post("awssubnet", subnet_csv(4, 30))
+        self.assertEqual(many, few)
+        self.assertEqual(AWSSubnet.objects.count(), 33)
+
+    def test_row_errors(self):
+        data = "\n".join(
+            (
+                "subnet_id,vpc,subnet_cidr",
+                "subnet-good,vpc-import1,10.20.1.0/24",
+                "subnet-novpc,vpc-missing,10.20.2.0/24",
+                "subnet-badcidr,vpc-import1,10.20.3.1/24",
+                "subnet-good,vpc-import1,10.20.4.0/24",
+            )
+        )
+        response, _ = self.post("awssubnet", data)
+        self.assertEqual(response.status_code, 200)
+        errors = "\n".join(response.context["form"].non_field_errors())
+        self.assertIn("Record 2 vpc: Object not found: vpc-missing", errors)
+        self.assertIn("Record 3 subnet_cidr: 10.20.3.1/24 is not a network address", errors)
+        self.assertIn("Record 4 subnet_id:", errors)
+        self.assertNotIn("Record 1", errors)
+        self.assertFalse(AWSSubnet.objects.exists())
+
+    def test_import_vpcs(self):
+        Prefix.objects.create(prefix="100.64.0.0/16")
+        Prefix.objects.create(prefix="2600:1f18:20::/56")
+        data = [
+            {
+                "vpc_id": "vpc-import2",
+                "vpc_cidr": "10.20.30.0/24",
+                "vpc_secondary_ipv4_cidrs": ["100.64.0.0/16"],
+                "vpc_ipv6_cidrs": "2600:1f18:20::/56",
+                "owner_account": "202020202020",
+            },
+            # An IPv6 prefix is not a valid primary CIDR
+            {"vpc_id": "vpc-import3", "vpc_cidr": "2600:1f18:20::/56"},
+        ]
+        response, _ = self.post("awsvpc", json.dumps(data), data_format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Record 2 vpc_cidr:", "\n".join(response.context["form"].non_field_errors()))
+
+        response, _ = self.post("awsvpc", json.dumps(data[:1]), data_format="json")
+        self.assertEqual(response.status_code, 302)
+        vpc = AWSVPC.objects.get(vpc_id="vpc-import2")
+        self.assertEqual([str(prefix) for prefix in vpc.vpc_secondary_ipv4_cidrs.all()], ["100.64.0.0/16"])
+        self.assertEqual([str(prefix) for prefix in vpc.vpc_ipv6_cidrs.all()], ["2600:1f18:20::/56"])
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.vpc_count, 2)
+        self.assertEqual(self.account.ipv4_address_space, 2**16 + 256 + 2**16)
+
+    def test_update_by_id(self):
+        account = AWSAccount.objects.create(account_id="202020202021", name="Old Name")
+        response, _ = self.post("awsaccount", f"id,name\n{account.pk},New Name")
+        self.assertEqual(response.status_code, 302)
+        account.refresh_from_db()
+        self.assertEqual(account.name, "New Name")
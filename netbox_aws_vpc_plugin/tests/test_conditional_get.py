@@ -0,0 +1,107 @@
+"""Tests for ETag and Last-Modified conditional GET support in the REST API."""
+
+from dcim.models import Region
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+from .utils import create_test_vpcs
+
+
+class ConditionalGetTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="etagsuperuser",
+            email="etagsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="232323232323", name="ETag Account")
+        create_test_vpcs(cls.account, 1, 3)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list")
+
+    def test_list_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        # Other filters are validated separately
+        response = self.client.get(f"{self.url}?vpc_id=vpc-00000001", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AWSVPC.objects.get(vpc_id="vpc-00000002").save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            AWSVPC.objects.get(vpc_id="vpc-00000003").delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 2)
+
+    def test_list_related_modified(self):
+        region = Region.objects.create(name="US East 1", slug="us-east-1")
+        with self.captureOnCommitCallbacks(execute=True):
+            AWSVPC.objects.filter(vpc_id="vpc-00000001").update(region=region)
+        etag = self.client.get(self.url)["ETag"]
+
+        # Renaming the region changes the nested representation, but not the VPC itself
+        with self.captureOnCommitCallbacks(execute=True):
+            region.name = "US East (N. Virginia)"
+            region.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn(
+            "US East (N. Virginia)", [vpc["region"] and vpc["region"]["name"] for vpc in response.json()["results"]]
+        )
+
+    def test_detail_if_modified_since(self):
+        vpc = AWSVPC.objects.get(vpc_id="vpc-00000001")
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-detail", kwargs={"pk": vpc.pk})
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+
+        # Only the ETag is trusted to tell that nothing changed
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_list_deleted(self):
+        response = self.client.get(self.url)
+
+        # Deleting the most recently updated VPC moves max(last_updated) backwards
+        with self.captureOnCommitCallbacks(execute=True):
+            AWSVPC.objects.order_by("-last_updated").first().delete()
+        for headers in (
+            {"HTTP_IF_NONE_MATCH": response["ETag"]},
+            {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+        ):
+            modified = self.client.get(self.url, **headers)
+            self.assertEqual(modified.status_code, 200)
+            self.assertNotEqual(modified["ETag"], response["ETag"])
+            self.assertEqual(modified.json()["count"], 2)
+
+    def test_detail_not_found(self):
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-detail", kwargs={"pk": 0})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH="*").status_code, 404)
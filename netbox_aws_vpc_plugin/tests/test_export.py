@@ -0,0 +1,152 @@
+"""Tests for the streaming NDJSON and CSV exports."""
+
+import csv
+import gzip
+import io
+import json
+
+from dcim.models import Region
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from extras.models import Tag
+from tenancy.models import Tenant
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin import forms
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+
+from .utils import create_test_subnets, create_test_vpcs
+
+
+class ExportTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="exportsuperuser",
+            email="exportsuperuser@example.com",
+            password="supersecret",
+        )
+        tenant = Tenant.objects.create(name="Export Tenant", slug="export-tenant")
+        cls.account = AWSAccount.objects.create(account_id="191919191919", name="Export Account", tenant=tenant)
+        cls.other_account = AWSAccount.objects.create(account_id="191919191910", name="Other Export Account")
+        cls.vpcs = create_test_vpcs(cls.account, 1, 3)
+        create_test_vpcs(cls.other_account, 4, 1)
+        create_test_subnets(cls.vpcs[0], 1, 2)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def export(self, model, params=""):
+        response = self.client.get(f"{reverse(f'plugins-api:netbox_aws_vpc_plugin-api:{model}-list')}export/?{params}")
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
+        if response.get("Content-Encoding") == "gzip":
+            content = gzip.decompress(content)
+        return response, content.decode()
+
+    def reimport(self, model, import_form, content):
+        """
+        Feed the importable columns of a CSV export back through the bulk import view.
+        """
+        rows = list(csv.DictReader(io.StringIO(content)))
+        # Not the primary keys, which would update the deleted objects
+        names = [name for name in rows[0] if name in import_form.base_fields and name != "id"]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, names, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+        response = self.client.post(
+            reverse(f"plugins:netbox_aws_vpc_plugin:{model}_bulk_import"),
+            {"data": buffer.getvalue(), "format": "csv", "csv_delimiter": ","},
+        )
+        self.assertEqual(response.status_code, 302)
+        return names
+
+    def assertRowsEqual(self, before, after, names):
+        before = list(csv.DictReader(io.StringIO(before)))
+        after = list(csv.DictReader(io.StringIO(after)))
+        self.assertEqual(
+            [{name: row[name] for name in names} for row in after],
+            [{name: row[name] for name in names} for row in before],
+        )
+
+    def test_round_trip(self):
+        # A region whose name is not its slug, and a tag, on the VPC and its subnets
+        region = Region.objects.create(name="US East (N. Virginia)", slug="us-east-1")
+        tag = Tag.objects.create(name="Round Trip", slug="round-trip")
+        vpc = self.vpcs[0]
+        vpc.region = region
+        vpc.save()
+        vpc.tags.add(tag)
+        for subnet in AWSSubnet.objects.filter(vpc=vpc):
+            subnet.region = region
+            subnet.save()
+            subnet.tags.add(tag)
+        account = AWSAccount.objects.create(
+            account_id="191919191911", name="Round Trip Account", tenant=Tenant.objects.get(name="Export Tenant")
+        )
+
+        _, vpcs = self.export("awsvpc", f"output=csv&vpc_id={vpc.vpc_id}")
+        _, subnets = self.export("awssubnet", f"output=csv&region={region.pk}")
+        _, accounts = self.export("awsaccount", f"output=csv&account_id={account.account_id}")
+        self.assertIn("us-east-1", vpcs)
+        self.assertIn("Export Tenant", accounts)
+
+        AWSSubnet.objects.filter(vpc=vpc).delete()
+        vpc.delete()
+        account.delete()
+        vpc_names = self.reimport("awsvpc", forms.AWSVPCImportForm, vpcs)
+        subnet_names = self.reimport("awssubnet", forms.AWSSubnetImportForm, subnets)
+        account_names = self.reimport("awsaccount", forms.AWSAccountImportForm, accounts)
+
+        # Every importable column comes back as it was exported
+        self.assertRowsEqual(vpcs, self.export("awsvpc", f"output=csv&vpc_id={vpc.vpc_id}")[1], vpc_names)
+        self.assertRowsEqual(subnets, self.export("awssubnet", f"output=csv&region={region.pk}")[1], subnet_names)
+        self.assertRowsEqual(
+            accounts, self.export("awsaccount", f"output=csv&account_id={account.account_id}")[1], account_names
+        )
+        self.assertIn("region", vpc_names)
+        self.assertIn("region", subnet_names)
+        self.assertIn("tenant", account_names)
+
+    def test_ndjson(self):
+        response, content = self.export("awsvpc", f"owner_account_id={self.account.pk}")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row["vpc_id"] for row in rows], [vpc.vpc_id for vpc in self.vpcs])
+        self.assertEqual(rows[0]["vpc_cidr"], "10.1.0.0/16")
+        self.assertEqual(rows[0]["vpc_secondary_ipv4_cidrs"], ["100.1.0.0/16"])
+        self.assertEqual(rows[0]["owner_account"], "191919191919")
+        self.assertEqual(rows[0]["tags"], [])
+
+    def test_csv(self):
+        _, content = self.export("awssubnet", "output=csv")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["vpc"], self.vpcs[0].vpc_id)
+        self.assertEqual(rows[0]["subnet_cidr"], "10.0.1.0/24")
+        self.assertEqual(rows[0]["region"], "")
+
+    def test_gzip(self):
+        response, content = self.export("awsaccount", "output=csv&gzip=true")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual({row["account_id"] for row in rows}, {"191919191919", "191919191910"})
+        self.assertEqual({row["tenant"] for row in rows}, {"Export Tenant", ""})
+
+    def test_empty(self):
+        _, content = self.export("awsvpc", "output=csv&vpc_id=vpc-missing")
+        self.assertEqual(content.splitlines()[0].split(",")[:2], ["id", "vpc_id"])
+        self.assertEqual(len(content.splitlines()), 1)
+
+    def test_invalid_format(self):
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list")
+        self.assertEqual(self.client.get(f"{url}export/?output=xml").status_code, 400)
+
+    def test_permissions(self):
+        self.client.force_login(self.user)
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list")
+        self.assertEqual(self.client.get(f"{url}export/").status_code, 403)
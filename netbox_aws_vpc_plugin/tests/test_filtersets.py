@@ -0,0 +1,128 @@
+"""Tests for the `netbox_aws_vpc_plugin` filtersets."""
+
+from django.test import TestCase
+from ipam.models import Prefix
+from tenancy.models import Tenant
+
+from netbox_aws_vpc_plugin.choices import AWSAccountStatusChoices, AWSSubnetStatusChoices, AWSVPCStatusChoices
+from netbox_aws_vpc_plugin.filtersets import AWSAccountFilterSet, AWSSubnetFilterSet, AWSVPCFilterSet
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+
+class CIDRContainmentFilterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account = AWSAccount.objects.create(account_id="141414141414", name="Containment Account")
+        cls.vpcs = (
+            AWSVPC.objects.create(
+                vpc_id="vpc-contain1", owner_account=account, vpc_cidr=Prefix.objects.create(prefix="10.1.0.0/16")
+            ),
+            AWSVPC.objects.create(
+                vpc_id="vpc-contain2", owner_account=account, vpc_cidr=Prefix.objects.create(prefix="10.2.0.0/16")
+            ),
+        )
+        cls.vpcs[1].vpc_secondary_ipv4_cidrs.add(
+            Prefix.objects.create(prefix="100.64.0.0/20"), Prefix.objects.create(prefix="100.64.16.0/20")
+        )
+        cls.vpcs[1].vpc_ipv6_cidrs.add(Prefix.objects.create(prefix="2600:1f18:aa00::/56"))
+        cls.subnets = (
+            AWSSubnet.objects.create(
+                subnet_id="subnet-contain1", vpc=cls.vpcs[0], subnet_cidr=Prefix.objects.create(prefix="10.1.1.0/24")
+            ),
+            AWSSubnet.objects.create(
+                subnet_id="subnet-contain2",
+                vpc=cls.vpcs[1],
+                subnet_cidr=Prefix.objects.create(prefix="100.64.16.0/24"),
+                subnet_ipv6_cidr=Prefix.objects.create(prefix="2600:1f18:aa00:1::/64"),
+            ),
+        )
+
+    def filter_vpcs(self, **params):
+        return list(AWSVPCFilterSet(params, AWSVPC.objects.all()).qs)
+
+    def filter_subnets(self, **params):
+        return list(AWSSubnetFilterSet(params, AWSSubnet.objects.all()).qs)
+
+    def test_vpc_contains(self):
+        self.assertEqual(self.filter_vpcs(contains="10.1.7.19"), [self.vpcs[0]])
+        self.assertEqual(self.filter_vpcs(contains="100.64.17.0/24"), [self.vpcs[1]])
+        self.assertEqual(self.filter_vpcs(contains="2600:1f18:aa00:ff::1"), [self.vpcs[1]])
+        self.assertEqual(self.filter_vpcs(contains="192.0.2.1"), [])
+        self.assertEqual(self.filter_vpcs(contains="not-an-ip"), [])
+
+    def test_vpc_within(self):
+        # Matched through both secondary CIDRs, but returned once
+        self.assertEqual(self.filter_vpcs(within="100.64.0.0/16"), [self.vpcs[1]])
+        self.assertEqual(self.filter_vpcs(within="10.1.0.0/16"), [])
+        self.assertEqual(self.filter_vpcs(within_include="10.1.0.0/16"), [self.vpcs[0]])
+        self.assertEqual(self.filter_vpcs(within_include="10.0.0.0/8"), list(self.vpcs))
+
+    def test_subnet_contains(self):
+        self.assertEqual(self.filter_subnets(contains="10.1.1.200"), [self.subnets[0]])
+        self.assertEqual(self.filter_subnets(contains="100.64.16.0/25"), [self.subnets[1]])
+        self.assertEqual(self.filter_subnets(contains="2600:1f18:aa00:1::42"), [self.subnets[1]])
+        self.assertEqual(self.filter_subnets(contains="10.1.2.1"), [])
+
+    def test_subnet_within(self):
+        self.assertEqual(self.filter_subnets(within="10.1.0.0/16"), [self.subnets[0]])
+        self.assertEqual(self.filter_subnets(within="2600:1f18:aa00::/56"), [self.subnets[1]])
+        self.assertEqual(self.filter_subnets(within_include="10.1.1.0/24"), [self.subnets[0]])
+
+
+class OwnerAccountFilterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Filter Tenant", slug="filter-tenant")
+        cls.accounts = (
+            AWSAccount.objects.create(account_id="151515151515", name="Filter Account", tenant=cls.tenant),
+            AWSAccount.objects.create(
+                account_id="151515151516", name="Other Filter Account", status=AWSAccountStatusChoices.STATUS_INACTIVE
+            ),
+        )
+        cls.vpcs = (
+            AWSVPC.objects.create(vpc_id="vpc-filter1", owner_account=cls.accounts[0]),
+            AWSVPC.objects.create(
+                vpc_id="vpc-filter2", owner_account=cls.accounts[1], status=AWSVPCStatusChoices.STATUS_INACTIVE
+            ),
+        )
+        cls.subnets = (
+            AWSSubnet.objects.create(subnet_id="subnet-filter1", vpc=cls.vpcs[0], owner_account=cls.accounts[0]),
+            AWSSubnet.objects.create(
+                subnet_id="subnet-filter2",
+                vpc=cls.vpcs[1],
+                owner_account=cls.accounts[1],
+                status=AWSSubnetStatusChoices.STATUS_INACTIVE,
+            ),
+        )
+
+    def filter(self, filterset, **params):
+        return list(filterset(params, filterset.Meta.model.objects.order_by("pk")).qs)
+
+    def test_account_id(self):
+        self.assertEqual(self.filter(AWSVPCFilterSet, account_id=["151515151516"]), [self.vpcs[1]])
+        self.assertEqual(self.filter(AWSSubnetFilterSet, account_id=["151515151515"]), [self.subnets[0]])
+        self.assertEqual(self.filter(AWSSubnetFilterSet, account_id=["000000000000"]), [])
+
+    def test_tenant(self):
+        self.assertEqual(self.filter(AWSVPCFilterSet, tenant_id=[self.tenant.pk]), [self.vpcs[0]])
+        self.assertEqual(self.filter(AWSSubnetFilterSet, tenant=[self.tenant.slug]), [self.subnets[0]])
+        self.assertEqual(self.filter(AWSAccountFilterSet, tenant_id=[self.tenant.pk]), [self.accounts[0]])
+
+    def test_status(self):
+        self.assertEqual(
+            self.filter(AWSVPCFilterSet, status=[AWSVPCStatusChoices.STATUS_INACTIVE]),
+            [self.vpcs[1]],
+        )
+        self.assertEqual(
+            self.filter(
+                AWSSubnetFilterSet,
+                status=[AWSSubnetStatusChoices.STATUS_ACTIVE, AWSSubnetStatusChoices.STATUS_INACTIVE],
+            ),
+            list(self.subnets),
+        )
+        self.assertEqual(
+            self.filter(AWSAccountFilterSet, status=[AWSAccountStatusChoices.STATUS_ACTIVE]),
+            [self.accounts[0]],
+        )
@@ -0,0 +1,148 @@
+"""Tests for the `netbox_aws_vpc_plugin` GraphQL types."""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tenancy.models import Tenant
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+
+from .utils import create_test_subnets, create_test_vpcs
+
+SUBNET_QUERY = """
+{
+  aws_subnet_list {
+    subnet_id
+    subnet_cidr { prefix }
+    subnet_ipv6_cidr { prefix }
+    vpc { vpc_id owner_account { account_id tenant { name } } }
+    region { name }
+  }
+}
+"""
+
+VPC_QUERY = """
+{
+  aws_vpc_list {
+    vpc_id
+    vpc_cidr { prefix }
+    vpc_secondary_ipv4_cidrs { prefix }
+    vpc_ipv6_cidrs { prefix }
+    owner_account { account_id tenant { name } }
+  }
+}
+"""
+
+
+class GraphQLTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="graphqlsuperuser",
+            email="graphqlsuperuser@example.com",
+            password="supersecret",
+        )
+        tenant = Tenant.objects.create(name="GraphQL Tenant", slug="graphql-tenant")
+        cls.account = AWSAccount.objects.create(account_id="181818181818", name="GraphQL Account", tenant=tenant)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def query(self, query):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                reverse("graphql"), data=json.dumps({"query": query}), content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context)
+
+    def assertConstantQueries(self, query, grow):
+        # Warm up any per-process caches before measuring
+        self.query(query)
+        data, before = self.query(query)
+        self.assertNotIn("errors", data)
+        grow()
+        data, after = self.query(query)
+        self.assertNotIn("errors", data)
+        self.assertEqual(after, before)
+        return data
+
+    def test_nested_subnet_query(self):
+        vpc = create_test_vpcs(self.account, 1, 1)[0]
+        create_test_subnets(vpc, 1, 2)
+
+        data = self.assertConstantQueries(SUBNET_QUERY, lambda: create_test_subnets(vpc, 3, 10))
+        subnets = data["data"]["aws_subnet_list"]
+        self.assertEqual(len(subnets), 12)
+        self.assertEqual(subnets[0]["vpc"]["owner_account"]["tenant"]["name"], "GraphQL Tenant")
+
+    def test_nested_vpc_query(self):
+        create_test_vpcs(self.account, 1, 2)
+
+        data = self.assertConstantQueries(VPC_QUERY, lambda: create_test_vpcs(self.account, 3, 10))
+        vpcs = data["data"]["aws_vpc_list"]
+        self.assertEqual(len(vpcs), 12)
+        self.assertEqual(len(vpcs[0]["vpc_secondary_ipv4_cidrs"]), 1)
+
+    def test_pagination(self):
+        vpcs = create_test_vpcs(self.account, 1, 5)
+
+        data, _ = self.query("{ aws_vpc_list(pagination: {offset: 1, limit: 2}) { vpc_id } }")
+        self.assertEqual([vpc["vpc_id"] for vpc in data["data"]["aws_vpc_list"]], [vpcs[1].vpc_id, vpcs[2].vpc_id])
+
+        # Cursor pagination continues after the last ID received, in ID order
+        data, _ = self.query(f"{{ aws_vpc_list(after: {vpcs[2].pk}, pagination: {{limit: 10}}) {{ id }} }}")
+        self.assertEqual([int(vpc["id"]) for vpc in data["data"]["aws_vpc_list"]], [vpcs[3].pk, vpcs[4].pk])
+
+        # A cursor only works in ID order, so any other ordering is rejected
+        data, _ = self.query(
+            f"{{ aws_vpc_list(after: {vpcs[2].pk}, order: {{vpc_id: DESC}}, pagination: {{limit: 10}}) {{ id }} }}"
+        )
+        self.assertIn("errors", data)
+        self.assertIsNone(data.get("data"))
+
+    def test_reverse_relations(self):
+        vpc = create_test_vpcs(self.account, 1, 1)[0]
+        subnets = create_test_subnets(vpc, 1, 3)
+        query = """
+        {
+          aws_account_list {
+            account_id
+            vpcs { vpc_id subnets(pagination: {limit: 2}) { subnet_id } }
+            subnets { subnet_id }
+          }
+        }
+        """
+
+        def grow():
+            for other in create_test_vpcs(self.account, 2, 5):
+                create_test_subnets(other, 1, 3)
+
+        data, _ = self.query(query)
+        self.assertNotIn("errors", data)
+        account = data["data"]["aws_account_list"][0]
+        self.assertEqual(account["vpcs"][0]["subnets"], [{"subnet_id": subnet.subnet_id} for subnet in subnets[:2]])
+        self.assertEqual(len(account["subnets"]), 3)
+
+        # Every page of subnets is prefetched in one query, however many VPCs there are
+        self.assertConstantQueries(query, grow)
+
+    @override_settings(PLUGINS_CONFIG={"netbox_aws_vpc_plugin": {"graphql_max_depth": 3}})
+    def test_depth_limit(self):
+        data, _ = self.query("{ aws_vpc_list { vpc_id owner_account { account_id } } }")
+        self.assertNotIn("errors", data)
+
+        data, _ = self.query(SUBNET_QUERY)
+        self.assertIn("exceeds the maximum of 3", data["errors"][0]["message"])
+
+    @override_settings(PLUGINS_CONFIG={"netbox_aws_vpc_plugin": {"graphql_max_complexity": 5}})
+    def test_complexity_limit(self):
+        data, _ = self.query(VPC_QUERY)
+        self.assertIn("complexity", data["errors"][0]["message"])
@@ -0,0 +1,61 @@
+"""Tests for the plugin's composite database indexes."""
+
+from dcim.models import Region
+from django.db import connection
+from django.test import TestCase
+
+from netbox_aws_vpc_plugin.choices import AWSSubnetStatusChoices, AWSVPCStatusChoices
+from netbox_aws_vpc_plugin.filtersets import AWSSubnetFilterSet, AWSVPCFilterSet
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+
+class CompositeIndexTestCase(TestCase):
+    """
+    The test dataset is far too small for the planner to prefer an index on its own, so
+    sequential scans are disabled to check which index it picks for the filter combination.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = AWSAccount.objects.create(account_id="131313131313", name="Index Account")
+        cls.region = Region.objects.create(name="Index Region", slug="index-region")
+        vpc_statuses = [choice[0] for choice in AWSVPCStatusChoices.CHOICES]
+        subnet_statuses = [choice[0] for choice in AWSSubnetStatusChoices.CHOICES]
+        cls.vpcs = AWSVPC.objects.bulk_create(
+            AWSVPC(vpc_id=f"vpc-idx{i:04d}", owner_account=cls.account, region=cls.region, status=vpc_statuses[i % 3])
+            for i in range(30)
+        )
+        AWSSubnet.objects.bulk_create(
+            AWSSubnet(subnet_id=f"subnet-idx{i:05d}", vpc=cls.vpcs[i % 30], status=subnet_statuses[i % 3])
+            for i in range(600)
+        )
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE netbox_aws_vpc_plugin_awsvpc, netbox_aws_vpc_plugin_awssubnet")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def test_subnet_vpc_status_index(self):
+        queryset = AWSSubnetFilterSet(
+            {"vpc": [self.vpcs[0].pk], "status": [AWSSubnetStatusChoices.STATUS_ACTIVE]},
+            AWSSubnet.objects.all(),
+        ).qs
+        self.assertIn("awssubnet_vpc_status", queryset.explain())
+
+    def test_vpc_owner_region_status_index(self):
+        queryset = AWSVPCFilterSet(
+            {
+                "owner_account": [self.account.pk],
+                "region": [self.region.pk],
+                "status": [AWSVPCStatusChoices.STATUS_ACTIVE],
+            },
+            AWSVPC.objects.all(),
+        ).qs
+        self.assertIn("awsvpc_owner_region_status", queryset.explain())
+
+    def test_foreign_keys_use_composite_indexes(self):
+        # The foreign keys leading the composite indexes have no index of their own
+        self.assertIn("awssubnet_vpc_status", AWSSubnet.objects.filter(vpc=self.vpcs[0]).explain())
+        self.assertIn("awsvpc_owner_region_status", AWSVPC.objects.filter(owner_account=self.account).explain())
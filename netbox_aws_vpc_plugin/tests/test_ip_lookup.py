@@ -0,0 +1,146 @@
+"""Tests for resolving IP addresses to AWS subnets, VPCs and accounts."""
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from ipam.models import Prefix
+from netaddr import IPNetwork
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.cache import bump_generation
+from netbox_aws_vpc_plugin.ip_lookup import get_matcher
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+from netbox_aws_vpc_plugin.prefix_matcher import PrefixMatcher
+
+
+class PrefixMatcherTestCase(SimpleTestCase):
+    def setUp(self):
+        self.matcher = PrefixMatcher()
+        for cidr in ("10.0.0.0/8", "10.1.0.0/16", "10.1.2.0/24", "0.0.0.0/0", "2600:1f18::/32", "2600:1f18:1::/48"):
+            self.matcher.add(IPNetwork(cidr), cidr)
+
+    def test_longest_match(self):
+        self.assertEqual(self.matcher.lookup("10.1.2.3"), (24, ["10.1.2.0/24"]))
+        self.assertEqual(self.matcher.lookup("10.1.3.3"), (16, ["10.1.0.0/16"]))
+        self.assertEqual(self.matcher.lookup("10.200.0.1"), (8, ["10.0.0.0/8"]))
+        self.assertEqual(self.matcher.lookup("192.0.2.1"), (0, ["0.0.0.0/0"]))
+        self.assertEqual(self.matcher.lookup("2600:1f18:1:ff::1"), (48, ["2600:1f18:1::/48"]))
+        self.assertEqual(self.matcher.lookup("2600:1f18:2::1"), (32, ["2600:1f18::/32"]))
+        self.assertEqual(self.matcher.lookup("2001:db8::1"), (None, []))
+
+    def test_host_bits_and_duplicates(self):
+        self.matcher.add(IPNetwork("10.1.2.77/24"), "duplicate")
+        self.assertEqual(self.matcher.lookup("10.1.2.3"), (24, ["10.1.2.0/24", "duplicate"]))
+        self.assertEqual(self.matcher.size, 7)
+
+    def test_invalid_address(self):
+        for address in ("not-an-ip", "10.1.2", "10.1.2.3/24", "2600:1f18::1::1"):
+            with self.assertRaises(ValueError):
+                self.matcher.lookup(address)
+
+
+class IPLookupAPITestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="lookupsuperuser",
+            email="lookupsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="151515151515", name="Lookup Account")
+        cls.other_account = AWSAccount.objects.create(account_id="151515151516", name="Other Lookup Account")
+        cls.vpc = AWSVPC.objects.create(
+            vpc_id="vpc-lookup1", owner_account=cls.account, vpc_cidr=Prefix.objects.create(prefix="10.1.0.0/16")
+        )
+        cls.vpc.vpc_ipv6_cidrs.add(Prefix.objects.create(prefix="2600:1f18:aa00::/56"))
+        # Overlaps the first VPC, as private ranges in different accounts often do
+        cls.other_vpc = AWSVPC.objects.create(
+            vpc_id="vpc-lookup2", owner_account=cls.other_account, vpc_cidr=Prefix.objects.create(prefix="10.1.0.0/16")
+        )
+        cls.subnet = AWSSubnet.objects.create(
+            subnet_id="subnet-lookup1",
+            vpc=cls.vpc,
+            subnet_cidr=Prefix.objects.create(prefix="10.1.1.0/24"),
+            subnet_ipv6_cidr=Prefix.objects.create(prefix="2600:1f18:aa00:1::/64"),
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:ip-lookup")
+        # Test transactions never commit, so invalidate the worker's matcher explicitly
+        bump_generation(AWSSubnet)
+
+    def lookup(self, addresses):
+        response = self.client.post(self.url, addresses, format="json")
+        self.assertEqual(response.status_code, 200)
+        return {result["address"]: result for result in response.data["results"]}
+
+    def test_lookup(self):
+        self.client.force_login(self.superuser)
+        results = self.lookup(["10.1.1.10", "2600:1f18:aa00:1::5", "10.1.200.1", "192.0.2.1", "bogus"])
+
+        subnet_match = {
+            "cidr": "10.1.1.0/24",
+            "subnet": {"id": self.subnet.pk, "subnet_id": "subnet-lookup1"},
+            "vpc": {"id": self.vpc.pk, "vpc_id": "vpc-lookup1"},
+            # Inherited from the subnet's VPC
+            "account": {"id": self.account.pk, "account_id": "151515151515"},
+        }
+        self.assertEqual(results["10.1.1.10"]["matches"], [subnet_match])
+        self.assertEqual(results["2600:1f18:aa00:1::5"]["matches"][0]["cidr"], "2600:1f18:aa00:1::/64")
+        self.assertEqual(
+            {match["vpc"]["vpc_id"] for match in results["10.1.200.1"]["matches"]}, {"vpc-lookup1", "vpc-lookup2"}
+        )
+        self.assertEqual(results["192.0.2.1"]["matches"], [])
+        self.assertIn("error", results["bogus"])
+
+    def test_request_formats(self):
+        self.client.force_login(self.superuser)
+
+        response = self.client.get(f"{self.url}?address=10.1.1.10&address=10.1.2.1")
+        self.assertEqual(response.data["count"], 2)
+
+        response = self.client.post(self.url, {"addresses": ["10.1.1.10"]}, format="json")
+        self.assertEqual(response.data["results"][0]["matches"][0]["cidr"], "10.1.1.0/24")
+
+        response = self.client.post(self.url, "10.1.1.10\n\n2600:1f18:aa00::1\n", content_type="text/plain")
+        self.assertEqual([result["address"] for result in response.data["results"]], ["10.1.1.10", "2600:1f18:aa00::1"])
+
+        response = self.client.post(self.url, {"addresses": "10.1.1.10"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_matcher_is_rebuilt_after_changes(self):
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.lookup(["10.1.2.1"])["10.1.2.1"]["matches"][0]["cidr"], "10.1.0.0/16")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AWSSubnet.objects.create(
+                subnet_id="subnet-lookup2", vpc=self.vpc, subnet_cidr=Prefix.objects.create(prefix="10.1.2.0/24")
+            )
+
+        self.assertEqual(self.lookup(["10.1.2.1"])["10.1.2.1"]["matches"][0]["cidr"], "10.1.2.0/24")
+
+    def test_matcher_is_kept_after_unrelated_changes(self):
+        matcher = get_matcher()
+        with self.captureOnCommitCallbacks(execute=True):
+            prefix = Prefix.objects.create(prefix="192.0.2.0/24")
+            prefix.description = "Not used by any VPC or subnet"
+            prefix.save()
+        self.assertIs(get_matcher(), matcher)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prefix.delete()
+        self.assertIs(get_matcher(), matcher)
+
+        # Saving a subnet's CIDR still invalidates it
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subnet.subnet_cidr.save()
+        self.assertIsNot(get_matcher(), matcher)
+
+    def test_matches_are_restricted(self):
+        # The unprivileged test user may not view any AWS objects
+        self.client.force_login(self.user)
+        self.assertEqual(self.lookup(["10.1.1.10"])["10.1.1.10"]["matches"], [])
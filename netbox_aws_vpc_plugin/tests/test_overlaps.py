@@ -0,0 +1,111 @@
+"""Tests for detecting overlapping CIDRs between AWS VPCs."""
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from ipam.models import Prefix
+from tenancy.models import Tenant
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.cache import bump_generation
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+from netbox_aws_vpc_plugin.overlaps import VPCCIDR, find_overlaps
+
+
+def vpc_cidr(first, last, vpc, account=1, family=4):
+    return VPCCIDR(family, first, last, f"{first}-{last}", vpc, f"vpc-{vpc}", account, f"{account:012d}")
+
+
+class FindOverlapsTestCase(SimpleTestCase):
+    def pairs(self, cidrs):
+        return {(overlap.cidr.cidr, overlap.other.cidr) for overlap in find_overlaps(cidrs)}
+
+    def test_overlaps(self):
+        cidrs = [
+            vpc_cidr(0, 255, vpc=1),
+            vpc_cidr(0, 255, vpc=2, account=2),
+            vpc_cidr(16, 31, vpc=3),
+            vpc_cidr(256, 511, vpc=4),
+            # The same range in another family never overlaps
+            vpc_cidr(0, 255, vpc=5, family=6),
+        ]
+        self.assertEqual(self.pairs(cidrs), {("0-255", "0-255"), ("0-255", "16-31")})
+        cross_account = {overlap.cidr.vpc: overlap.cross_account for overlap in find_overlaps(cidrs[:2])}
+        self.assertEqual(cross_account, {1: True})
+
+    def test_same_vpc_is_not_an_overlap(self):
+        self.assertEqual(self.pairs([vpc_cidr(0, 255, vpc=1), vpc_cidr(0, 15, vpc=1)]), set())
+
+    def test_adjacent_ranges(self):
+        self.assertEqual(self.pairs([vpc_cidr(0, 255, vpc=1), vpc_cidr(256, 511, vpc=2)]), set())
+
+
+class OverlapReportTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="overlapsuperuser",
+            email="overlapsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.tenant = Tenant.objects.create(name="Overlap Tenant", slug="overlap-tenant")
+        cls.account = AWSAccount.objects.create(account_id="161616161616", name="Overlap Account", tenant=cls.tenant)
+        cls.other_account = AWSAccount.objects.create(account_id="161616161617", name="Other Overlap Account")
+        cls.vpcs = (
+            AWSVPC.objects.create(
+                vpc_id="vpc-overlap1", owner_account=cls.account, vpc_cidr=Prefix.objects.create(prefix="10.1.0.0/16")
+            ),
+            AWSVPC.objects.create(
+                vpc_id="vpc-overlap2", owner_account=cls.account, vpc_cidr=Prefix.objects.create(prefix="10.2.0.0/16")
+            ),
+            AWSVPC.objects.create(
+                vpc_id="vpc-overlap3",
+                owner_account=cls.other_account,
+                vpc_cidr=Prefix.objects.create(prefix="10.3.0.0/16"),
+            ),
+        )
+        # Overlapping secondary and IPv6 CIDRs
+        cls.vpcs[0].vpc_secondary_ipv4_cidrs.add(Prefix.objects.create(prefix="10.2.128.0/20"))
+        cls.vpcs[1].vpc_ipv6_cidrs.add(Prefix.objects.create(prefix="2600:1f18:bb00::/56"))
+        cls.vpcs[2].vpc_ipv6_cidrs.add(Prefix.objects.create(prefix="2600:1f18:bb00::/56"))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-overlaps")
+        # Test transactions never commit, so invalidate cached reports explicitly
+        bump_generation(AWSVPC)
+
+    def overlapping_vpcs(self, params=""):
+        response = self.client.get(f"{self.url}{params}")
+        self.assertEqual(response.status_code, 200)
+        return {
+            (frozenset(cidr["vpc"]["vpc_id"] for cidr in overlap["cidrs"]), overlap["cross_account"])
+            for overlap in response.data["results"]
+        }
+
+    def test_api(self):
+        self.assertEqual(
+            self.overlapping_vpcs(),
+            {(frozenset({"vpc-overlap1", "vpc-overlap2"}), False), (frozenset({"vpc-overlap2", "vpc-overlap3"}), True)},
+        )
+
+    def test_api_scope(self):
+        expected = {(frozenset({"vpc-overlap1", "vpc-overlap2"}), False)}
+        self.assertEqual(self.overlapping_vpcs(f"?owner_account={self.account.pk}"), expected)
+        self.assertEqual(self.overlapping_vpcs(f"?tenant_id={self.tenant.pk}"), expected)
+        self.assertEqual(self.overlapping_vpcs(f"?id={self.vpcs[0].pk}"), set())
+
+    def test_report_is_rebuilt_after_changes(self):
+        self.overlapping_vpcs()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vpcs[0].vpc_secondary_ipv4_cidrs.clear()
+        self.assertEqual(self.overlapping_vpcs(), {(frozenset({"vpc-overlap2", "vpc-overlap3"}), True)})
+
+    def test_report_view(self):
+        response = self.client.get(reverse("plugins:netbox_aws_vpc_plugin:awsvpc_overlaps"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "10.2.128.0/20")
+        self.assertContains(response, "2600:1f18:bb00::/56")
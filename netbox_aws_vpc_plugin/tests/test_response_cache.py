@@ -0,0 +1,109 @@
+"""Tests for the opt-in REST API response cache."""
+
+from core.models import ObjectType
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from ipam.models import Prefix
+from users.models import ObjectPermission
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.cache import bump_generation, get_response_cache_stats, reset_response_cache_stats
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+from .utils import create_test_subnets, create_test_vpcs
+
+
+@override_settings(PLUGINS_CONFIG={"netbox_aws_vpc_plugin": {"api_cache_timeout": 60}})
+class ResponseCacheTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="cachesuperuser",
+            email="cachesuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="222222222223", name="Cache Account")
+        cls.other_account = AWSAccount.objects.create(account_id="222222222224", name="Other Cache Account")
+        create_test_vpcs(cls.account, 1, 2)
+        create_test_vpcs(cls.other_account, 3, 1)
+
+    def setUp(self):
+        super().setUp()
+        # Responses cached by other tests were built from other data
+        bump_generation(AWSAccount, AWSVPC, AWSSubnet, Prefix)
+        reset_response_cache_stats()
+        self.client.force_login(self.superuser)
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-list")
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_hit_and_invalidation(self):
+        first = self.get(self.url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        second = self.get(self.url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+
+        # Other filters are cached separately
+        self.assertEqual(self.get(f"{self.url}?owner_account_id={self.account.pk}")["X-Cache"], "MISS")
+        self.assertEqual(get_response_cache_stats(), {"hits": 1, "misses": 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AWSVPC.objects.filter(vpc_id="vpc-00000001").first().save()
+            AWSVPC.objects.create(vpc_id="vpc-cachenew", owner_account=self.account)
+        response = self.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["count"], 4)
+
+    def test_detail(self):
+        vpc = AWSVPC.objects.get(vpc_id="vpc-00000001")
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-detail", kwargs={"pk": vpc.pk})
+        self.assertEqual(self.get(url)["X-Cache"], "MISS")
+        self.assertEqual(self.get(url)["X-Cache"], "HIT")
+
+    def test_permission_scope(self):
+        self.get(self.url)
+
+        permission = ObjectPermission.objects.create(
+            name="View one account's VPCs", actions=["view"], constraints={"owner_account": self.other_account.pk}
+        )
+        permission.users.add(self.user)
+        permission.object_types.add(ObjectType.objects.get_for_model(AWSVPC))
+        self.client.force_login(self.user)
+
+        response = self.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual([vpc["vpc_id"] for vpc in response.json()["results"]], ["vpc-00000003"])
+
+    def test_include_permission_scope(self):
+        vpc = AWSVPC.objects.get(vpc_id="vpc-00000001")
+        subnets = create_test_subnets(vpc, 1, 2)
+        url = reverse("plugins-api:netbox_aws_vpc_plugin-api:awsvpc-detail", kwargs={"pk": vpc.pk})
+        url = f"{url}?include=subnets"
+        self.assertEqual(len(self.get(url).json()["subnets"]), 2)
+
+        # Every VPC, but only one of its subnets
+        permission = ObjectPermission.objects.create(name="View VPCs", actions=["view"])
+        permission.users.add(self.user)
+        permission.object_types.add(ObjectType.objects.get_for_model(AWSVPC))
+        permission = ObjectPermission.objects.create(
+            name="View one subnet", actions=["view"], constraints={"subnet_id": subnets[0].subnet_id}
+        )
+        permission.users.add(self.user)
+        permission.object_types.add(ObjectType.objects.get_for_model(AWSSubnet))
+        self.client.force_login(self.user)
+
+        response = self.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual([subnet["subnet_id"] for subnet in response.json()["subnets"]], [subnets[0].subnet_id])
+
+    @override_settings(PLUGINS_CONFIG={"netbox_aws_vpc_plugin": {"api_cache_timeout": 0}})
+    def test_disabled(self):
+        self.assertNotIn("X-Cache", self.get(self.url))
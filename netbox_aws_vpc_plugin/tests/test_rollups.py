@@ -0,0 +1,115 @@
+"""Tests for the persisted VPC and account rollups."""
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from ipam.models import Prefix
+from netaddr import IPNetwork
+
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+
+class RollupTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = AWSAccount.objects.create(account_id="121212121212", name="Rollup Account")
+        cls.other_account = AWSAccount.objects.create(account_id="121212121213", name="Other Account")
+        cls.vpc = AWSVPC.objects.create(
+            vpc_id="vpc-rollup",
+            owner_account=cls.account,
+            vpc_cidr=Prefix.objects.create(prefix="10.10.0.0/16"),
+        )
+        cls.vpc.vpc_secondary_ipv4_cidrs.add(Prefix.objects.create(prefix="100.64.0.0/20"))
+        for i in range(3):
+            AWSSubnet.objects.create(
+                subnet_id=f"subnet-rollup{i}",
+                vpc=cls.vpc,
+                owner_account=cls.account,
+                subnet_cidr=Prefix.objects.create(prefix=f"10.10.{i}.0/24"),
+            )
+
+    def assertRollups(self, obj, **expected):
+        obj.refresh_from_db()
+        self.assertEqual({field: getattr(obj, field) for field in expected}, expected)
+
+    def test_initial_rollups(self):
+        self.assertRollups(self.vpc, subnet_count=3, allocated_ipv4_addresses=768, ipv4_address_space=65536 + 4096)
+        self.assertRollups(
+            self.account,
+            vpc_count=1,
+            subnet_count=3,
+            allocated_ipv4_addresses=768,
+            ipv4_address_space=65536 + 4096,
+        )
+
+    def test_subnet_moved_and_deleted(self):
+        other_vpc = AWSVPC.objects.create(vpc_id="vpc-rollup2", owner_account=self.other_account)
+        subnet = AWSSubnet.objects.get(subnet_id="subnet-rollup0")
+        subnet.vpc = other_vpc
+        subnet.save()
+
+        self.assertRollups(self.vpc, subnet_count=2, allocated_ipv4_addresses=512)
+        self.assertRollups(other_vpc, subnet_count=1, allocated_ipv4_addresses=256)
+        # Subnets count towards their VPC's owner, whichever account owns the subnet itself
+        self.assertRollups(self.account, subnet_count=2, allocated_ipv4_addresses=512)
+        self.assertRollups(self.other_account, vpc_count=1, subnet_count=1, allocated_ipv4_addresses=256)
+
+        subnet.delete()
+        self.assertRollups(other_vpc, subnet_count=0, allocated_ipv4_addresses=0)
+        self.assertRollups(self.account, subnet_count=2)
+        self.assertRollups(self.other_account, subnet_count=0)
+
+    def test_vpc_cidrs_changed(self):
+        secondary = self.vpc.vpc_secondary_ipv4_cidrs.get()
+        self.vpc.vpc_secondary_ipv4_cidrs.remove(secondary)
+        self.assertRollups(self.vpc, ipv4_address_space=65536)
+        self.assertRollups(self.account, ipv4_address_space=65536)
+
+        self.vpc.vpc_cidr.prefix = "10.10.0.0/17"
+        self.vpc.vpc_cidr.save()
+        self.assertRollups(self.vpc, ipv4_address_space=32768)
+
+    def test_vpc_cidr_family_changed(self):
+        self.vpc.vpc_cidr.prefix = IPNetwork("2600:1f18:10::/56")
+        self.vpc.vpc_cidr.save()
+        self.assertRollups(self.vpc, ipv4_address_space=4096)
+        self.assertRollups(self.account, ipv4_address_space=4096)
+
+    def test_vpc_moved_and_deleted(self):
+        self.vpc.owner_account = self.other_account
+        self.vpc.save()
+        self.assertRollups(self.account, vpc_count=0, subnet_count=0, allocated_ipv4_addresses=0)
+        self.assertRollups(self.other_account, vpc_count=1, subnet_count=3, allocated_ipv4_addresses=768)
+
+        self.vpc.delete()
+        self.assertRollups(
+            self.other_account, vpc_count=0, subnet_count=0, allocated_ipv4_addresses=0, ipv4_address_space=0
+        )
+
+    def test_utilization(self):
+        empty_vpc = AWSVPC.objects.create(vpc_id="vpc-rollup-empty", owner_account=self.other_account)
+        vpcs = AWSVPC.objects.annotate_utilization().order_by("-ipv4_utilization")
+
+        self.assertEqual([vpc.pk for vpc in vpcs], [self.vpc.pk, empty_vpc.pk])
+        self.assertAlmostEqual(vpcs[0].ipv4_utilization, 768 * 100 / (65536 + 4096))
+        # No address space at all counts as unused rather than undefined
+        self.assertEqual(vpcs[1].ipv4_utilization, 0)
+
+        account = AWSAccount.objects.annotate_utilization().get(pk=self.account.pk)
+        self.assertAlmostEqual(account.ipv4_utilization, 768 * 100 / (65536 + 4096))
+
+    def test_rebuild_command(self):
+        call_command("rebuild_aws_rollups", "--verify", stdout=StringIO())
+
+        AWSVPC.objects.filter(pk=self.vpc.pk).update(subnet_count=0)
+        AWSAccount.objects.filter(pk=self.account.pk).update(ipv4_address_space=1)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_aws_rollups", "--verify", stdout=StringIO())
+
+        call_command("rebuild_aws_rollups", stdout=StringIO())
+        call_command("rebuild_aws_rollups", "--verify", stdout=StringIO())
+        self.assertRollups(self.vpc, subnet_count=3)
+        self.assertRollups(self.account, ipv4_address_space=65536 + 4096)
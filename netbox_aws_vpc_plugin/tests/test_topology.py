@@ -0,0 +1,83 @@
+"""Tests for the streaming topology API endpoint."""
+
+import gzip
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tenancy.models import Tenant
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+
+from .utils import create_test_subnets, create_test_vpcs
+
+
+class TopologyTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="topologysuperuser",
+            email="topologysuperuser@example.com",
+            password="supersecret",
+        )
+        cls.tenant = Tenant.objects.create(name="Topology Tenant", slug="topology-tenant")
+        cls.account = AWSAccount.objects.create(account_id="252525252525", name="Topology Account", tenant=cls.tenant)
+        cls.other_account = AWSAccount.objects.create(account_id="252525252526", name="Other Topology Account")
+        cls.vpcs = create_test_vpcs(cls.account, 1, 2)
+        create_test_subnets(cls.vpcs[0], 1, 3)
+        create_test_vpcs(cls.other_account, 3, 1)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.url = reverse("plugins-api:netbox_aws_vpc_plugin-api:topology")
+
+    def get(self, params=""):
+        response = self.client.get(f"{self.url}?{params}")
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
+        if response.get("Content-Encoding") == "gzip":
+            content = gzip.decompress(content)
+        return json.loads(content)
+
+    def test_tree(self):
+        data = self.get(f"tenant_id={self.tenant.pk}")
+        self.assertEqual([account["account_id"] for account in data["accounts"]], ["252525252525"])
+        account = data["accounts"][0]
+        self.assertEqual(account["tenant"], "Topology Tenant")
+        self.assertEqual([vpc["vpc_id"] for vpc in account["vpcs"]], ["vpc-00000001", "vpc-00000002"])
+
+        vpc = account["vpcs"][0]
+        self.assertEqual(vpc["ipv4_cidr"], "10.1.0.0/16")
+        self.assertEqual(vpc["secondary_ipv4_cidrs"], ["100.1.0.0/16"])
+        self.assertEqual(vpc["ipv6_cidrs"], ["2600:1f18:1::/56"])
+        self.assertEqual(len(vpc["subnets"]), 3)
+        self.assertEqual(vpc["subnets"][0]["ipv4_cidr"], "10.0.1.0/24")
+        self.assertEqual(account["vpcs"][1]["subnets"], [])
+
+    def test_flat(self):
+        nodes = self.get("flat=true&gzip=true")["nodes"]
+        self.assertEqual([node["type"] for node in nodes].count("account"), 2)
+        vpc = next(node for node in nodes if node["type"] == "vpc" and node["vpc_id"] == "vpc-00000001")
+        self.assertEqual(vpc["parent"], self.account.pk)
+        subnets = [node for node in nodes if node["type"] == "subnet"]
+        self.assertEqual({subnet["parent"] for subnet in subnets}, {self.vpcs[0].pk})
+
+    def test_one_query_per_level(self):
+        def count():
+            with CaptureQueriesContext(connection) as context:
+                self.get()
+            return len(context)
+
+        # Warm up any per-process caches before measuring
+        self.get()
+        before = count()
+        create_test_subnets(create_test_vpcs(self.account, 4, 5)[0], 1, 10)
+        self.assertEqual(count(), before)
+
+    def test_invalid_filter(self):
+        self.assertEqual(self.client.get(f"{self.url}?tenant_id=0").status_code, 400)
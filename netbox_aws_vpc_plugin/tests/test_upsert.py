@@ -0,0 +1,141 @@
+"""Tests for the upsert API endpoints."""
+
+from core.models import ObjectChange, ObjectType
+from dcim.models import Region
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from extras.models import Tag
+from ipam.models import Prefix
+from users.models import ObjectPermission
+from utilities.testing.api import APITestCase
+
+from netbox_aws_vpc_plugin.choices import AWSVPCStatusChoices
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+
+class UpsertTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="upsertsuperuser",
+            email="upsertsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="242424242424", name="Upsert Account")
+        cls.region = Region.objects.create(name="AP South 1", slug="ap-south-1")
+        for i in range(1, 5):
+            Prefix.objects.create(prefix=f"10.24.{i}.0/24")
+            Prefix.objects.create(prefix=f"100.24.{i}.0/24")
+        cls.vpc = AWSVPC.objects.create(vpc_id="vpc-upsert1", name="Existing", owner_account=cls.account)
+        cls.vpc.vpc_secondary_ipv4_cidrs.add(Prefix.objects.get(prefix="100.24.1.0/24"))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def upsert(self, model, records, status_code=200):
+        url = f"{reverse(f'plugins-api:netbox_aws_vpc_plugin-api:{model}-list')}upsert/"
+        response = self.client.post(url, records, format="json")
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.data
+
+    def test_upsert_vpcs(self):
+        data = self.upsert(
+            "awsvpc",
+            [
+                {
+                    "vpc_id": "vpc-upsert1",
+                    "vpc_secondary_ipv4_cidrs": ["100.24.2.0/24", "100.24.3.0/24"],
+                    "region": "ap-south-1",
+                },
+                {"vpc_id": "vpc-upsert2", "owner_account": "242424242424", "region": "ap-south-1"},
+            ],
+        )
+        self.assertEqual((data["created"], data["updated"]), (1, 1))
+        self.assertEqual(sorted(vpc["vpc_id"] for vpc in data["results"]), ["vpc-upsert1", "vpc-upsert2"])
+
+        # Fields absent from the records are left alone, and M2M fields present are replaced
+        self.vpc.refresh_from_db()
+        self.assertEqual(self.vpc.name, "Existing")
+        self.assertEqual(self.vpc.owner_account, self.account)
+        self.assertEqual(self.vpc.region, self.region)
+        self.assertEqual(
+            sorted(str(prefix.prefix) for prefix in self.vpc.vpc_secondary_ipv4_cidrs.all()),
+            ["100.24.2.0/24", "100.24.3.0/24"],
+        )
+        self.assertEqual(AWSVPC.objects.get(vpc_id="vpc-upsert2").status, AWSVPCStatusChoices.STATUS_ACTIVE)
+
+        change = ObjectChange.objects.get(changed_object_id=self.vpc.pk, action="update")
+        self.assertEqual(change.prechange_data["region"], None)
+        self.assertEqual(change.postchange_data["region"], self.region.pk)
+        created = AWSVPC.objects.get(vpc_id="vpc-upsert2")
+        self.assertTrue(ObjectChange.objects.filter(changed_object_id=created.pk, action="create").exists())
+
+        # Upserting the same records again creates nothing
+        data = self.upsert("awsvpc", [{"vpc_id": "vpc-upsert2", "region": "ap-south-1"}])
+        self.assertEqual((data["created"], data["updated"]), (0, 1))
+        self.assertEqual(AWSVPC.objects.filter(vpc_id="vpc-upsert2").count(), 1)
+
+    def test_upsert_fields_per_record(self):
+        tag = Tag.objects.create(name="Upserted", slug="upserted")
+        self.vpc.tags.add(tag)
+        self.upsert(
+            "awsvpc",
+            [
+                {"vpc_id": "vpc-upsert1", "name": "Renamed"},
+                {
+                    "vpc_id": "vpc-upsert2",
+                    "owner_account": "242424242424",
+                    "vpc_secondary_ipv4_cidrs": ["100.24.4.0/24"],
+                    "tags": [],
+                },
+            ],
+        )
+
+        # Fields, M2M fields and tags in other records of the batch are left alone
+        self.vpc.refresh_from_db()
+        self.assertEqual(self.vpc.name, "Renamed")
+        self.assertEqual(self.vpc.owner_account, self.account)
+        self.assertEqual([str(prefix.prefix) for prefix in self.vpc.vpc_secondary_ipv4_cidrs.all()], ["100.24.1.0/24"])
+        self.assertEqual(list(self.vpc.tags.all()), [tag])
+
+    def test_upsert_subnets(self):
+        records = [
+            {"subnet_id": f"subnet-upsert{i}", "vpc": "vpc-upsert1", "subnet_cidr": f"10.24.{i}.0/24"}
+            for i in range(1, 4)
+        ]
+        self.assertEqual(self.upsert("awssubnet", records)["created"], 3)
+        records[0]["subnet_cidr"] = "10.24.4.0/24"
+        self.assertEqual(self.upsert("awssubnet", records)["updated"], 3)
+
+        self.assertEqual(str(AWSSubnet.objects.get(subnet_id="subnet-upsert1").subnet_cidr.prefix), "10.24.4.0/24")
+        self.vpc.refresh_from_db()
+        self.assertEqual(self.vpc.subnet_count, 3)
+
+    def test_invalid(self):
+        data = self.upsert(
+            "awsvpc",
+            [
+                {"vpc_id": "vpc-upsert3", "region": "nowhere"},
+                {"vpc_id": "vpc-upsert4"},
+                {"vpc_id": "vpc-upsert4"},
+            ],
+            status_code=400,
+        )
+        self.assertEqual(len(data["errors"]), 2)
+        self.assertFalse(AWSVPC.objects.filter(vpc_id__in=["vpc-upsert3", "vpc-upsert4"]).exists())
+
+        self.upsert("awsvpc", [{"name": "No ID"}], status_code=400)
+        self.upsert("awsvpc", [{"vpc_id": "vpc-upsert3", "colour": "blue"}], status_code=400)
+
+    def test_permissions(self):
+        permission = ObjectPermission.objects.create(name="Add VPCs", actions=["view", "add"])
+        permission.users.add(self.user)
+        permission.object_types.add(ObjectType.objects.get_for_model(AWSVPC))
+        self.client.force_login(self.user)
+
+        self.upsert("awsvpc", [{"vpc_id": "vpc-upsert5"}], status_code=403)
+        self.assertFalse(AWSVPC.objects.filter(vpc_id="vpc-upsert5").exists())
@@ -0,0 +1,136 @@
+"""Tests for the `netbox_aws_vpc_plugin` UI views."""
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from ipam.models import Prefix
+from utilities.testing import TestCase
+
+from netbox_aws_vpc_plugin.models.aws_account import AWSAccount
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+from .utils import QueryCountTestMixin, create_test_subnets, create_test_vpcs
+
+
+class ListViewQueryCountTestCase(QueryCountTestMixin, TestCase):
+    """The number of queries needed to render a list view must not grow with the page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="viewsuperuser",
+            email="viewsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="444444444444", name="View Account")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def test_vpc_list_view(self):
+        self.superuser.config.set(
+            "tables.AWSVPCTable.columns",
+            [
+                "vpc_id",
+                "vpc_cidr",
+                "vpc_secondary_ipv4_cidrs",
+                "vpc_ipv6_cidrs",
+                "owner_account",
+                "region",
+                "status",
+            ],
+            commit=True,
+        )
+        create_test_vpcs(self.account, 1, 2)
+        url = f"{reverse('plugins:netbox_aws_vpc_plugin:awsvpc_list')}?per_page=100"
+
+        self.assertConstantQueries(url, lambda: create_test_vpcs(self.account, 3, 20))
+
+    def test_subnet_list_view(self):
+        self.superuser.config.set(
+            "tables.AWSSubnetTable.columns",
+            ["subnet_id", "subnet_cidr", "subnet_ipv6_cidr", "vpc", "owner_account", "region", "status"],
+            commit=True,
+        )
+        vpc = AWSVPC.objects.create(vpc_id="vpc-listview", owner_account=self.account)
+        create_test_subnets(vpc, 1, 2)
+        url = f"{reverse('plugins:netbox_aws_vpc_plugin:awssubnet_list')}?per_page=100"
+
+        self.assertConstantQueries(url, lambda: create_test_subnets(vpc, 3, 20))
+
+
+class DetailViewQueryCountTestCase(QueryCountTestMixin, TestCase):
+    """
+    Detail pages must render in a fixed number of queries, however many CIDRs, subnets or VPCs the
+    object has: the embedded tables are loaded separately, a page at a time.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="detailsuperuser",
+            email="detailsuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="454545454545", name="Detail Account")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+        self.vpc = create_test_vpcs(self.account, 1, 1)[0]
+
+    def add_cidrs_and_subnets(self):
+        for i in range(2, 10):
+            self.vpc.vpc_secondary_ipv4_cidrs.add(Prefix.objects.create(prefix=f"100.{i}.0.0/16"))
+            self.vpc.vpc_ipv6_cidrs.add(Prefix.objects.create(prefix=f"2600:1f18:{i:x}::/56"))
+        create_test_subnets(self.vpc, 1, 20)
+
+    def test_vpc_view(self):
+        response = self.client.get(self.vpc.get_absolute_url())
+        self.assertContains(response, reverse("plugins:netbox_aws_vpc_plugin:awssubnet_list"))
+        self.assertConstantQueries(self.vpc.get_absolute_url(), self.add_cidrs_and_subnets)
+
+    def test_vpc_subnets_table(self):
+        url = f"{reverse('plugins:netbox_aws_vpc_plugin:awssubnet_list')}?vpc={self.vpc.pk}"
+        create_test_subnets(self.vpc, 1, 2)
+        self.assertConstantQueries(url, lambda: create_test_subnets(self.vpc, 3, 20), HTTP_HX_REQUEST="true")
+
+    def test_account_view(self):
+        url = self.account.get_absolute_url()
+        self.assertContains(self.client.get(url), reverse("plugins:netbox_aws_vpc_plugin:awsvpc_list"))
+        self.assertConstantQueries(url, lambda: create_test_vpcs(self.account, 2, 20))
+
+    def test_subnet_view(self):
+        subnet = create_test_subnets(self.vpc, 1, 1)[0]
+        response = self.client.get(subnet.get_absolute_url())
+        self.assertContains(response, str(subnet.subnet_cidr))
+
+
+class FilterFormTestCase(TestCase):
+    """List filter forms must not render a choice for every related object."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.superuser = User.objects.create_superuser(
+            username="filtersuperuser",
+            email="filtersuperuser@example.com",
+            password="supersecret",
+        )
+        cls.account = AWSAccount.objects.create(account_id="464646464646", name="Filter Form Account")
+        cls.vpcs = create_test_vpcs(cls.account, 1, 3)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.superuser)
+
+    def test_subnet_list_filter_form(self):
+        url = reverse("plugins:netbox_aws_vpc_plugin:awssubnet_list")
+        response = self.client.get(f"{url}?vpc={self.vpcs[0].pk}")
+        self.assertEqual(response.status_code, 200)
+        # Only the selected VPC is rendered as an option; the others are fetched from the API
+        self.assertContains(response, self.vpcs[0].vpc_id)
+        self.assertNotContains(response, self.vpcs[1].vpc_id)
+        self.assertNotContains(response, self.vpcs[2].vpc_id)
@@ -0,0 +1,56 @@
+"""Shared fixtures for the `netbox_aws_vpc_plugin` test suite."""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from ipam.models import Prefix
+
+from netbox_aws_vpc_plugin.models.aws_subnet import AWSSubnet
+from netbox_aws_vpc_plugin.models.aws_vpc import AWSVPC
+
+
+def create_test_vpcs(account, start, count):
+    """Create `count` VPCs owned by `account`, each with a primary, secondary and IPv6 CIDR."""
+    vpcs = []
+    for i in range(start, start + count):
+        vpc = AWSVPC.objects.create(
+            vpc_id=f"vpc-{i:08x}",
+            owner_account=account,
+            vpc_cidr=Prefix.objects.create(prefix=f"10.{i}.0.0/16"),
+        )
+        vpc.vpc_secondary_ipv4_cidrs.add(Prefix.objects.create(prefix=f"100.{i}.0.0/16"))
+        vpc.vpc_ipv6_cidrs.add(Prefix.objects.create(prefix=f"2600:1f18:{i:x}::/56"))
+        vpcs.append(vpc)
+    return vpcs
+
+
+def create_test_subnets(vpc, start, count):
+    """Create `count` /24 subnets in `vpc`, each with an IPv4 and an IPv6 CIDR."""
+    subnets = []
+    for i in range(start, start + count):
+        subnets.append(
+            AWSSubnet.objects.create(
+                subnet_id=f"subnet-{vpc.pk:04x}{i:04x}",
+                vpc=vpc,
+                owner_account=vpc.owner_account,
+                subnet_cidr=Prefix.objects.create(prefix=f"10.0.{i}.0/24"),
+                subnet_ipv6_cidr=Prefix.objects.create(prefix=f"2001:db8:{vpc.pk:x}:{i:x}::/64"),
+            )
+        )
+    return subnets
+
+
+class QueryCountTestMixin:
+    """Assertions for checking that rendering a page or endpoint needs a fixed number of queries."""
+
+    def count_queries(self, url, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def assertConstantQueries(self, url, grow, **kwargs):
+        # Warm up any per-process caches (content types, user config) before measuring
+        self.client.get(url, **kwargs)
+        before = self.count_queries(url, **kwargs)
+        grow()
+        self.assertEqual(self.count_queries(url, **kwargs), before)
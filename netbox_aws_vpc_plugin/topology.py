@@ -0,0 +1,130 @@
+"""
+Stream the account → VPC → subnet hierarchy of a set of accounts as JSON.
+
+Each level is read with one query through a server-side cursor, ordered by its parent, and the
+levels are merged as they stream: only one account's VPCs and subnets are held at a time.
+"""
+
+import itertools
+import json
+
+from django.db.models import F
+from django.http import StreamingHttpResponse
+
+from .export import CHUNK_SIZE, gzip_chunks, prefix_array
+from .models import AWSVPC, AWSSubnet
+
+__all__ = (
+    "topology_levels",
+    "topology_response",
+)
+
+
+def topology_levels(accounts, user):
+    """
+    Return iterators of the accounts in `accounts`, their VPCs and the subnets of those VPCs, as
+    dicts ordered by parent, restricted to the objects `user` may view.
+    """
+    accounts = accounts.prefetch_related(None).order_by("pk")
+    vpcs = AWSVPC.objects.restrict(user, "view").filter(owner_account__in=accounts.values("pk"))
+    subnets = AWSSubnet.objects.restrict(user, "view").filter(vpc__in=vpcs.values("pk"))
+
+    vpcs = vpcs.order_by("owner_account_id", "pk").values(
+        "id",
+        "vpc_id",
+        "name",
+        "status",
+        "owner_account_id",
+        region=F("region__slug"),
+        ipv4_cidr=F("vpc_cidr__prefix"),
+        secondary_ipv4_cidrs=prefix_array("vpc_secondary_ipv4_cidrs"),
+        ipv6_cidrs=prefix_array("vpc_ipv6_cidrs"),
+    )
+    subnets = subnets.order_by("vpc__owner_account_id", "vpc_id", "pk").values(
+        "id",
+        "subnet_id",
+        "name",
+        "status",
+        "vpc_id",
+        vpc_owner_account_id=F("vpc__owner_account_id"),
+        region=F("region__slug"),
+        ipv4_cidr=F("subnet_cidr__prefix"),
+        ipv6_cidr=F("subnet_ipv6_cidr__prefix"),
+    )
+    accounts = accounts.values("id", "account_id", "name", "status", tenant=F("tenant__name"))
+    return (
+        accounts.iterator(chunk_size=CHUNK_SIZE),
+        vpcs.iterator(chunk_size=CHUNK_SIZE),
+        subnets.iterator(chunk_size=CHUNK_SIZE),
+    )
+
+
+def _merge(parents, children, parent_key, child_key):
+    """
+    Yield each parent with the list of its children, reading both iterators in one pass. Both
+    must be ordered by the parent key; children of parents not listed are skipped.
+    """
+    child = next(children, None)
+    for parent in parents:
+        key = parent_key(parent)
+        while child is not None and child_key(child) < key:
+            child = next(children, None)
+        group = []
+        while child is not None and child_key(child) == key:
+            group.append(child)
+            child = next(children, None)
+        yield parent, group
+
+
+def _tree(accounts, vpcs, subnets):
+    vpcs_with_subnets = _merge(
+        vpcs,
+        subnets,
+        lambda vpc: (vpc["owner_account_id"], vpc["id"]),
+        lambda subnet: (subnet["vpc_owner_account_id"], subnet["vpc_id"]),
+    )
+    # Group the VPCs (each with its subnets) by account, in the same pass
+    vpcs_with_subnets = (dict(vpc, subnets=subnets) for vpc, subnets in vpcs_with_subnets)
+    for account, account_vpcs in _merge(
+        accounts, vpcs_with_subnets, lambda account: account["id"], lambda vpc: vpc["owner_account_id"]
+    ):
+        for vpc in account_vpcs:
+            del vpc["owner_account_id"]
+            for subnet in vpc["subnets"]:
+                del subnet["vpc_id"], subnet["vpc_owner_account_id"]
+        yield dict(account, vpcs=account_vpcs)
+
+
+def _flat(accounts, vpcs, subnets):
+    for account in accounts:
+        yield {"type": "account", "parent": None, **account}
+    for vpc in vpcs:
+        yield {"type": "vpc", "parent": vpc.pop("owner_account_id"), **vpc}
+    for subnet in subnets:
+        del subnet["vpc_owner_account_id"]
+        yield {"type": "subnet", "parent": subnet.pop("vpc_id"), **subnet}
+
+
+def _json_array(name, items):
+    yield f'{{"{name}": ['
+    separator = ""
+    for chunk in itertools.batched(items, CHUNK_SIZE):
+        yield separator + ",".join(json.dumps(item, default=str) for item in chunk)
+        separator = ","
+    yield "]}"
+
+
+def topology_response(accounts, user, flat=False, compress=False):
+    """
+    Return a StreamingHttpResponse writing the hierarchy of `accounts` as a nested tree, or as a
+    flat list of nodes referencing their parents by ID if `flat` is set.
+    """
+    levels = topology_levels(accounts, user)
+    chunks = _json_array("nodes", _flat(*levels)) if flat else _json_array("accounts", _tree(*levels))
+    response = StreamingHttpResponse(
+        gzip_chunks(chunks) if compress else (chunk.encode() for chunk in chunks),
+        content_type="application/json",
+    )
+    if compress:
+        response["Content-Encoding"] = "gzip"
+    return response
@@ -7,6 +7,10 @@ urlpatterns = (
     # AWS VPC Paths
     path("aws-vpcs/", views.AWSVPCListView.as_view(), name="awsvpc_list"),
     path("aws-vpcs/add/", views.AWSVPCEditView.as_view(), name="awsvpc_add"),
+    path("aws-vpcs/import/", views.AWSVPCBulkImportView.as_view(), name="awsvpc_bulk_import"),
+    path("aws-vpcs/edit/", views.AWSVPCBulkEditView.as_view(), name="awsvpc_bulk_edit"),
+    path("aws-vpcs/delete/", views.AWSVPCBulkDeleteView.as_view(), name="awsvpc_bulk_delete"),
+    path("aws-vpcs/overlaps/", views.AWSVPCOverlapView.as_view(), name="awsvpc_overlaps"),
     path("aws-vpcs/<int:pk>/", views.AWSVPCView.as_view(), name="awsvpc"),
     path("aws-vpcs/<int:pk>/edit/", views.AWSVPCEditView.as_view(), name="awsvpc_edit"),
     path("aws-vpcs/<int:pk>/delete/", views.AWSVPCDeleteView.as_view(), name="awsvpc_delete"),
@@ -19,6 +23,9 @@ urlpatterns = (
     # AWS Subnet Paths
     path("aws-subnets/", views.AWSSubnetListView.as_view(), name="awssubnet_list"),
     path("aws-subnets/add/", views.AWSSubnetEditView.as_view(), name="awssubnet_add"),
+    path("aws-subnets/import/", views.AWSSubnetBulkImportView.as_view(), name="awssubnet_bulk_import"),
+    path("aws-subnets/edit/", views.AWSSubnetBulkEditView.as_view(), name="awssubnet_bulk_edit"),
+    path("aws-subnets/delete/", views.AWSSubnetBulkDeleteView.as_view(), name="awssubnet_bulk_delete"),
     path("aws-subnets/<int:pk>/", views.AWSSubnetView.as_view(), name="awssubnet"),
     path("aws-subnets/<int:pk>/edit/", views.AWSSubnetEditView.as_view(), name="awssubnet_edit"),
     path("aws-subnets/<int:pk>/delete/", views.AWSSubnetDeleteView.as_view(), name="awssubnet_delete"),
@@ -31,6 +38,9 @@ urlpatterns = (
     # AWS Account Paths
     path("aws-accounts/", views.AWSAccountListView.as_view(), name="awsaccount_list"),
     path("aws-accounts/add/", views.AWSAccountEditView.as_view(), name="awsaccount_add"),
+    path("aws-accounts/import/", views.AWSAccountBulkImportView.as_view(), name="awsaccount_bulk_import"),
+    path("aws-accounts/edit/", views.AWSAccountBulkEditView.as_view(), name="awsaccount_bulk_edit"),
+    path("aws-accounts/delete/", views.AWSAccountBulkDeleteView.as_view(), name="awsaccount_bulk_delete"),
     path("aws-accounts/<int:pk>/", views.AWSAccountView.as_view(), name="awsaccount"),
     path("aws-accounts/<int:pk>/edit/", views.AWSAccountEditView.as_view(), name="awsaccount_edit"),
     path("aws-accounts/<int:pk>/delete/", views.AWSAccountDeleteView.as_view(), name="awsaccount_delete"),
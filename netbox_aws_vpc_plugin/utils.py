@@ -0,0 +1,56 @@
+import netaddr
+from django.db.models import Q
+from ipam.models import Prefix
+from netaddr.core import AddrFormatError
+
+__all__ = (
+    "SUBNET_CIDR_FIELDS",
+    "VPC_CIDR_FIELDS",
+    "cidr_filter",
+    "containment_lookup",
+)
+
+# Fields linking each model to its ipam.Prefix CIDRs
+VPC_CIDR_FIELDS = ("vpc_cidr", "vpc_secondary_ipv4_cidrs", "vpc_ipv6_cidrs")
+SUBNET_CIDR_FIELDS = ("subnet_cidr", "subnet_ipv6_cidr")
+
+
+def containment_lookup(relation, value):
+    """
+    Return the `(lookup, query)` used to match prefixes by `relation` (`"contains"`, `"within"` or
+    `"within_include"`) to `value`, following the semantics of the ipam.Prefix filters. Raises
+    ValueError if `value` is not a valid IP address or prefix.
+    """
+    value = value.strip()
+    try:
+        if relation == "contains":
+            # Searching by prefix
+            if "/" in value:
+                return "net_contains_or_equals", str(netaddr.IPNetwork(value).cidr)
+            # Searching by IP address
+            return "net_contains", str(netaddr.IPAddress(value))
+        if relation == "within":
+            return "net_contained", str(netaddr.IPNetwork(value).cidr)
+        if relation == "within_include":
+            return "net_contained_or_equal", str(netaddr.IPNetwork(value).cidr)
+    except (AddrFormatError, ValueError) as e:
+        raise ValueError(f"Invalid IP address or prefix: {value}") from e
+    raise ValueError(f"Unknown containment relation: {relation}")
+
+
+def cidr_filter(model, fields, lookup, query, prefix=""):
+    """
+    Return a Q object matching `model` objects with any CIDR in `fields` satisfying `lookup`.
+
+    The containment test runs once against ipam.Prefix (served by its GiST index on `prefix`) and
+    the plugin objects are matched by primary key against the result, so many-to-many CIDRs do not
+    produce duplicate rows. `prefix` is prepended to the field paths, for use in nested filters.
+    """
+    prefixes = Prefix.objects.filter(**{f"prefix__{lookup}": query}).values("pk")
+    q = Q()
+    for field in fields:
+        if model._meta.get_field(field).many_to_many:
+            q |= Q(**{f"{prefix}pk__in": model.objects.filter(**{f"{field}__in": prefixes}).values("pk")})
+        else:
+            q |= Q(**{f"{prefix}{field}__in": prefixes})
+    return q
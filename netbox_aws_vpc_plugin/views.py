@@ -1,27 +1,159 @@
+from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.db.models import CASCADE, ProtectedError, RestrictedError
+from django.shortcuts import redirect, render
+from django.utils.safestring import mark_safe
+from django.views.generic import View
+from django_tables2 import RequestConfig
 from netbox.views import generic
+from utilities.error_handlers import handle_protectederror
+from utilities.exceptions import AbortRequest
+from utilities.paginator import EnhancedPaginator, get_paginate_count
+from utilities.views import ContentTypePermissionRequiredMixin
 
 from . import filtersets, forms, models, tables
+from .bulk import BulkImporter, bulk_delete, bulk_update, has_event_rules
+from .overlaps import get_overlaps
+from .rollups import deferred_rollups
 
 
-# VPC Views
-class AWSVPCView(generic.ObjectView):
-    queryset = models.AWSVPC.objects.all()
+class FastBulkImportView(generic.BulkImportView):
+    """
+    BulkImportView which validates and creates new objects a batch at a time with
+    `bulk.BulkImporter`. Imports updating existing objects (an `id` column) or which must trigger
+    event rules go through NetBox's row-by-row import instead.
+    """
+
+    def create_and_update_objects(self, form, request):
+        records = list(form.cleaned_data["data"])
+        if any(record.get("id") for record in records) or has_event_rules(self.queryset.model):
+            return super().create_and_update_objects(form, request)
+
+        try:
+            importer = BulkImporter(
+                self.model_form,
+                request,
+                headers=getattr(form, "_csv_headers", None),
+                changelog_message=form.cleaned_data.get("changelog_message", ""),
+            )
+        except ValidationError as e:
+            # Unknown column headers
+            form.add_error("data", e)
+            raise
+
+        objects, errors = importer.run(records)
+        if errors:
+            for error in errors:
+                form.add_error(None, error)
+            raise ValidationError("")
+        return objects
+
+
+class SetBasedBulkEditView(generic.BulkEditView):
+    """
+    BulkEditView which applies the field and tag changes to all of the selected objects at once
+    with `bulk.bulk_update()`. Edits of custom fields, or of models which must trigger event
+    rules, go through NetBox's object-by-object edit instead.
+    """
+
+    # Form fields which are not set on the objects directly
+    control_fields = ("pk", "add_tags", "remove_tags", "changelog_message")
+
+    def _update_objects(self, form, request):
+        model = self.queryset.model
+        custom_fields = getattr(form, "custom_fields", {})
+        nullified = set(request.POST.getlist("_nullify"))
+        if has_event_rules(model) or any(name in form.changed_data or name in nullified for name in custom_fields):
+            return super()._update_objects(form, request)
+
+        values = {}
+        for name in form.fields:
+            if name in self.control_fields or name in custom_fields:
+                continue
+            if name in form.nullable_fields and name in nullified:
+                values[name] = None if model._meta.get_field(name).null else ""
+            elif name in form.changed_data:
+                values[name] = form.cleaned_data[name]
+
+        return bulk_update(
+            request,
+            self.queryset.filter(pk__in=form.cleaned_data["pk"]),
+            values,
+            add_tags=form.cleaned_data.get("add_tags") or (),
+            remove_tags=form.cleaned_data.get("remove_tags") or (),
+            changelog_message=form.cleaned_data.get("changelog_message") or "",
+        )
+
+
+class DeferredRollupsBulkDeleteView(generic.BulkDeleteView):
+    """
+    BulkDeleteView which deletes all of the selected objects at once with `bulk.bulk_delete()`,
+    refreshing the rollups of the affected VPCs and accounts once, after all of them are deleted.
+    Deletions of models which must trigger event rules go through NetBox's object-by-object
+    delete instead.
+    """
+
+    def post(self, request, **kwargs):
+        with deferred_rollups():
+            if "_confirm" in request.POST and not any(has_event_rules(model) for model in self._deleted_models()):
+                form = self.get_form()(request.POST)
+                if form.is_valid():
+                    return self._delete_objects(form, request)
+            return super().post(request, **kwargs)
+
+    def _deleted_models(self):
+        # The model and the models whose objects are deleted along with it, e.g. a VPC's subnets
+        model = self.queryset.model
+        return (
+            model,
+            *(rel.related_model for rel in model._meta.related_objects if rel.on_delete is CASCADE),
+        )
+
+    def _delete_objects(self, form, request):
+        model = self.queryset.model
+        # The selection, as NetBox's BulkDeleteView determines it
+        if request.POST.get("_all"):
+            queryset = self.queryset
+            if self.filterset is not None:
+                queryset = self.filterset(request.GET, queryset).qs
+            pk_list = queryset.only("pk").values_list("pk", flat=True)
+        else:
+            pk_list = [int(pk) for pk in request.POST.getlist("pk")]
+        queryset = self.queryset.filter(pk__in=pk_list)
 
-    def get_extra_context(self, request, instance):
-        table = tables.AWSSubnetTable(instance.awssubnet_set.all())
-        table.configure(request)
+        try:
+            with transaction.atomic(using=router.db_for_write(model)):
+                deleted_count = bulk_delete(request, queryset, form.cleaned_data.get("changelog_message", ""))
+        except (ProtectedError, RestrictedError) as e:
+            handle_protectederror(queryset, request, e)
+            return redirect(self.get_return_url(request))
+        except AbortRequest as e:
+            messages.error(request, mark_safe(e.message))
+            return redirect(self.get_return_url(request))
 
-        return {
-            "subnets_table": table,
-        }
+        messages.success(request, f"Deleted {deleted_count} {model._meta.verbose_name_plural}")
+        return redirect(self.get_return_url(request))
+
+
+# VPC Views
+class AWSVPCView(generic.ObjectView):
+    # Everything the detail panels render is fetched up front; the subnets table is loaded
+    # separately (and paginated) from the subnet list view.
+    queryset = (
+        models.AWSVPC.objects.annotate_utilization()
+        .select_related("vpc_cidr", "owner_account", "region")
+        .prefetch_related("vpc_secondary_ipv4_cidrs", "vpc_ipv6_cidrs", "tags")
+    )
 
 
 class AWSVPCListView(generic.ObjectListView):
-    queryset = models.AWSVPC.objects.all()
+    # Foreign keys are joined up front; the M2M CIDR columns are only prefetched by the
+    # table when they are actually configured as visible.
+    queryset = models.AWSVPC.objects.annotate_utilization().select_related("vpc_cidr", "owner_account", "region")
     table = tables.AWSVPCTable
     filterset = filtersets.AWSVPCFilterSet
     filterset_form = forms.AWSVPCFilterForm
-    # TODO: Count of subnets
 
 
 class AWSVPCEditView(generic.ObjectEditView):
@@ -33,13 +165,64 @@ class AWSVPCDeleteView(generic.ObjectDeleteView):
     queryset = models.AWSVPC.objects.all()
 
 
+class AWSVPCBulkImportView(FastBulkImportView):
+    queryset = models.AWSVPC.objects.all()
+    model_form = forms.AWSVPCImportForm
+
+
+class AWSVPCBulkEditView(SetBasedBulkEditView):
+    queryset = models.AWSVPC.objects.all()
+    filterset = filtersets.AWSVPCFilterSet
+    table = tables.AWSVPCTable
+    form = forms.AWSVPCBulkEditForm
+
+
+class AWSVPCBulkDeleteView(DeferredRollupsBulkDeleteView):
+    # Prefetched for the change log snapshots of the deleted VPCs
+    queryset = models.AWSVPC.objects.prefetch_related("vpc_secondary_ipv4_cidrs", "vpc_ipv6_cidrs", "tags")
+    filterset = filtersets.AWSVPCFilterSet
+    table = tables.AWSVPCTable
+
+
+class AWSVPCOverlapView(ContentTypePermissionRequiredMixin, View):
+    """
+    Report of CIDRs overlapping between VPCs, optionally scoped by account, tenant or region.
+    """
+
+    template_name = "netbox_aws_vpc_plugin/awsvpc_overlaps.html"
+
+    def get_required_permission(self):
+        return "netbox_aws_vpc_plugin.view_awsvpc"
+
+    def get(self, request):
+        vpcs = models.AWSVPC.objects.restrict(request.user, "view")
+        vpcs = filtersets.AWSVPCFilterSet(request.GET, vpcs, request=request).qs
+        table = tables.AWSVPCOverlapTable(get_overlaps(vpcs))
+        RequestConfig(
+            request, {"paginator_class": EnhancedPaginator, "per_page": get_paginate_count(request)}
+        ).configure(table)
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "table": table,
+                "filter_form": forms.AWSVPCOverlapFilterForm(request.GET),
+            },
+        )
+
+
 # Subnet Views
 class AWSSubnetView(generic.ObjectView):
-    queryset = models.AWSSubnet.objects.all()
+    queryset = models.AWSSubnet.objects.select_related(
+        "subnet_cidr", "subnet_ipv6_cidr", "vpc", "owner_account", "region"
+    ).prefetch_related("tags")
 
 
 class AWSSubnetListView(generic.ObjectListView):
-    queryset = models.AWSSubnet.objects.all()
+    queryset = models.AWSSubnet.objects.select_related(
+        "subnet_cidr", "subnet_ipv6_cidr", "vpc", "owner_account", "region"
+    )
     table = tables.AWSSubnetTable
     filterset = filtersets.AWSSubnetFilterSet
     filterset_form = forms.AWSSubnetFilterForm
@@ -54,22 +237,36 @@ class AWSSubnetDeleteView(generic.ObjectDeleteView):
     queryset = models.AWSSubnet.objects.all()
 
 
-# Account Views
-class AWSAccountView(generic.ObjectView):
-    queryset = models.AWSAccount.objects.all()
+class AWSSubnetBulkImportView(FastBulkImportView):
+    queryset = models.AWSSubnet.objects.all()
+    model_form = forms.AWSSubnetImportForm
+
+
+class AWSSubnetBulkEditView(SetBasedBulkEditView):
+    queryset = models.AWSSubnet.objects.all()
+    filterset = filtersets.AWSSubnetFilterSet
+    table = tables.AWSSubnetTable
+    form = forms.AWSSubnetBulkEditForm
 
-    def get_extra_context(self, request, instance):
-        table = tables.AWSVPCTable(instance.awsvpc_set.all())
-        table.configure(request)
 
-        return {
-            "vpcs_table": table,
-        }
+class AWSSubnetBulkDeleteView(DeferredRollupsBulkDeleteView):
+    # Prefetched for the change log snapshots of the deleted subnets
+    queryset = models.AWSSubnet.objects.prefetch_related("tags")
+    filterset = filtersets.AWSSubnetFilterSet
+    table = tables.AWSSubnetTable
+
+
+# Account Views
+class AWSAccountView(generic.ObjectView):
+    # The VPCs table is loaded separately (and paginated) from the VPC list view
+    queryset = models.AWSAccount.objects.annotate_utilization().select_related("tenant").prefetch_related("tags")
 
 
 class AWSAccountListView(generic.ObjectListView):
-    queryset = models.AWSAccount.objects.all()
+    queryset = models.AWSAccount.objects.annotate_utilization().select_related("tenant")
     table = tables.AWSAccountTable
+    filterset = filtersets.AWSAccountFilterSet
+    filterset_form = forms.AWSAccountFilterForm
 
 
 class AWSAccountEditView(generic.ObjectEditView):
@@ -79,3 +276,22 @@ class AWSAccountEditView(generic.ObjectEditView):
 
 class AWSAccountDeleteView(generic.ObjectDeleteView):
     queryset = models.AWSAccount.objects.all()
+
+
+class AWSAccountBulkImportView(FastBulkImportView):
+    queryset = models.AWSAccount.objects.all()
+    model_form = forms.AWSAccountImportForm
+
+
+class AWSAccountBulkEditView(SetBasedBulkEditView):
+    queryset = models.AWSAccount.objects.all()
+    filterset = filtersets.AWSAccountFilterSet
+    table = tables.AWSAccountTable
+    form = forms.AWSAccountBulkEditForm
+
+
+class AWSAccountBulkDeleteView(DeferredRollupsBulkDeleteView):
+    # Prefetched for the change log snapshots of the deleted accounts
+    queryset = models.AWSAccount.objects.prefetch_related("tags")
+    filterset = filtersets.AWSAccountFilterSet
+    table = tables.AWSAccountTable